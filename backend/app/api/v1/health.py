@@ -1,5 +1,11 @@
-from fastapi import APIRouter
-from ...schemas.responses import HealthCheck
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from ...schemas.responses import HealthCheck, SystemStats
+from ...services.health_monitor import health_monitor
+from ...services.retention import retention_sweeper
+from ...services.admission import admission_controller
+from ...services.jobs import job_manager
+from ...services.derivatives import derivative_cache
 
 router = APIRouter(
     tags=["System"],
@@ -16,17 +22,26 @@ router = APIRouter(
     This endpoint performs the following checks:
     - Verifies the API server is running and responsive
     - Returns the current version of the API
-    - Confirms the application's core services are operational
+    - Reports the saturation readings of the health monitor
+    
+    It answers 200 as long as the process responds, so it suits liveness
+    probes; use /ready to decide whether to route traffic here.
     
     Use Cases:
     - Monitoring system health
-    - Load balancer health checks
+    - Liveness probes
     - Deployment verification
     - System status dashboards
     
     Returns:
-    - status: Current health status ("healthy" or "unhealthy")
+    - status: "healthy", or "degraded" when a readiness check fails
     - version: Current API version number
+    - loop_lag_ms / loop_lag_max_ms: Latest and worst recent event-loop lag
+    - pool_workers / pool_pending / pool_queue_depth: Extraction worker
+      processes, calls in progress and calls waiting for a worker
+    - temp_dir_free_bytes: Free space where uploads and images are stored
+    - rss_bytes: Resident memory of the server process
+    - failing: Readiness checks currently over their threshold
     
     Response Times:
     - Expected response time: < 100ms
@@ -39,7 +54,15 @@ router = APIRouter(
                 "application/json": {
                     "example": {
                         "status": "healthy",
-                        "version": "1.0.0"
+                        "version": "1.0.0",
+                        "loop_lag_ms": 0.4,
+                        "loop_lag_max_ms": 2.1,
+                        "pool_workers": 4,
+                        "pool_pending": 2,
+                        "pool_queue_depth": 0,
+                        "temp_dir_free_bytes": 52613349376,
+                        "rss_bytes": 157286400,
+                        "failing": []
                     }
                 }
             }
@@ -64,4 +87,103 @@ async def health_check():
     Returns:
         HealthCheck: Status information including system health and version
     """
-    return HealthCheck(status="healthy", version="1.0.0") 
\ No newline at end of file
+    readings = health_monitor.readings()
+    failing = health_monitor.failing(readings)
+    return HealthCheck(status="degraded" if failing else "healthy", version="1.0.0", failing=failing, **readings)
+
+@router.get(
+    "/ready",
+    response_model=HealthCheck,
+    summary="Readiness Probe",
+    description="""
+    Report whether this instance should receive new traffic.
+    
+    The instance is not ready when any saturation reading of the health
+    monitor exceeds its threshold:
+    - Event-loop lag over the last HEALTH_LAG_WINDOW seconds above
+      READY_MAX_LOOP_LAG (a stall in progress counts as well)
+    - More than READY_MAX_QUEUE_DEPTH extraction calls waiting for a worker
+    - Less than READY_MIN_FREE_BYTES free in the temporary directory
+    - Resident memory above READY_MAX_RSS_BYTES (disabled by default)
+    
+    Use Cases:
+    - Load balancer and Kubernetes readiness probes, so traffic shifts to
+      other replicas before latency collapses
+    
+    Returns the same body as /health, with status "ready" or "not_ready"
+    and the failing checks.
+    """,
+    responses={
+        503: {
+            "description": "Instance is saturated and should not receive new traffic",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "status": "not_ready",
+                        "version": "1.0.0",
+                        "loop_lag_ms": 35.2,
+                        "loop_lag_max_ms": 1840.7,
+                        "pool_workers": 4,
+                        "pool_pending": 41,
+                        "pool_queue_depth": 37,
+                        "temp_dir_free_bytes": 52613349376,
+                        "rss_bytes": 157286400,
+                        "failing": [
+                            "Event loop lag of 1840.7ms exceeds 500ms",
+                            "37 extraction calls waiting for a worker, limit is 32"
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+async def readiness_check():
+    """
+    Readiness probe based on the health monitor thresholds.
+    
+    Returns:
+        HealthCheck: Readings and failing checks, with a 503 status when not ready
+    """
+    readings = health_monitor.readings()
+    failing = health_monitor.failing(readings)
+    body = HealthCheck(status="not_ready" if failing else "ready", version="1.0.0", failing=failing, **readings)
+    if failing:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body.model_dump())
+    return body
+
+
+@router.get(
+    "/stats",
+    response_model=SystemStats,
+    summary="Internal Service Counters",
+    description="""
+    Report internal counters of the background services.
+    
+    Returned Sections:
+    - retention: Sweeps run, PDF directories removed and bytes reclaimed
+      by the temporary image retention sweeper
+    - admission: Running and queued extractions, reserved memory, admitted
+      and rejected counts, and time spent waiting for a slot
+    - jobs: Background job queue depth and jobs by status
+    - previews: Derivative cache hits, renders, evictions and size
+    
+    Use Cases:
+    - Capacity planning for the temporary image storage
+    - Verifying that expired images are being reclaimed
+    - Tuning MAX_CONCURRENT_EXTRACTIONS and EXTRACTION_MEMORY_BUDGET
+    """
+)
+async def system_stats():
+    """
+    Report counters of the background services.
+    
+    Returns:
+        SystemStats: Counters grouped by service
+    """
+    return SystemStats(
+        retention=retention_sweeper.stats(),
+        admission=admission_controller.stats(),
+        jobs=job_manager.stats(),
+        previews=derivative_cache.stats()
+    )
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, HTTPException, Path as FastAPIPath, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
+
+from ...services.jobs import job_manager
+from ...schemas.pdf import JobStatus, ErrorResponse
+from ...core.config import settings
+
+router = APIRouter(
+    prefix="",
+    tags=["Extraction Jobs"],
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found or expired"}
+    }
+)
+
+JOB_ID_DESCRIPTION = """
+        The job ID returned by POST /extract-images?async=true.
+
+        Finished jobs can be queried for one hour (JOB_RETENTION_SECONDS).
+        """
+
+
+def _get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found or expired"
+        )
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    summary="Get Extraction Job Status",
+    description="""
+    Poll the status and progress of an asynchronous extraction job.
+
+    Status Values:
+    - queued: Waiting for a free job slot
+    - running: Extraction in progress
+    - completed: All PDFs extracted, see results
+    - failed: Extraction failed, see error
+
+    Progress Fields:
+    - pages_total / pages_done: Pages of all PDFs in the job
+    - images_found: Images stored so far
+    - bytes_written: Size of the stored images so far
+
+    Progress advances per page shard for large PDFs and per PDF otherwise.
+
+    Results:
+    Each completed PDF lists its pdf_id and an images_url pointing at
+    GET /pdf/{pdf_id}/images, the same listing used by synchronous uploads.
+    """
+)
+async def get_job(
+    job_id: str = FastAPIPath(..., description=JOB_ID_DESCRIPTION)
+):
+    """Return the current status of an extraction job."""
+    return _get_job(job_id).to_dict()
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream Extraction Job Progress",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-sent events carrying the job status"
+        }
+    },
+    description="""
+    Follow an asynchronous extraction job with server-sent events.
+
+    Each event's data is the same JSON document returned by GET /jobs/{job_id}.
+    An event is sent whenever progress changes, and the stream closes after
+    the event reporting the completed or failed status.
+    """
+)
+async def job_events(
+    request: Request,
+    job_id: str = FastAPIPath(..., description=JOB_ID_DESCRIPTION)
+):
+    """Stream job status changes as server-sent events."""
+    job = _get_job(job_id)
+
+    async def events():
+        last = None
+        while True:
+            state = job.to_dict()
+            if state != last:
+                yield f"data: {json.dumps(state)}\n\n"
+                last = state
+            if job.done or await request.is_disconnected():
+                break
+            await asyncio.sleep(settings.job_event_interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from ...core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(
+    tags=["System"],
+    responses={500: {"description": "Internal server error"}}
+)
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Prometheus Metrics",
+    description="""
+    Export service metrics in the Prometheus text exposition format.
+    
+    The endpoint is mounted at the application root rather than under the
+    API prefix, so the public nginx location does not expose it; scrape the
+    backend port directly.
+    
+    Exported Metrics (prefixed with pdf_extractor_):
+    - http_requests_total, http_request_duration_seconds: Requests by
+      method, route template and status, and their latency
+    - extraction_duration_seconds: Wall time of each PDF extraction
+    - extraction_stage_seconds: Time per PDF spent in each stage
+      (count_pages, open, get_images, extract_image, hash, encode, write,
+      thumbnail, zip_write)
+    - images_per_pdf: Images stored per extracted PDF
+    - input_bytes_total, output_bytes_total: Uploaded PDF bytes, and image
+      and archive bytes produced
+    - extractions_in_flight, extractions_queued: Admission control state
+    
+    Use Cases:
+    - Finding where extraction time goes under real load
+    - Sizing EXTRACTION_WORKERS and MAX_CONCURRENT_EXTRACTIONS
+    - Latency and error-rate alerting per route
+    """,
+    responses={
+        200: {
+            "description": "Metrics in Prometheus text format",
+            "content": {CONTENT_TYPE: {}}
+        }
+    }
+)
+async def metrics():
+    """
+    Render all registered metrics.
+    
+    Returns:
+        Response: Prometheus text exposition of the metrics registry
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Query, Path as FastAPIPath, status
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
-from typing import Any, List
-from pathlib import Path
-from uuid import uuid4
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response, Query, Path as FastAPIPath, status
+from fastapi.responses import StreamingResponse, JSONResponse, RedirectResponse
+from typing import Any, AsyncIterator, Dict, List, Optional
+from pathlib import PurePosixPath
+import asyncio
+from starlette.concurrency import run_in_threadpool
 
-from ...services.pdf_service import PdfService
-from ...schemas.pdf import PdfUploadResponse, ErrorResponse, ImageResponse
+from ...services.pdf_service import PdfService, DuplicateIndex
+from ...services.pdf_worker import CONVERSION_FORMATS, SOURCE_FORMATS, ExtractionOptions, parse_page_ranges
+from ...services.upload_spool import SpooledUpload, spool_upload
+from ...services.jobs import job_manager
+from ...services.admission import admission_controller
+from ...services.image_delivery import etag_matches, image_response, media_type_for, resolve_image_path
+from ...services.derivatives import derivative_cache
+from ...services.storage import storage
+from ...schemas.pdf import PdfUploadResponse, ErrorResponse, ImageResponse, InspectResponse, JobAccepted
 from ...core.config import settings
+from ...core.errors import BaseAppException, handle_app_error
 
 router = APIRouter(
     prefix="",
@@ -17,6 +26,93 @@ router = APIRouter(
     }
 )
 
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Values accepted by the source_formats filter
+KNOWN_SOURCE_FORMATS = set(SOURCE_FORMATS.values()) | {"png"}
+SOURCE_FORMAT_ALIASES = {"jpg": "jpeg", "jp2": "jpx", "jbig2": "jb2"}
+
+
+def _validate_pdf_files(files: List[UploadFile]) -> None:
+    """Reject uploads that are not PDF files."""
+    for file in files:
+        # Validate file type
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only PDF files are allowed. '{file.filename}' is not a PDF file."
+            )
+        
+        # Check content type
+        content_type = file.content_type or ""
+        if not content_type.lower() == 'application/pdf':
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type for '{file.filename}'. Only PDF files are allowed"
+            )
+
+
+async def _spool_all(files: List[UploadFile]) -> List[SpooledUpload]:
+    """Spool every upload, releasing the ones already spooled if one fails."""
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await spool_upload(file))
+    except BaseException:
+        for upload in uploads:
+            upload.cleanup()
+        raise
+    return uploads
+
+
+async def _admit_uploads(uploads: List[SpooledUpload]) -> int:
+    """
+    Admit the uploads of a streaming request as one extraction.
+    
+    Returns:
+        int: The reserved memory estimate, to release when the stream ends
+        
+    Raises:
+        ServiceBusyError: If the request is not admitted; the uploads are cleaned up
+    """
+    cost = admission_controller.estimate(sum(upload.size for upload in uploads))
+    try:
+        await admission_controller.acquire(cost)
+    except BaseException:
+        for upload in uploads:
+            upload.cleanup()
+        raise
+    return cost
+
+
+async def _release_after(stream: AsyncIterator[bytes], cost: int) -> AsyncIterator[bytes]:
+    """Pass ``stream`` through, releasing its admission once it ends."""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        await stream.aclose()
+        admission_controller.release(cost)
+
+
+async def _start_stream(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Run ``stream`` up to its first chunk before the response starts.
+    
+    Errors raised until then (e.g. the first PDF failing to open) still get
+    a proper error status; later ones can only cut the stream short.
+    """
+    first = await stream.__anext__()
+    
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in stream:
+            yield chunk
+    
+    return body()
+
+
 @router.post(
     "/extract-images",
     response_model=PdfUploadResponse,
@@ -29,18 +125,30 @@ router = APIRouter(
                         "message": "Successfully extracted images",
                         "image_count": 2,
                         "filename": "test.pdf",
-                        "image_urls": ["/api/v1/images/uuid/image1.png"]
+                        "image_urls": ["/api/v1/images/uuid/image1.png"],
+                        "duplicates_skipped": 0
                     }
                 },
                 "application/zip": {
                     "description": "ZIP file containing extracted images"
+                },
+                "application/x-ndjson": {
+                    "description": "One JSON line per image as it is extracted, then a summary line"
                 }
             },
             "description": "Successfully extracted images from PDF"
         },
+        202: {
+            "model": JobAccepted,
+            "description": "Extraction job queued (async=true)"
+        },
         400: {
             "model": ErrorResponse,
-            "description": "Invalid file type or format"
+            "description": "Invalid file type or format, or a PDF that cannot be opened"
+        },
+        413: {
+            "model": ErrorResponse,
+            "description": "A file exceeds the maximum upload size"
         },
         422: {
             "model": ErrorResponse,
@@ -49,6 +157,10 @@ router = APIRouter(
         500: {
             "model": ErrorResponse,
             "description": "Internal server error during processing"
+        },
+        503: {
+            "model": ErrorResponse,
+            "description": "Server at capacity or job queue full, see Retry-After"
         }
     },
     summary="Extract Images from PDF Files",
@@ -57,7 +169,7 @@ router = APIRouter(
     
     Technical Details:
     - Supported PDF versions: 1.0 to 2.0
-    - Maximum file size: 50MB per PDF
+    - Maximum file size: MAX_UPLOAD_SIZE per PDF (10MB by default), enforced while reading
     - Supported image formats: PNG, JPEG, TIFF, GIF
     - Image resolution: Preserved as in original PDF
     - Color depth: Preserved as in original PDF
@@ -65,9 +177,14 @@ router = APIRouter(
     Processing Features:
     - Multi-file processing in a single request
     - Maintains original image quality and metadata
+    - Native image streams stored as-is (no re-encoding) unless a format is requested
     - Automatic image format detection
-    - Duplicate image detection and handling
-    - Progress tracking via response headers
+    - Duplicate image detection by xref and content hash (see dedupe)
+    - Optional previews generated while each image is decoded (see thumbnails)
+    - Filters by page, pixel size, stream size and source format, applied
+      from image metadata so skipped images are never decoded
+    - Repeated uploads of the same PDF are served from the result cache
+    - Progress tracking for background jobs (async=true)
     
     Response Options:
     1. JSON Response (download=false):
@@ -76,10 +193,27 @@ router = APIRouter(
        - Processing status and messages
     
     2. ZIP Download (download=true):
-       - All images in a single ZIP file
+       - All images in a single ZIP file, streamed while extraction runs:
+         images are added as soon as their pages are extracted (per page
+         shard on large PDFs)
        - Organized by PDF and page number
        - Original filenames preserved
-       - Metadata included
+       - manifest.json listing every image and its duplicates, written last
+       - Starts with the first extracted pages: if a PDF fails before that,
+         the request gets a regular error response instead of a truncated
+         archive
+    
+    3. NDJSON Stream (Accept: application/x-ndjson, download=false):
+       - One {"type": "image"} line per image, with its URL and metadata,
+         as soon as its pages are extracted (per page shard on large PDFs)
+       - A final {"type": "summary"} line with counts and listing URLs
+       - Failures after the stream started arrive as a {"type": "error"} line
+    
+    4. Background Job (async=true):
+       - Returns 202 with a job ID as soon as the upload is received
+       - Poll GET /jobs/{job_id} or follow GET /jobs/{job_id}/events (SSE)
+         for pages done, images found and bytes written
+       - Completed jobs link each PDF's GET /pdf/{pdf_id}/images listing
     
     Error Handling:
     - Validates PDF format before processing
@@ -90,7 +224,17 @@ router = APIRouter(
     Performance Notes:
     - Processing time: ~1-2 seconds per PDF
     - Memory usage: ~2x PDF file size
-    - Concurrent request limit: 10
+    - Concurrent extractions: MAX_CONCURRENT_EXTRACTIONS (10 by default)
+    - Memory budget: EXTRACTION_MEMORY_BUDGET shared by running extractions
+    
+    Admission Control:
+    - Extractions beyond the limits wait in a bounded queue
+    - When the queue is full, or a wait exceeds ADMISSION_QUEUE_TIMEOUT,
+      the request fails fast with 503 and a Retry-After header
+    - Streaming responses (download=true, NDJSON) are admitted as a whole,
+      reserving the memory estimate of all their files, before the response
+      starts; a refusal is always a 503, never a cut-off stream
+    - Background jobs (async=true) wait for capacity instead of failing
     
     Security Features:
     - File type validation
@@ -101,11 +245,13 @@ router = APIRouter(
     Best Practices:
     1. Keep PDF files under 20MB for optimal performance
     2. Use download=true for bulk extractions
-    3. Implement retry logic for large files
-    4. Monitor X-Image-Count header for progress
+    3. Use async=true for large files instead of holding the request open
+    4. Honour Retry-After on 503 responses
+    5. Read X-Image-Count (JSON mode) or manifest.json (ZIP mode) for image counts
     """
 )
 async def upload_pdf(
+    request: Request,
     files: list[UploadFile] = File(
         ..., 
         description="""
@@ -113,7 +259,7 @@ async def upload_pdf(
         
         Requirements:
         - File format: PDF (application/pdf)
-        - Max size: 50MB per file
+        - Max size: MAX_UPLOAD_SIZE per file (10MB by default)
         - Max files: 10 per request
         - Filename: Must end with .pdf
         
@@ -131,6 +277,90 @@ async def upload_pdf(
         Use true for bulk downloads or when immediate access to images is needed.
         Use false for web applications or when you need to process images individually.
         """
+    ),
+    image_format: Optional[str] = Query(
+        None,
+        alias="format",
+        description="""
+        Optional target format for the extracted images (png, jpeg, webp, tiff).
+        
+        When omitted, images are returned byte-for-byte as embedded in the PDF,
+        with no re-encoding and no quality loss.
+        """
+    ),
+    dedupe: bool = Query(
+        True,
+        description="""
+        Store repeated images only once.
+        
+        - true (default): An image referenced on several pages, or present in
+          several of the uploaded PDFs, is extracted once. Later occurrences are
+          listed in manifest.json with a duplicate_of reference.
+        - false: Every occurrence is extracted as its own file.
+        """
+    ),
+    compression: str = Query(
+        "auto",
+        pattern="^(auto|store|deflate)$",
+        description="""
+        ZIP compression for download=true:
+        
+        - auto (default): Store already-compressed formats (JPEG, JPX, PNG, ...)
+          and deflate raw formats such as PNM and TIFF
+        - store: No compression, fastest
+        - deflate: Deflate every entry
+        """
+    ),
+    compression_level: Optional[int] = Query(
+        None,
+        ge=0,
+        le=9,
+        description="Deflate level (0-9) for deflated entries, defaults to the server setting"
+    ),
+    thumbnails: Optional[bool] = Query(
+        None,
+        description="""
+        Write a small preview of every image to thumbs/ during extraction.
+        
+        Previews are THUMBNAIL_WIDTH pixels wide (256 by default), listed as
+        thumbnail_url by GET /pdf/{pdf_id}/images and included in ZIP
+        downloads. Defaults to the EAGER_THUMBNAILS server setting.
+        """
+    ),
+    pages: Optional[str] = Query(
+        None,
+        description="""
+        Only extract images from these pages, e.g. "1-3,7,10-" (1-based,
+        inclusive, an open end runs to the last page).
+        """
+    ),
+    min_width: Optional[int] = Query(None, ge=1, description="Skip images narrower than this many pixels"),
+    max_width: Optional[int] = Query(None, ge=1, description="Skip images wider than this many pixels"),
+    min_height: Optional[int] = Query(None, ge=1, description="Skip images shorter than this many pixels"),
+    max_height: Optional[int] = Query(None, ge=1, description="Skip images taller than this many pixels"),
+    min_size: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Skip images whose compressed stream in the PDF is smaller than this many bytes"
+    ),
+    source_formats: Optional[str] = Query(
+        None,
+        description="""
+        Only extract images stored in these formats, comma separated:
+        jpeg, jpx (JPEG 2000), jb2 (JBIG2) or png (any other compression).
+        """
+    ),
+    run_async: bool = Query(
+        False,
+        alias="async",
+        description="""
+        Process the files as a background job.
+        
+        - false (default): The response carries the extraction result
+        - true: Returns 202 with a job ID right after the upload is received.
+          The download parameter is ignored; fetch the images through the
+          URLs listed in the completed job.
+        """
     )
 ) -> Any:
     """
@@ -144,48 +374,109 @@ async def upload_pdf(
             detail="No files provided"
         )
     
-    total_image_count = 0
-    all_zip_data = []
-    all_image_ids = []
-    
-    for file in files:
-        # Validate file type
-        if not file.filename.lower().endswith('.pdf'):
+    if image_format is not None:
+        image_format = image_format.lower()
+        if image_format not in CONVERSION_FORMATS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Only PDF files are allowed. '{file.filename}' is not a PDF file."
+                detail=f"Unsupported image format '{image_format}'. Supported formats: {', '.join(sorted(CONVERSION_FORMATS))}"
             )
-        
-        # Check content type
-        content_type = file.content_type or ""
-        if not content_type.lower() == 'application/pdf':
+    filters: Dict[str, Any] = {
+        "min_width": min_width,
+        "max_width": max_width,
+        "min_height": min_height,
+        "max_height": max_height,
+        "min_bytes": min_size,
+    }
+    if pages is not None:
+        try:
+            filters["pages"] = parse_page_ranges(pages)
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid file type for '{file.filename}'. Only PDF files are allowed"
+                detail=f"Invalid pages '{pages}': {e}"
+            )
+    if source_formats is not None:
+        allowed = sorted({SOURCE_FORMAT_ALIASES.get(name, name) for name in source_formats.lower().replace(" ", "").split(",") if name})
+        unknown = [name for name in allowed if name not in KNOWN_SOURCE_FORMATS]
+        if unknown or not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported source formats '{source_formats}'. Supported formats: {', '.join(sorted(KNOWN_SOURCE_FORMATS))}"
             )
+        filters["source_formats"] = tuple(allowed)
+    options = ExtractionOptions.from_settings(settings, image_format, dedupe, thumbnails, **filters)
+    
+    total_image_count = 0
+    duplicates_skipped = 0
+    all_image_ids = []
+    
+    _validate_pdf_files(files)
     
     try:
-        for file in files:
-            zip_data, image_count, image_ids = await PdfService.extract_images(file)
-            all_zip_data.append(zip_data)
-            total_image_count += image_count
-            all_image_ids.extend(image_ids)
+        if run_async:
+            # The job outlives this request, so it gets spooled copies of the uploads
+            uploads = await _spool_all(files)
+            try:
+                job = job_manager.submit(uploads, options)
+            except BaseException:
+                for upload in uploads:
+                    upload.cleanup()
+                raise
+            status_url = f"{settings.api_str}/jobs/{job.id}"
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=JobAccepted(
+                    job_id=job.id,
+                    status=job.status,
+                    status_url=status_url,
+                    events_url=f"{status_url}/events"
+                ).model_dump(),
+                headers={"Location": status_url}
+            )
         
-        # Combine all zip files into one
-        combined_zip = await PdfService.combine_zip_files(all_zip_data)
+        # Refuse synchronous work up front rather than after spooling it
+        admission_controller.check()
         
-        if download:
-            # Return the combined ZIP file as a streaming response
+        if download or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            # Uploads are closed once this handler returns, so spool them now
+            # and stream the response while extraction is still running
+            uploads = await _spool_all(files)
+            # A stream cannot turn into a 503 once it has started, so the
+            # whole request is admitted first and holds its admission until
+            # the stream ends
+            cost = await _admit_uploads(uploads)
+            if download:
+                # Entries are written as soon as their page shards are extracted
+                archive = PdfService.stream_archive(uploads, options, True, compression, compression_level)
+                return StreamingResponse(
+                    await _start_stream(_release_after(archive, cost)),
+                    media_type="application/zip",
+                    headers={
+                        "Content-Disposition": "attachment; filename=extracted_images.zip",
+                        "Access-Control-Expose-Headers": "Content-Disposition"
+                    }
+                )
+            # One line per image as soon as its pages are extracted
+            records = PdfService.stream_records(uploads, options, admitted=True)
             return StreamingResponse(
-                iter([combined_zip]),
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": "attachment; filename=extracted_images.zip",
-                    "X-Image-Count": str(total_image_count),
-                    "Access-Control-Expose-Headers": "X-Image-Count, Content-Disposition"
-                }
+                await _start_stream(_release_after(records, cost)),
+                media_type=NDJSON_MEDIA_TYPE,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
             )
         else:
+            # Files are extracted concurrently on the worker process pool
+            results = await PdfService.extract_all(PdfService.extract_images(file, options) for file in files)
+            
+            # Images shared between PDFs of this request are kept only once
+            index = DuplicateIndex()
+            for result in results:
+                if dedupe:
+                    index.merge(result)
+                total_image_count += len(result.stored_images)
+                duplicates_skipped += result.duplicate_count
+                all_image_ids.extend(record["id"] for record in result.stored_images)
+            
             # Return JSON response with image URLs
             server_url = settings.server_url.rstrip('/')
             base_url = f"{settings.api_str}/images"
@@ -196,38 +487,151 @@ async def upload_pdf(
                     message=f"Successfully extracted images from {len(files)} files",
                     image_count=total_image_count,
                     filename="multiple_files",
-                    image_urls=image_urls
+                    image_urls=image_urls,
+                    duplicates_skipped=duplicates_skipped
                 ).model_dump(),
                 headers={
                     "X-Image-Count": str(total_image_count),
-                    "Access-Control-Expose-Headers": "X-Image-Count"
+                    "X-Duplicates-Skipped": str(duplicates_skipped),
+                    "Access-Control-Expose-Headers": "X-Image-Count, X-Duplicates-Skipped"
                 }
             )
             return response
             
+    except BaseAppException as e:
+        raise handle_app_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
+@router.post(
+    "/inspect",
+    response_model=InspectResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid file type, or a PDF that cannot be opened"},
+        413: {"model": ErrorResponse, "description": "A file exceeds the maximum upload size"},
+        422: {"model": ErrorResponse, "description": "No files provided or validation error"}
+    },
+    summary="Inspect Images in PDF Files",
+    description="""
+    List the images contained in one or more PDF files without extracting them.
+    
+    The inventory is read from the PDF object metadata only: no image is
+    decoded or stored, so the response typically arrives in milliseconds
+    even for large documents. Use it to decide what to extract.
+    
+    Returned Per Image Occurrence (in page order):
+    - page, index: Page number and position on the page
+    - xref: PDF object number, shared by every occurrence of the same image
+    - width, height: Pixel dimensions
+    - bpc: Bits per component
+    - colorspace: e.g. DeviceRGB, DeviceGray, ICCBased
+    - filter: Stream compression, e.g. DCTDecode (JPEG), JPXDecode, FlateDecode
+    - smask: xref of the transparency mask, if any
+    - length: Compressed stream size in bytes
+    
+    Returned Per PDF:
+    - page_count, image_count (occurrences) and unique_images (distinct xrefs)
+    """
+)
+async def inspect_pdf(
+    files: list[UploadFile] = File(
+        ...,
+        description="One or more PDF files to inspect, sent as form-data with the key 'files'."
+    )
+) -> Any:
+    """
+    Report the image inventory of each uploaded PDF without extracting images.
+    """
+    if not files:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No files provided"
+        )
+    _validate_pdf_files(files)
+    
+    try:
+        inventories = await asyncio.gather(*(PdfService.inspect_images(file) for file in files))
+    except BaseAppException as e:
+        raise handle_app_error(e)
+    return InspectResponse(pdfs=inventories)
+
 # Add new routes for image handling
-@router.get("/images/{pdf_id}/{image_filename:path}")
-async def get_image(pdf_id: str, image_filename: str):
-    """Serve an extracted image file."""
-    image_path = Path(settings.temp_dir).joinpath("images", pdf_id, image_filename)
+@router.get(
+    "/images/{pdf_id}/{image_filename:path}",
+    responses={
+        200: {"content": {"image/*": {}}, "description": "The image file"},
+        206: {"description": "Requested byte range of the image file"},
+        304: {"description": "Image unchanged since the ETag sent in If-None-Match"},
+        307: {"description": "Redirect to the image in the shared storage backend"},
+        415: {"model": ErrorResponse, "description": "No preview can be rendered from this image"}
+    }
+)
+async def get_image(
+    request: Request,
+    pdf_id: str,
+    image_filename: str,
+    width: Optional[int] = Query(
+        None,
+        alias="w",
+        ge=16,
+        le=settings.preview_max_width,
+        description="Serve a preview at most this many pixels wide instead of the original"
+    ),
+    image_format: Optional[str] = Query(
+        None,
+        alias="format",
+        description="Serve the image converted to this format (png, jpeg, webp, tiff). Previews default to webp."
+    )
+):
+    """
+    Serve an extracted image file, or a resized/converted variant of it.
     
-    if not image_path.exists():
+    Responses carry the image's own content type, a strong ETag and
+    immutable caching headers; conditional and Range requests are honoured.
+    Variants are rendered on first request and then served from the
+    derivative cache like any other file.
+    
+    Images this node does not hold are looked up in the shared storage
+    backend, if one is configured: originals are redirected to a presigned
+    URL when the backend offers one, otherwise the file is restored locally
+    first.
+    """
+    image_path = resolve_image_path(pdf_id, image_filename)
+    
+    if image_path is None and storage is not None:
+        key = await PdfService.stored_image_key(pdf_id, image_filename)
+        if key is not None:
+            if width is None and image_format is None and settings.storage_redirect:
+                url = await run_in_threadpool(storage.url, key, media_type_for(PurePosixPath(image_filename)))
+                if url is not None:
+                    # Re-sign well before the URL expires
+                    headers = {"Cache-Control": f"private, max-age={settings.storage_presign_expires // 2}"}
+                    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers=headers)
+            image_path = await PdfService.restore_image(pdf_id, image_filename, key)
+    
+    if image_path is None:
         raise HTTPException(
             status_code=404,
             detail="Image not found or has been cleaned up"
         )
     
-    return FileResponse(
-        str(image_path),
-        media_type="image/*",
-        filename=image_filename
-    )
+    if width is None and image_format is None:
+        return await image_response(request, image_path, image_path.name)
+    
+    image_format = (image_format or "webp").lower()
+    if image_format not in CONVERSION_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported image format '{image_format}'. Supported formats: {', '.join(sorted(CONVERSION_FORMATS))}"
+        )
+    try:
+        variant_path = await derivative_cache.get(image_path, width, image_format)
+    except BaseAppException as e:
+        raise handle_app_error(e)
+    return await image_response(request, variant_path, f"{image_path.stem}.{image_format}")
 
 @router.get(
     "/pdf/{pdf_id}/images",
@@ -241,11 +645,23 @@ async def get_image(pdf_id: str, image_filename: str):
                     "example": [{
                         "id": "page_1_image_1.png",
                         "url": "/api/v1/images/uuid/page_1_image_1.png",
-                        "pdf_id": "uuid"
+                        "pdf_id": "uuid",
+                        "thumbnail_url": None,
+                        "page": 1,
+                        "index": 1,
+                        "xref": 12,
+                        "width": 800,
+                        "height": 600,
+                        "format": "png",
+                        "size": 48213,
+                        "hash": "8c51e89e788203f48bd46f224071782f"
                     }]
                 }
             }
         },
+        304: {
+            "description": "Listing unchanged since the ETag sent in If-None-Match"
+        },
         404: {
             "model": ErrorResponse,
             "description": "PDF ID not found or no images available"
@@ -264,12 +680,19 @@ async def get_image(pdf_id: str, image_filename: str):
     - Images are sorted by page number and position
     - Includes direct access URLs for each image
     - Provides image format and size information
+    - Served from the manifest written once at extraction time, without
+      scanning the image directory
     
     Response Format:
     Returns an array of image objects, each containing:
     - id: Unique identifier/filename of the image
     - url: Direct URL to download the image
     - pdf_id: Reference to source PDF
+    - thumbnail_url: Preview written during extraction (thumbnails=true), else null
+    - page, index: Page number and position of the image on the page
+    - xref: PDF object number of the image
+    - width, height: Pixel dimensions
+    - format, size, hash: Stored file format, size in bytes and content hash
     
     Sorting and Organization:
     - Images are sorted by page number
@@ -282,10 +705,15 @@ async def get_image(pdf_id: str, image_filename: str):
     3. Image selection interfaces
     4. Progress monitoring
     
+    Filtering and Pagination:
+    - page_from / page_to: Only images on these PDF pages (inclusive)
+    - offset / limit: Window into the filtered list
+    - X-Total-Count: Number of images matching the page filter
+    
     Performance Considerations:
     - Response time: < 100ms
-    - Pagination: Not required, typical response size < 100KB
-    - Caching: Results cached for 1 hour
+    - Caching: Strong ETag per PDF, If-None-Match is answered with 304;
+      results cached for 1 hour
     
     Error Scenarios:
     - PDF not found
@@ -306,6 +734,7 @@ async def get_image(pdf_id: str, image_filename: str):
     """
 )
 async def list_pdf_images(
+    request: Request,
     pdf_id: str = FastAPIPath(
         ..., 
         description="""
@@ -317,24 +746,34 @@ async def list_pdf_images(
         This ID is returned in the original PDF upload response
         and is used to group all images extracted from the same PDF.
         """
-    )
+    ),
+    page_from: Optional[int] = Query(None, ge=1, description="First PDF page to include (1-based)"),
+    page_to: Optional[int] = Query(None, ge=1, description="Last PDF page to include (1-based, inclusive)"),
+    offset: int = Query(0, ge=0, description="Number of matching images to skip"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of images to return")
 ):
     """List all images extracted from a specific PDF."""
-    pdf_image_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
-    if not pdf_image_dir.exists():
+    stored = await PdfService.fetch_manifest(pdf_id)
+    if stored is None:
         raise HTTPException(
             status_code=404,
             detail="PDF ID not found or no images available"
         )
+    etag, manifest = stored
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # Manifest records are already in page and position order
+    records = [
+        record for record in manifest["images"]
+        if "filename" in record
+        and (page_from is None or record["page"] >= page_from)
+        and (page_to is None or record["page"] <= page_to)
+    ]
+    headers["X-Total-Count"] = str(len(records))
+    headers["Access-Control-Expose-Headers"] = "ETag, X-Total-Count"
+    window = records[offset:offset + limit] if limit is not None else records[offset:]
     
-    images = []
-    for file_path in pdf_image_dir.iterdir():
-        if file_path.is_file():
-            filename = file_path.name
-            images.append(ImageResponse(
-                id=filename,
-                url=f"{settings.api_str}/images/{pdf_id}/{filename}",
-                pdf_id=pdf_id
-            ))
-    
-    return sorted(images, key=lambda x: x.id) 
\ No newline at end of file
+    images = [ImageResponse(**PdfService.image_record(record)).model_dump() for record in window]
+    return JSONResponse(content=images, headers=headers) 
\ No newline at end of file
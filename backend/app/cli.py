@@ -0,0 +1,250 @@
+"""
+Command line entry point for offline bulk extraction.
+
+Usage:
+    python -m app.cli extract <dir|glob> --out <dir> [--workers N]
+
+Each PDF is extracted by the same worker routine the API uses, in a process
+pool, straight into ``<out>/<relative path without .pdf>/`` together with
+its manifest.json. Completed PDFs are appended to a journal in the output
+directory, so an interrupted run picks up where it stopped. A PDF that
+kills its worker process (e.g. MuPDF crashing on a hostile file) fails on
+its own; the pool is rebuilt and the other PDFs carry on.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .core.config import settings
+# Only the worker module: the server services would start the log
+# listener, storage client etc. here and in every spawned worker
+from .services.pdf_worker import (
+    CONVERSION_FORMATS, ExtractionOptions, create_process_pool, extract_to_directory, parse_page_ranges
+)
+
+JOURNAL_FILENAME = ".extract-journal.jsonl"
+
+# (input path, job key, output directory, PDF ID)
+Job = Tuple[Path, str, Path, str]
+
+
+def find_pdfs(source: str) -> Tuple[Path, List[Path]]:
+    """
+    Resolve a directory (searched recursively) or glob pattern to PDF files.
+
+    Returns:
+        tuple: (root the output layout is relative to, sorted PDF paths)
+    """
+    if os.path.isdir(source):
+        root = Path(source).resolve()
+        paths = [path for path in root.rglob("*") if path.suffix.lower() == ".pdf" and path.is_file()]
+    else:
+        paths = [Path(match).resolve() for match in glob.glob(source, recursive=True)]
+        paths = [path for path in paths if path.suffix.lower() == ".pdf" and path.is_file()]
+        root = Path(os.path.commonpath([path.parent for path in paths])) if paths else Path.cwd()
+    return root, sorted(paths)
+
+
+def job_key(path: Path) -> str:
+    """Identity of an input file version: its path, size and modification time."""
+    stat = path.stat()
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_journal(journal_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Entries of PDFs already extracted successfully, by job key."""
+    done = {}
+    if journal_path.exists():
+        with journal_path.open() as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of an interrupted run
+                if entry.get("status") == "done":
+                    done[entry["key"]] = entry
+    return done
+
+
+def run_jobs(
+    jobs: List[Job], options: ExtractionOptions, workers: int, max_tasks_per_child: Optional[int] = None
+) -> Iterator[Tuple[Job, Optional[Dict[str, Any]], Optional[BaseException]]]:
+    """
+    Extract each job in a process pool, yielding the outcomes in completion order.
+
+    At most ``workers`` PDFs are submitted at a time, so when a worker dies
+    and takes the pool down, only the PDFs in flight can be the cause and
+    the others never ran. The pool is then rebuilt, and the PDFs that were
+    in flight are retried one at a time: only one that breaks the pool on
+    its own is reported as failed.
+
+    Yields:
+        tuple: (job, stats of ``extract_to_directory`` or None, error or None)
+    """
+    workers = max(1, workers)
+    todo: Deque[Job] = deque(jobs)
+    suspects: Deque[Job] = deque()
+    while todo or suspects:
+        with create_process_pool(workers, max_tasks_per_child) as pool:
+            running: Dict[Future, Tuple[Job, bool]] = {}
+
+            def submit(job: Job, alone: bool) -> None:
+                path, _, out_dir, pdf_id = job
+                running[pool.submit(extract_to_directory, str(path), str(out_dir), pdf_id, options)] = (job, alone)
+
+            broken = False
+            while not broken and (todo or suspects or running):
+                if suspects:
+                    # Isolated, once the PDFs running alongside them are done
+                    if not running:
+                        submit(suspects.popleft(), True)
+                else:
+                    while todo and len(running) < workers:
+                        submit(todo.popleft(), False)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, alone = running.pop(future)
+                    try:
+                        stats = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        if alone:
+                            # Whatever the dead worker wrote is incomplete
+                            shutil.rmtree(job[2], ignore_errors=True)
+                            yield job, None, RuntimeError("Extraction worker crashed while processing the PDF")
+                        else:
+                            suspects.append(job)
+                    except Exception as e:
+                        yield job, None, e
+                    else:
+                        yield job, stats, None
+
+            if broken:
+                # The rest of the calls in flight went down with the pool
+                for future, (job, _) in running.items():
+                    try:
+                        stats = future.result()
+                    except BrokenProcessPool:
+                        suspects.append(job)
+                    except Exception as e:
+                        yield job, None, e
+                    else:
+                        yield job, stats, None
+
+
+def build_options(args: argparse.Namespace) -> ExtractionOptions:
+    filters: Dict[str, Any] = {
+        "min_width": args.min_width,
+        "min_height": args.min_height,
+        "min_bytes": args.min_size,
+    }
+    if args.pages:
+        filters["pages"] = parse_page_ranges(args.pages)
+    return ExtractionOptions.from_settings(settings, args.image_format, not args.no_dedupe, args.thumbnails, **filters)
+
+
+def extract(args: argparse.Namespace, options: ExtractionOptions) -> int:
+    root, pdfs = find_pdfs(args.source)
+    if not pdfs:
+        print(f"No PDF files found for '{args.source}'", file=sys.stderr)
+        return 1
+
+    out_root = Path(args.out).resolve()
+    out_root.mkdir(parents=True, exist_ok=True)
+    journal_path = out_root / JOURNAL_FILENAME
+    done = {} if args.restart else load_journal(journal_path)
+
+    pending: List[Job] = []
+    for path in pdfs:
+        key = job_key(path)
+        if key not in done:
+            relative = path.relative_to(root).with_suffix("")
+            pending.append((path, key, out_root / relative, relative.as_posix()))
+    skipped = len(pdfs) - len(pending)
+    print(f"{len(pdfs)} PDFs found, {skipped} already extracted, {len(pending)} to go", file=sys.stderr)
+
+    totals = {"pdfs": 0, "failed": 0, "pages": 0, "images": 0, "bytes_in": 0, "bytes_out": 0}
+    started = time.perf_counter()
+    with journal_path.open("a") as journal:
+        outcomes = run_jobs(pending, options, args.workers, settings.extraction_max_tasks_per_child)
+        for number, ((path, key, out_dir, _), stats, error) in enumerate(outcomes, 1):
+            entry: Dict[str, Any] = {"key": key, "path": str(path), "out": str(out_dir)}
+            if error is not None:
+                totals["failed"] += 1
+                entry.update(status="failed", error=str(error) or type(error).__name__)
+                print(f"[{number}/{len(pending)}] FAILED {path}: {entry['error']}", file=sys.stderr)
+            else:
+                totals["pdfs"] += 1
+                totals["pages"] += stats["page_count"]
+                totals["images"] += stats["image_count"]
+                totals["bytes_in"] += path.stat().st_size
+                totals["bytes_out"] += stats["bytes_written"]
+                entry.update(status="done", **stats)
+                if args.verbose:
+                    print(f"[{number}/{len(pending)}] {path}: {stats['image_count']} images", file=sys.stderr)
+            journal.write(json.dumps(entry) + "\n")
+            journal.flush()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    summary = {
+        **totals,
+        "skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "pdfs_per_second": round(totals["pdfs"] / elapsed, 2),
+        "images_per_second": round(totals["images"] / elapsed, 2),
+        "mb_in_per_second": round(totals["bytes_in"] / elapsed / 1024 / 1024, 2),
+        "mb_out_per_second": round(totals["bytes_out"] / elapsed / 1024 / 1024, 2),
+    }
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(
+            f"Extracted {summary['images']} images from {summary['pdfs']} PDFs "
+            f"({summary['failed']} failed, {skipped} skipped) in {summary['seconds']}s\n"
+            f"  {summary['pdfs_per_second']} PDFs/s, {summary['images_per_second']} images/s, "
+            f"{summary['mb_in_per_second']} MB/s read, {summary['mb_out_per_second']} MB/s written"
+        )
+    return 1 if totals["failed"] else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="PDF Image Extractor command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = commands.add_parser("extract", help="Extract the images of many PDFs to a directory")
+    extract_parser.add_argument("source", help="Directory (searched recursively) or glob pattern of PDF files")
+    extract_parser.add_argument("--out", required=True, help="Output directory")
+    extract_parser.add_argument("--workers", type=int, default=settings.extraction_workers,
+                                help="Worker processes (default: EXTRACTION_WORKERS)")
+    extract_parser.add_argument("--format", dest="image_format", choices=sorted(CONVERSION_FORMATS),
+                                help="Convert images to this format instead of keeping native streams")
+    extract_parser.add_argument("--no-dedupe", action="store_true", help="Store every image occurrence")
+    extract_parser.add_argument("--thumbnails", action="store_true", default=None, help="Also write thumbs/ previews")
+    extract_parser.add_argument("--pages", help='Page selection, e.g. "1-3,7,10-"')
+    extract_parser.add_argument("--min-width", type=int, help="Skip narrower images")
+    extract_parser.add_argument("--min-height", type=int, help="Skip shorter images")
+    extract_parser.add_argument("--min-size", type=int, help="Skip images with smaller compressed streams (bytes)")
+    extract_parser.add_argument("--restart", action="store_true", help="Ignore the journal and extract everything again")
+    extract_parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    extract_parser.add_argument("-v", "--verbose", action="store_true", help="Report every PDF")
+
+    args = parser.parse_args(argv)
+    try:
+        options = build_options(args)
+    except ValueError as e:
+        parser.error(str(e))
+    return extract(args, options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,11 +37,98 @@ class Settings(BaseSettings):
     
     # File Upload Settings
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
+    upload_chunk_size: int = 1024 * 1024  # Uploads are read and size-checked in 1MB chunks
+    upload_spool_threshold: int = 1024 * 1024  # Larger uploads spill to a temp file
     allowed_extensions: List[str] = [".pdf"]
     
     # Storage Settings
     temp_dir: str = str(Path(__file__).parent.parent.parent / "tmp" / "pdf-extractor")
     
+    # Extraction Settings
+    extraction_workers: int = os.cpu_count() or 1
+    extraction_max_tasks_per_child: int = 100  # Recycle workers to bound MuPDF memory growth
+    extraction_passthrough: bool = True  # Store native image streams without re-encoding
+    extraction_shard_min_pages: int = 100  # Documents with more pages are split across workers
+    extraction_shard_pages: int = 50  # Pages per shard once a document is split
+    zip_stream_chunk_size: int = 64 * 1024  # Read/write granularity of streamed ZIP downloads
+    
+    # Admission Control Settings
+    max_concurrent_extractions: int = 10
+    extraction_memory_budget: int = 512 * 1024 * 1024  # Estimated memory of running extractions
+    extraction_memory_factor: float = 2.0  # Estimated peak memory per byte of uploaded PDF
+    admission_queue_size: int = 50  # Further extractions are refused with 503
+    admission_queue_timeout: float = 30.0  # Seconds an extraction may wait for a slot
+    admission_retry_after: int = 5  # Retry-After seconds sent with 503 responses
+    
+    # Image Delivery Settings
+    image_cache_max_age: int = 365 * 24 * 60 * 60  # Extracted images never change
+    # Internal nginx location aliasing temp_dir/images, e.g. "/_extracted_images".
+    # When set, nginx serves image bytes through X-Accel-Redirect.
+    image_accel_redirect: str = ""
+    
+    # Preview Settings
+    derivative_cache_max_bytes: int = 512 * 1024 * 1024  # Resized/converted image variants
+    derivative_cache_low_water: float = 0.9  # Eviction trims the variants to this share of the budget
+    derivative_workers: int = 4  # Threads rendering variants on demand
+    preview_max_width: int = 2048
+    eager_thumbnails: bool = False  # Write thumbs/ previews during extraction by default
+    thumbnail_width: int = 256
+    thumbnail_format: str = "webp"  # A CONVERSION_FORMATS key
+    
+    # Job Queue Settings
+    job_workers: int = 2  # Jobs processed concurrently (each still fans out to the pool)
+    job_queue_size: int = 20  # Further async submissions are refused with 503
+    job_retention_seconds: int = 60 * 60  # Finished jobs stay queryable for an hour
+    job_event_interval: float = 0.5  # Seconds between server-sent progress events
+    
+    # Logging Settings
+    log_level: str = "INFO"
+    log_queue_size: int = 10000  # Records waiting for the writer thread; more are dropped
+    log_rate_limit: int = 10  # Rate-limited errors (e.g. per image) logged per key and interval
+    log_rate_interval: float = 60.0
+    
+    # Shared Storage Settings
+    # "" keeps images on the local disk only; "local" (a directory, e.g. a
+    # mount shared by all nodes) or "s3" also publishes them for other nodes
+    storage_backend: str = ""
+    storage_local_dir: str = ""  # Defaults to temp_dir/storage
+    storage_s3_bucket: str = ""
+    storage_s3_prefix: str = ""
+    storage_s3_endpoint_url: str = ""  # e.g. http://minio:9000 for S3-compatible stores
+    storage_s3_region: str = ""
+    storage_s3_access_key: str = ""  # Empty uses the default AWS credential chain
+    storage_s3_secret_key: str = ""
+    storage_presign_expires: int = 60 * 60  # Lifetime of presigned image URLs
+    storage_redirect: bool = True  # Redirect to presigned URLs instead of proxying image bytes
+    storage_upload_workers: int = 8  # Parallel uploads when publishing a PDF
+    
+    # Health Monitor Settings
+    health_check_interval: float = 0.5  # Seconds between event-loop lag samples
+    health_lag_window: float = 10.0  # /ready reports the worst lag of this many seconds
+    # /ready reports not-ready above these thresholds, 0 disables a check
+    ready_max_loop_lag: float = 0.5  # Seconds
+    ready_max_queue_depth: int = 32  # Extraction calls waiting for a worker process
+    ready_min_free_bytes: int = 512 * 1024 * 1024  # Free space in temp_dir
+    ready_max_rss_bytes: int = 0  # Resident memory of the server process
+    
+    # Metrics Settings
+    metrics_enabled: bool = True  # Prometheus text format at /metrics, outside api_str
+    
+    # Retention Settings
+    image_retention_seconds: int = 24 * 60 * 60  # Extracted images expire after a day unused
+    image_quota_bytes: int = 5 * 1024 * 1024 * 1024  # Oldest images are evicted above 5GB
+    cleanup_interval_seconds: int = 10 * 60
+    
+    # Result Cache Settings
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 1024 * 1024 * 1024  # 1GB of indexed results, files are kept by retention
+    result_cache_max_age: int = 24 * 60 * 60  # Seconds since last access
+    
+    # Archive Compression Settings
+    # Already-compressed formats are stored as-is, everything else is deflated
+    zip_stored_formats: List[str] = ["jpeg", "jpg", "jpx", "jp2", "png", "gif", "webp", "jb2", "jbig2"]
+    zip_compression_level: int = 6
+    
     @property
     def cors_origins(self) -> List[str]:
         """Get the CORS origins as a list."""
@@ -62,7 +149,7 @@ class Settings(BaseSettings):
 
         @classmethod
         def parse_env_var(cls, field_name: str, raw_val: str) -> any:
-            if field_name in ["allowed_extensions", "backend_cors_origins"]:
+            if field_name in ["allowed_extensions", "backend_cors_origins", "zip_stored_formats"]:
                 return parse_json_string(raw_val)
             return raw_val
 
@@ -7,11 +7,13 @@ class BaseAppException(Exception):
         self,
         message: str,
         status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
-        extra: Optional[Dict[str, Any]] = None
+        extra: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.extra = extra or {}
+        self.headers = headers
         super().__init__(message)
 
 class PDFProcessingError(BaseAppException):
@@ -33,10 +35,11 @@ class NoImagesFoundError(BaseAppException):
 
 class InvalidPDFError(BaseAppException):
     """Raised when a PDF file is invalid or corrupted."""
-    def __init__(self, message: str = "Invalid or corrupted PDF file"):
+    def __init__(self, message: str = "Invalid or corrupted PDF file", filename: Optional[str] = None):
         super().__init__(
             message=message,
-            status_code=status.HTTP_400_BAD_REQUEST
+            status_code=status.HTTP_400_BAD_REQUEST,
+            extra={"filename": filename} if filename else None
         )
 
 class FileSizeError(BaseAppException):
@@ -48,12 +51,32 @@ class FileSizeError(BaseAppException):
             extra={"max_size": max_size}
         )
 
+class PreviewError(BaseAppException):
+    """Raised when a preview cannot be rendered from an extracted image."""
+    def __init__(self, message: str, filename: Optional[str] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            extra={"filename": filename} if filename else None
+        )
+
+class ServiceBusyError(BaseAppException):
+    """Raised when the service cannot accept more work right now."""
+    def __init__(self, message: str = "Server is busy, retry later", retry_after: int = 5):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            extra={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)}
+        )
+
 def handle_app_error(error: Exception) -> HTTPException:
     """Convert application exceptions to FastAPI HTTP exceptions."""
     if isinstance(error, BaseAppException):
         return HTTPException(
             status_code=error.status_code,
-            detail={"message": error.message, "extra": error.extra}
+            detail={"message": error.message, "extra": error.extra},
+            headers=error.headers
         )
     return HTTPException(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,17 +1,36 @@
+import atexit
 import logging
+import queue
 import sys
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import json
 from datetime import datetime
 
 from .config import settings
+from .metrics import LOG_RECORDS_DROPPED
+
+try:
+    # Optional, several times faster than the json module
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 # Create logs directory if it doesn't exist
 log_dir = Path(settings.temp_dir) / "logs"
 log_dir.mkdir(parents=True, exist_ok=True)
 
+
+def dumps(data: Dict[str, Any]) -> str:
+    """Serialize a log entry, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
+
 # Configure logging format
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
@@ -24,26 +43,98 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno,
         }
-        
-        # Add extra fields if available
-        if hasattr(record, "extra"):
-            log_data["extra"] = record.extra
-            
-        return json.dumps(log_data)
+
+        # Structured data passed by log_info/log_error
+        data = getattr(record, "data", None)
+        if data:
+            log_data["extra"] = data
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+
+        return dumps(log_data)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever waiting.
+
+    Records are put on a bounded queue; when the listener falls behind (e.g.
+    a stalled disk) and the queue is full, new records are dropped and
+    counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the message arguments here, formatting to JSON happens
+        # on the listener thread. Records stay in-process, so the exception
+        # info can be kept for the formatter.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class RateLimiter:
+    """
+    Allows at most ``limit`` events per key in each ``interval`` seconds.
+
+    Used to keep a burst of identical per-image failures from flooding the
+    log: the first ``limit`` are logged, the rest of the window is counted
+    and the count reported with the next logged event.
+    """
+
+    def __init__(self, limit: int, interval: float):
+        self.limit = limit
+        self.interval = interval
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Tuple[bool, int]:
+        """
+        Record an event for ``key``.
+
+        Returns:
+            tuple: (whether to log it, events suppressed since the last logged one)
+        """
+        now = time.monotonic()
+        with self._lock:
+            started, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                started, count = now, 0
+            if count >= self.limit:
+                self._windows[key] = (started, count, suppressed + 1)
+                return False, 0
+            self._windows[key] = (started, count + 1, 0)
+            return True, suppressed
+
 
 def setup_logger(name: str) -> logging.Logger:
-    """Set up a logger with both file and console handlers."""
+    """
+    Set up a logger writing JSON lines to stdout and a rotating file.
+
+    The logger itself only enqueues records; a ``QueueListener`` thread
+    formats them and performs the console and file I/O (including
+    rotation), so a slow disk never stalls a request handler.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
+    logger.setLevel(settings.log_level.upper())
+
     # Clear existing handlers
     logger.handlers.clear()
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
-    
+
     # File handler
     file_handler = RotatingFileHandler(
         log_dir / "app.log",
@@ -51,22 +142,44 @@ def setup_logger(name: str) -> logging.Logger:
         backupCount=5
     )
     file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
-    
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.log_queue_size)
+    logger.addHandler(NonBlockingQueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # Flush the queue when the process exits
+    atexit.register(listener.stop)
+
     return logger
 
 # Create main logger
 logger = setup_logger("pdf_extractor")
+rate_limiter = RateLimiter(settings.log_rate_limit, settings.log_rate_interval)
 
 def log_info(message: str, extra: Optional[Dict[str, Any]] = None) -> None:
     """Log an info message with optional extra data."""
-    logger.info(message, extra={"extra": extra} if extra else None)
+    logger.info(message, extra={"data": extra} if extra else None, stacklevel=2)
+
+def log_error(error: Exception, extra: Optional[Dict[str, Any]] = None, rate_key: Optional[str] = None) -> None:
+    """
+    Log an error with optional extra data.
 
-def log_error(error: Exception, extra: Optional[Dict[str, Any]] = None) -> None:
-    """Log an error with optional extra data."""
+    Args:
+        error: The exception to report
+        extra: Structured context added to the entry
+        rate_key: Rate-limit errors sharing this key (e.g. per-image
+            failures) to ``log_rate_limit`` per ``log_rate_interval`` seconds
+    """
+    suppressed = 0
+    if rate_key is not None:
+        allowed, suppressed = rate_limiter.allow(rate_key)
+        if not allowed:
+            return
     error_data = {
         "error_type": type(error).__name__,
         "error_message": str(error),
         **(extra or {})
     }
-    logger.error(str(error), extra={"extra": error_data}) 
\ No newline at end of file
+    if suppressed:
+        error_data["suppressed"] = suppressed
+    logger.error(str(error), extra={"data": error_data}, stacklevel=2)
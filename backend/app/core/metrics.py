@@ -0,0 +1,274 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Metrics are plain counters guarded by a lock, so recording a value costs
+about a microsecond; rendering happens only when ``/metrics`` is scraped.
+Values reported by other components (e.g. queue depths) are registered as
+gauge functions and read at scrape time, adding nothing to the hot path.
+"""
+import bisect
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+T = TypeVar("T")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric(ABC):
+    """Base class of a metric family with a fixed set of label names."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple[str, ...]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Yield ``(sample name, label names, label values, value)`` tuples."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labelnames, labelvalues, value in self.samples():
+            lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield self.name, self.labelnames, labels, value
+
+
+class Gauge(Metric):
+    """Current value, either set explicitly or read from a function at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation)
+        self._value = 0.0
+        self._function = function
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Report the return value of ``function`` instead of a stored value."""
+        self._function = function
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        yield self.name, (), (), float(self._function() if self._function is not None else self._value)
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed, cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][position] += 1
+            entry[1][0] += value
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._values.items())
+        labelnames = self.labelnames + ("le",)
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labelnames, labels + (_format_value(float(bound)),), cumulative
+            yield f"{self.name}_sum", self.labelnames, labels, total
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics: List[Metric] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self.prefix + name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge(self.prefix + name, documentation))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        kwargs = {"buckets": buckets} if buckets is not None else {}
+        return self._register(Histogram(self.prefix + name, documentation, labelnames, **kwargs))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "".join(metric.render() for metric in self._metrics)
+
+
+def observe_iteration(iterator: Iterable[T], histogram: Histogram, *labels: str) -> Iterator[T]:
+    """
+    Yield from ``iterator``, then observe the time spent producing its items.
+
+    Time the consumer spends between items (e.g. waiting on a slow client)
+    is not counted. Nothing is observed if iteration stops early.
+    """
+    iterator = iter(iterator)
+    elapsed = 0.0
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            break
+        finally:
+            elapsed += time.perf_counter() - started
+        yield item
+    histogram.observe(elapsed, *labels)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests and timing them per route.
+
+    Requests are labelled with the route template (e.g.
+    ``/api/images/{pdf_id}/{file}``) rather than the raw path, so the number
+    of series stays bounded. The duration runs until the last body chunk is
+    sent, which includes the whole transfer of streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(scope["method"], route_path, str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], route_path)
+
+
+registry = MetricsRegistry(prefix="pdf_extractor_")
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request duration in seconds, until the response is fully sent.",
+    ("method", "route"), buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+EXTRACTIONS_IN_FLIGHT = registry.gauge(
+    "extractions_in_flight", "Extractions currently admitted and running."
+)
+EXTRACTIONS_QUEUED = registry.gauge(
+    "extractions_queued", "Extractions waiting for admission."
+)
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "admission_wait_seconds", "Seconds extractions waited for admission, 0 when admitted right away.",
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total", "Extractions refused by admission control, by reason: queue_full or timeout.",
+    ("reason",)
+)
+EVENT_LOOP_LAG = registry.gauge(
+    "event_loop_lag_seconds", "Latest event-loop lag measured by the health monitor."
+)
+EXTRACTION_SECONDS = registry.histogram(
+    "extraction_duration_seconds", "Wall time of extracting one PDF, from admission to merged result.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+EXTRACTION_STAGE_SECONDS = registry.histogram(
+    "extraction_stage_seconds",
+    "Seconds spent in each extraction stage per PDF, summed over its page shards.",
+    ("stage",), buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+IMAGES_PER_PDF = registry.histogram(
+    "images_per_pdf", "Images stored per extracted PDF.",
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+INPUT_BYTES = registry.counter(
+    "input_bytes_total", "Bytes of uploaded PDFs received for extraction."
+)
+OUTPUT_BYTES = registry.counter(
+    "output_bytes_total", "Bytes produced, by kind: extracted image files written, ZIP archives streamed.",
+    ("kind",)
+)
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total", "Log records dropped because the log writer thread fell behind."
+)
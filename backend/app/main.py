@@ -1,16 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from .core.config import settings
-from .api.v1 import health, pdf
+from .core.metrics import MetricsMiddleware
+from .api.v1 import health, jobs, metrics, pdf
+from .services.derivatives import derivative_cache
+from .services.extraction_engine import extraction_engine
+from .services.health_monitor import health_monitor
+from .services.jobs import job_manager
+from .services.retention import retention_sweeper
 
 
 # Get frontend URL from environment variable, default to http://localhost:5173 for development
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://127.0.0.1:5173")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    retention_sweeper.start()
+    await job_manager.start()
+    await health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await job_manager.stop()
+    retention_sweeper.stop()
+    derivative_cache.shutdown()
+    extraction_engine.shutdown()
+
+
 app = FastAPI(
     title=settings.project_name,
-    description="API for extracting images from PDF files"
+    description="API for extracting images from PDF files",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -23,6 +45,13 @@ app.add_middleware(
     expose_headers=["Content-Disposition", "X-Image-Count"]  # Add X-Image-Count to exposed headers
 )
 
+if settings.metrics_enabled:
+    # Outermost, so the timing includes CORS handling
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix=settings.api_str, tags=["health"])
-app.include_router(pdf.router, prefix=settings.api_str, tags=["pdf"]) 
\ No newline at end of file
+app.include_router(pdf.router, prefix=settings.api_str, tags=["pdf"])
+app.include_router(jobs.router, prefix=settings.api_str, tags=["jobs"]) 
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
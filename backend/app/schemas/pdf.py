@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 
 class PdfUploadResponse(BaseModel):
@@ -7,6 +7,7 @@ class PdfUploadResponse(BaseModel):
     image_count: int
     filename: str
     image_urls: List[str] = []
+    duplicates_skipped: int = 0
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -28,5 +29,83 @@ class ImageResponse(BaseModel):
     id: str
     url: str
     pdf_id: str
+    thumbnail_url: Optional[str] = None
+    page: Optional[int] = None
+    index: Optional[int] = None
+    xref: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    size: Optional[int] = None
+    hash: Optional[str] = None
+    bpc: Optional[int] = None
+    colorspace: Optional[str] = None
+    filter: Optional[str] = None
     
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+
+class InspectedImage(BaseModel):
+    """Metadata of one image occurrence, read without decoding the image."""
+    page: int
+    index: int
+    xref: int
+    width: int
+    height: int
+    bpc: int
+    colorspace: Optional[str] = None
+    filter: Optional[str] = None
+    smask: Optional[int] = None
+    length: Optional[int] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class PdfInspection(BaseModel):
+    """Image inventory of one PDF."""
+    filename: Optional[str] = None
+    page_count: int
+    image_count: int
+    unique_images: int
+    images: List[InspectedImage] = []
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class InspectResponse(BaseModel):
+    """Response model for PDF inspection."""
+    pdfs: List[PdfInspection]
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class JobAccepted(BaseModel):
+    """Response model for a queued extraction job."""
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class JobPdfResult(BaseModel):
+    """Images extracted from one PDF of a job."""
+    pdf_id: str
+    filename: Optional[str] = None
+    image_count: int
+    images_url: str
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class JobStatus(BaseModel):
+    """Status and progress of an extraction job."""
+    job_id: str
+    status: str
+    created_at: float
+    finished_at: Optional[float] = None
+    file_count: int
+    pages_total: int
+    pages_done: int
+    images_found: int
+    bytes_written: int
+    duplicates_skipped: int = 0
+    results: List[JobPdfResult] = []
+    error: Optional[str] = None
+    
+    model_config = ConfigDict(from_attributes=True)
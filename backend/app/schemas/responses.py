@@ -1,7 +1,25 @@
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 class HealthCheck(BaseModel):
     status: str
+    version: Optional[str] = None
+    # Saturation readings of the health monitor
+    loop_lag_ms: Optional[float] = None
+    loop_lag_max_ms: Optional[float] = None
+    pool_workers: Optional[int] = None
+    pool_pending: Optional[int] = None
+    pool_queue_depth: Optional[int] = None
+    temp_dir_free_bytes: Optional[int] = None
+    rss_bytes: Optional[int] = None
+    # Readiness checks over their threshold
+    failing: List[str] = []
+
+class SystemStats(BaseModel):
+    retention: Dict[str, Any]
+    admission: Dict[str, Any]
+    jobs: Dict[str, Any]
+    previews: Dict[str, Any]
 
 class ErrorResponse(BaseModel):
     detail: str 
\ No newline at end of file
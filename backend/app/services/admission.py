@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Tuple
+
+from ..core.config import settings
+from ..core.errors import ServiceBusyError
+from ..core.metrics import ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS, EXTRACTIONS_IN_FLIGHT, EXTRACTIONS_QUEUED
+
+
+class AdmissionController:
+    """
+    Bounds how many extractions run at once and how much memory they may use.
+
+    Each extraction reserves an estimated memory cost (upload size times
+    ``memory_factor``) and one of ``max_concurrent`` slots. Extractions that
+    do not fit wait in FIFO order; once ``max_queue`` are waiting, further
+    ones are refused immediately with ``ServiceBusyError``, and a waiter that
+    is not admitted within ``queue_timeout`` seconds is refused as well. A
+    single extraction larger than the whole budget is admitted when nothing
+    else is running, so it is slow rather than impossible.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        memory_budget: int,
+        memory_factor: float,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.memory_budget = memory_budget
+        self.memory_factor = memory_factor
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._waiters: Deque[Tuple[int, "asyncio.Future[None]"]] = deque()
+
+        # Current state
+        self.in_flight = 0
+        self.reserved_bytes = 0
+
+        # Counters
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def estimate(self, upload_size: int) -> int:
+        """Estimated peak memory of extracting an upload of ``upload_size`` bytes."""
+        return int(upload_size * self.memory_factor)
+
+    def _fits(self, cost: int) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            return False
+        return self.in_flight == 0 or self.reserved_bytes + cost <= self.memory_budget
+
+    def _grant(self, cost: int) -> None:
+        self.in_flight += 1
+        self.reserved_bytes += cost
+        self.admitted += 1
+
+    def _wake(self) -> None:
+        # Strict FIFO: a large waiter at the head is not overtaken by small ones
+        while self._waiters:
+            cost, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(cost):
+                break
+            self._waiters.popleft()
+            self._grant(cost)
+            waiter.set_result(None)
+
+    def _busy(self, message: str, reason: str) -> ServiceBusyError:
+        self.rejected += 1
+        ADMISSION_REJECTED.inc(reason)
+        return ServiceBusyError(message, retry_after=self.retry_after)
+
+    def check(self) -> None:
+        """
+        Refuse new work up front when the wait queue is already full.
+
+        Raises:
+            ServiceBusyError: If ``max_queue`` extractions are already waiting
+        """
+        if len(self._waiters) >= self.max_queue:
+            raise self._busy("Too many extractions in progress, retry later", "queue_full")
+
+    async def acquire(self, cost: int, bounded: bool = True) -> None:
+        """
+        Wait for a slot and ``cost`` bytes of the memory budget.
+
+        Args:
+            cost: Estimated memory of the extraction in bytes
+            bounded: Apply the queue size and wait timeout. Background jobs,
+                which already passed their own queue, wait without either.
+
+        Raises:
+            ServiceBusyError: If the queue is full or the wait timed out
+        """
+        if not self._waiters and self._fits(cost):
+            self._grant(cost)
+            ADMISSION_WAIT_SECONDS.observe(0.0)
+            return
+        if bounded:
+            self.check()
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((cost, waiter))
+        try:
+            if bounded:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            else:
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the wait was abandoned: hand the slot back
+                self.release(cost)
+            else:
+                waiter.cancel()
+                self._wake()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._busy("Timed out waiting for an extraction slot, retry later", "timeout") from None
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            ADMISSION_WAIT_SECONDS.observe(waited)
+
+    def release(self, cost: int) -> None:
+        """Return a slot and its memory reservation, admitting waiters that now fit."""
+        self.in_flight -= 1
+        self.reserved_bytes -= cost
+        self._wake()
+
+    @asynccontextmanager
+    async def admit(self, upload_size: int, bounded: bool = True) -> AsyncIterator[None]:
+        """Hold an admission for an upload of ``upload_size`` bytes while the block runs."""
+        cost = self.estimate(upload_size)
+        await self.acquire(cost, bounded)
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and lifetime counters."""
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queue_depth,
+            "reserved_bytes": self.reserved_bytes,
+            "memory_budget": self.memory_budget,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.admitted, 3) if self.admitted else 0.0,
+        }
+
+
+admission_controller = AdmissionController(
+    max_concurrent=settings.max_concurrent_extractions,
+    memory_budget=settings.extraction_memory_budget,
+    memory_factor=settings.extraction_memory_factor,
+    max_queue=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout,
+    retry_after=settings.admission_retry_after,
+)
+EXTRACTIONS_IN_FLIGHT.set_function(lambda: admission_controller.in_flight)
+EXTRACTIONS_QUEUED.set_function(lambda: admission_controller.queue_depth)
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from ..core.config import settings
+from ..core.errors import PreviewError
+from ..core.logger import log_error
+from .pdf_worker import CONVERSION_FORMATS, convert_for_format, render_preview
+
+# Subdirectory of images/<pdf_id> holding resized and converted variants
+DERIVED_DIRNAME = "derived"
+
+
+def render_derivative(source: Path, target: Path, width: Optional[int], image_format: str) -> int:
+    """
+    Write a resized/converted variant of ``source`` to ``target``.
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    pil_format = CONVERSION_FORMATS[image_format]
+    with Image.open(source) as image:
+        preview = convert_for_format(render_preview(image, width), pil_format)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so readers never see a partial file
+        partial = target.with_name(f".{target.name}.{threading.get_ident()}")
+        try:
+            preview.save(partial, format=pil_format)
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+    return target.stat().st_size
+
+
+class DerivativeCache:
+    """
+    On-disk cache of image variants, stored next to the originals.
+
+    Variants live in ``images/<pdf_id>/derived/``, mirroring the layout of
+    the PDF directory (``thumbs/x.webp`` varies into ``derived/thumbs/``),
+    so they expire together with the PDF they belong to.
+
+    They are rendered on first request in a dedicated thread pool (PIL
+    releases the GIL while decoding and resampling); concurrent requests
+    for the same variant share one render. Their total size is bounded by
+    ``max_bytes``: once it is exceeded, the least recently written variants
+    are evicted down to ``low_water`` of the budget, so the directory scan
+    this takes runs once per batch of renders rather than after each one.
+    """
+
+    def __init__(self, images_dir: Path, max_bytes: int, workers: int, low_water: float = 0.9):
+        self.images_dir = images_dir
+        self.max_bytes = max_bytes
+        self.low_water = min(max(low_water, 0.0), 1.0)
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Path, "asyncio.Future[int]"] = {}
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        # Running total, None until the first eviction scan measures it
+        self._total: Optional[int] = None
+
+        # Counters
+        self.hits = 0
+        self.renders = 0
+        self.evicted = 0
+        self.scans = 0
+
+    def path_for(self, source: Path, width: Optional[int], image_format: str) -> Path:
+        """Location of a variant of ``source``, a file below ``images/<pdf_id>``."""
+        pdf_id, *parents, name = source.relative_to(self.images_dir.resolve()).parts
+        size = f"w{width}" if width else "full"
+        return self.images_dir.joinpath(pdf_id, DERIVED_DIRNAME, *parents, f"{name}.{size}.{image_format}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="derivatives")
+        return self._executor
+
+    async def get(self, source: Path, width: Optional[int], image_format: str) -> Path:
+        """
+        Return the variant of ``source``, rendering it if needed.
+
+        Raises:
+            PreviewError: If the source image cannot be decoded
+        """
+        target = self.path_for(source, width, image_format)
+        if target.is_file():
+            self.hits += 1
+            return target
+
+        pending = self._pending.get(target)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(
+                self._get_executor(), self._render, source, target, width, image_format
+            )
+            self._pending[target] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(target, None))
+        try:
+            await asyncio.shield(pending)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            log_error(e, {"context": "preview_render", "image": str(source)}, rate_key="preview_render")
+            raise PreviewError(f"Cannot render a preview of '{source.name}'", source.name) from e
+
+        return target
+
+    def _render(self, source: Path, target: Path, width: Optional[int], image_format: str) -> int:
+        size = render_derivative(source, target, width, image_format)
+        with self._lock:
+            self.renders += 1
+            if self._total is not None:
+                self._total += size
+            over_budget = self._total is None or self._total > self.max_bytes
+        # Renders finishing during an eviction do not queue behind its scan
+        if over_budget and not self._evict_lock.locked():
+            self.evict()
+        return size
+
+    def _variants(self) -> List[Tuple[float, int, Path]]:
+        variants = []
+        for path in self.images_dir.glob(f"*/{DERIVED_DIRNAME}/**/*"):
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            # ** also yields the mirrored subdirectories
+            if stat.S_ISREG(info.st_mode):
+                variants.append((info.st_mtime, info.st_size, path))
+        return variants
+
+    def evict(self) -> int:
+        """
+        Measure the variants and, if they exceed ``max_bytes``, remove the
+        oldest until the total is under ``low_water`` of it.
+
+        Returns:
+            int: Number of bytes reclaimed
+        """
+        with self._evict_lock:
+            variants = sorted(self._variants(), key=lambda item: item[0])
+            total = sum(size for _, size, _ in variants)
+            limit = self.max_bytes * self.low_water if total > self.max_bytes else self.max_bytes
+            reclaimed = removed = 0
+            for _, size, path in variants:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except OSError as e:
+                    log_error(e, {"context": "derivative_evict", "path": str(path)}, rate_key="derivative_evict")
+                    continue
+                total -= size
+                reclaimed += size
+                removed += 1
+            with self._lock:
+                self.scans += 1
+                self.evicted += removed
+                self._total = total
+            return reclaimed
+
+    def stats(self) -> Dict[str, int]:
+        """Lifetime counters of the cache."""
+        return {
+            "hits": self.hits,
+            "renders": self.renders,
+            "evicted": self.evicted,
+            "scans": self.scans,
+            "bytes": self._total or 0,
+            "max_bytes": self.max_bytes,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the render threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+derivative_cache = DerivativeCache(
+    images_dir=Path(settings.temp_dir).joinpath("images"),
+    max_bytes=settings.derivative_cache_max_bytes,
+    workers=settings.derivative_workers,
+    low_water=settings.derivative_cache_low_water,
+)
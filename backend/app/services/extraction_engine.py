@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from ..core.config import settings
+from ..core.errors import InvalidPDFError, PDFProcessingError
+from ..core.logger import log_error
+from .pdf_worker import InvalidDocumentError, create_process_pool
+
+
+class ExtractionEngine:
+    """
+    Process pool that runs CPU-bound PDF work off the event loop.
+
+    The pool is created lazily on first use and rebuilt transparently if a
+    worker dies (e.g. a hostile PDF crashing MuPDF), so one bad document
+    fails its own request instead of the whole server.
+    """
+
+    def __init__(self, max_workers: int, max_tasks_per_child: Optional[int] = None):
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Calls submitted and not finished yet, running or waiting for a worker
+        self.pending = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self.pending - self.max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = create_process_pool(self.max_workers, self.max_tasks_per_child)
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next call starts a fresh pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        filename: Optional[str] = None,
+        on_abandon: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process.
+
+        Cancelling the caller drops calls still waiting for a worker; a call
+        already running cannot be interrupted and finishes in the background.
+
+        Args:
+            fn: Picklable, module-level function to execute
+            *args: Positional arguments passed to ``fn``
+            filename: Name of the PDF being processed, used in error reports
+            on_abandon: Called, from a pool thread, once a call that was
+                cancelled while running has finished, e.g. to remove its output
+
+        Raises:
+            InvalidPDFError: If the worker could not open the PDF
+            PDFProcessingError: If the worker raised otherwise or crashed
+        """
+        executor = self._get_executor()
+        self.pending += 1
+        try:
+            future = executor.submit(fn, *args)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if on_abandon is not None and not future.cancel():
+                    future.add_done_callback(lambda _: on_abandon())
+                raise
+        except BrokenProcessPool as e:
+            self._discard(executor)
+            log_error(e, {"context": "extraction_worker", "filename": filename})
+            raise PDFProcessingError(
+                "Extraction worker crashed while processing the PDF", filename
+            ) from e
+        except InvalidDocumentError as e:
+            # The upload is at fault, not the server
+            raise InvalidPDFError(str(e), filename) from e
+        except Exception as e:
+            raise PDFProcessingError(f"Error processing PDF: {str(e)}", filename) from e
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Worker count and calls in progress."""
+        return {"workers": self.max_workers, "pending": self.pending, "queue_depth": self.queue_depth}
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+extraction_engine = ExtractionEngine(
+    max_workers=settings.extraction_workers,
+    max_tasks_per_child=settings.extraction_max_tasks_per_child,
+)
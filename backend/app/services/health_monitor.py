@@ -0,0 +1,164 @@
+import asyncio
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.metrics import EVENT_LOOP_LAG
+from .extraction_engine import extraction_engine
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, None if it cannot be read."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+class HealthMonitor:
+    """
+    Background task sampling how saturated the server is.
+
+    Every ``interval`` seconds it sleeps on the event loop and records how
+    late it woke up: that delay is the event-loop lag, the time any request
+    currently waits before its handler runs. The worst lag of the last
+    ``lag_window`` seconds is kept so a short stall stays visible to the next
+    probe. Each tick also reads the extraction pool queue depth, free space
+    in ``temp_dir`` and the process RSS.
+
+    ``failing()`` compares the readings with the readiness thresholds (0
+    disables a check), so a saturated instance reports not-ready and the
+    load balancer shifts traffic away before its latency collapses.
+    """
+
+    def __init__(
+        self,
+        temp_dir: Path,
+        interval: float,
+        lag_window: float,
+        max_loop_lag: float,
+        max_queue_depth: int,
+        min_free_bytes: int,
+        max_rss_bytes: int
+    ):
+        self.temp_dir = temp_dir
+        self.interval = interval
+        self.lag_window = lag_window
+        self.max_loop_lag = max_loop_lag
+        self.max_queue_depth = max_queue_depth
+        self.min_free_bytes = min_free_bytes
+        self.max_rss_bytes = max_rss_bytes
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._lags: Deque[Tuple[float, float]] = deque()
+        self._last_tick: Optional[float] = None
+
+        # Latest readings
+        self.loop_lag = 0.0
+        self.temp_dir_free: Optional[int] = None
+        self.rss: Optional[int] = None
+
+    async def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record_lag(max(0.0, loop.time() - expected))
+            self.sample_resources()
+
+    def _record_lag(self, lag: float) -> None:
+        now = time.monotonic()
+        self._last_tick = now
+        self.loop_lag = lag
+        self._lags.append((now, lag))
+        while self._lags and self._lags[0][0] < now - self.lag_window:
+            self._lags.popleft()
+
+    def sample_resources(self) -> None:
+        """Read the free space of ``temp_dir`` and the process RSS."""
+        try:
+            self.temp_dir_free = shutil.disk_usage(self.temp_dir).free
+        except OSError:
+            self.temp_dir_free = None
+        self.rss = process_rss()
+
+    @property
+    def loop_lag_max(self) -> float:
+        """Worst lag of the window, including a stall still in progress."""
+        worst = max((lag for _, lag in self._lags), default=0.0)
+        if self._last_tick is not None:
+            # A tick overdue by more than the interval means the loop is blocked right now
+            worst = max(worst, time.monotonic() - self._last_tick - self.interval)
+        return worst
+
+    def readings(self) -> Dict[str, Any]:
+        """Latest readings, sampling resources directly if the monitor is not running."""
+        if self._task is None:
+            self.sample_resources()
+        return {
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "loop_lag_max_ms": round(self.loop_lag_max * 1000, 1),
+            "pool_workers": extraction_engine.max_workers,
+            "pool_pending": extraction_engine.pending,
+            "pool_queue_depth": extraction_engine.queue_depth,
+            "temp_dir_free_bytes": self.temp_dir_free,
+            "rss_bytes": self.rss,
+        }
+
+    def failing(self, readings: Dict[str, Any]) -> List[str]:
+        """Readiness checks exceeding their threshold, as messages."""
+        failures = []
+        lag_ms = readings["loop_lag_max_ms"]
+        if self.max_loop_lag and lag_ms > self.max_loop_lag * 1000:
+            failures.append(f"Event loop lag of {lag_ms:g}ms exceeds {self.max_loop_lag * 1000:g}ms")
+        depth = readings["pool_queue_depth"]
+        if self.max_queue_depth and depth > self.max_queue_depth:
+            failures.append(f"{depth} extraction calls waiting for a worker, limit is {self.max_queue_depth}")
+        free = readings["temp_dir_free_bytes"]
+        if self.min_free_bytes and free is not None and free < self.min_free_bytes:
+            failures.append(f"Only {free} bytes free in the temporary directory, minimum is {self.min_free_bytes}")
+        rss = readings["rss_bytes"]
+        if self.max_rss_bytes and rss is not None and rss > self.max_rss_bytes:
+            failures.append(f"Resident memory of {rss} bytes exceeds {self.max_rss_bytes}")
+        return failures
+
+
+health_monitor = HealthMonitor(
+    temp_dir=Path(settings.temp_dir),
+    interval=settings.health_check_interval,
+    lag_window=settings.health_lag_window,
+    max_loop_lag=settings.ready_max_loop_lag,
+    max_queue_depth=settings.ready_max_queue_depth,
+    min_free_bytes=settings.ready_min_free_bytes,
+    max_rss_bytes=settings.ready_max_rss_bytes,
+)
+EVENT_LOOP_LAG.set_function(lambda: health_monitor.loop_lag)
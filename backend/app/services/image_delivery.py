@@ -0,0 +1,105 @@
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+
+# Extensions PyMuPDF produces that mimetypes does not know
+MEDIA_TYPE_OVERRIDES = {
+    "jb2": "image/x-jbig2",
+    "jbig2": "image/x-jbig2",
+    "pam": "image/x-portable-arbitrarymap",
+}
+
+IMAGE_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def media_type_for(path: Path) -> str:
+    """Content type of an extracted image, from its extension."""
+    ext = path.suffix.lower().lstrip(".")
+    if ext in MEDIA_TYPE_OVERRIDES:
+        return MEDIA_TYPE_OVERRIDES[ext]
+    return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    # mtime and size are part of the key so a rewritten file is hashed again
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(IMAGE_HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def file_etag(path: Path, stat_result: os.stat_result) -> str:
+    """Strong ETag from the file content, hashed once per file version."""
+    digest = await run_in_threadpool(_file_digest, str(path), stat_result.st_mtime_ns, stat_result.st_size)
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def resolve_image_path(pdf_id: str, filename: str) -> Optional[Path]:
+    """
+    Locate a file below ``images/<pdf_id>``.
+
+    Returns:
+        Path: The file, or None if it does not exist or lies outside the PDF directory
+    """
+    pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id).resolve()
+    path = pdf_dir.joinpath(filename).resolve()
+    if not path.is_relative_to(pdf_dir) or not path.is_file():
+        return None
+    return path
+
+
+async def image_response(request: Request, path: Path, filename: str) -> Response:
+    """
+    Serve an extracted image with caching headers.
+
+    Extracted images never change once written, so responses carry a strong
+    content ETag and ``Cache-Control: immutable``, and a matching
+    If-None-Match is answered with 304. Range requests are served by
+    FileResponse. When ``settings.image_accel_redirect`` is set, the bytes
+    are left to nginx through X-Accel-Redirect.
+    """
+    stat_result = path.stat()
+    etag = await file_etag(path, stat_result)
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.image_cache_max_age}, immutable",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = media_type_for(path)
+    if settings.image_accel_redirect:
+        relative = path.relative_to(Path(settings.temp_dir).joinpath("images").resolve())
+        headers["X-Accel-Redirect"] = f"{settings.image_accel_redirect.rstrip('/')}/{relative.as_posix()}"
+        return Response(media_type=media_type, headers=headers)
+
+    return FileResponse(
+        str(path),
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+        headers=headers
+    )
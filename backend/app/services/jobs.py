@@ -0,0 +1,159 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from ..core.config import settings
+from ..core.errors import BaseAppException, ServiceBusyError
+from ..core.logger import log_error
+from .pdf_service import DuplicateIndex, ExtractionProgress, PdfService
+from .pdf_worker import ExtractionOptions
+from .upload_spool import SpooledUpload
+
+
+@dataclass
+class Job:
+    """An extraction request processed in the background."""
+    id: str
+    uploads: List[SpooledUpload]
+    options: ExtractionOptions
+    status: str = "queued"  # queued, running, completed or failed
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    progress: ExtractionProgress = field(default_factory=ExtractionProgress)
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    duplicates_skipped: int = 0
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "file_count": len(self.uploads),
+            **self.progress.snapshot(),
+            "duplicates_skipped": self.duplicates_skipped,
+            "results": self.results,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Bounded queue of extraction jobs drained by a fixed set of consumer tasks.
+
+    Submitting to a full queue fails immediately with ``ServiceBusyError``
+    instead of accepting work the server cannot get to. Finished jobs are
+    kept for ``retention`` seconds so clients can collect their results.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retention: int):
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.retention = retention
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional["asyncio.Queue[Job]"] = None
+        self._consumers: List["asyncio.Task[None]"] = []
+
+    async def start(self) -> None:
+        """Start the consumer tasks on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the consumers and release the uploads of unstarted jobs."""
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        for job in self.jobs.values():
+            if not job.done:
+                for upload in job.uploads:
+                    upload.cleanup()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and job counts by status."""
+        counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return {"queue_depth": self.queue_depth, "queue_size": self.queue_size, **counts}
+
+    def submit(self, uploads: List[SpooledUpload], options: ExtractionOptions) -> Job:
+        """
+        Queue an extraction job.
+
+        Raises:
+            ServiceBusyError: If the job queue is full
+        """
+        self._prune()
+        job = Job(id=str(uuid4()), uploads=uploads, options=options)
+        if self._queue is None:
+            raise ServiceBusyError("Job queue is not running")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServiceBusyError("Too many queued extraction jobs, retry later") from None
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        for job_id in [job.id for job in self.jobs.values() if job.done and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        try:
+            results = await PdfService.extract_all(
+                PdfService.extract_upload(upload, job.options, job.progress, bounded=False)
+                for upload in job.uploads
+            )
+            index = DuplicateIndex()
+            for result in results:
+                if job.options.dedupe:
+                    index.merge(result)
+                job.duplicates_skipped += result.duplicate_count
+                job.results.append({
+                    "pdf_id": result.pdf_id,
+                    "filename": result.filename,
+                    "image_count": len(result.stored_images),
+                    "images_url": f"{settings.api_str}/pdf/{result.pdf_id}/images",
+                })
+            job.status = "completed"
+        except BaseAppException as e:
+            job.status, job.error = "failed", e.message
+        except Exception as e:
+            log_error(e, {"context": "extraction_job", "job_id": job.id})
+            job.status, job.error = "failed", str(e)
+        finally:
+            for upload in job.uploads:
+                upload.cleanup()
+            job.finished_at = time.time()
+
+
+job_manager = JobManager(
+    workers=settings.job_workers,
+    queue_size=settings.job_queue_size,
+    retention=settings.job_retention_seconds,
+)
@@ -1,17 +1,127 @@
-import fitz
-from typing import BinaryIO, Tuple, List
-import io
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import json
+import shutil
+import time
 import zipfile
-from datetime import datetime
-import os
 from pathlib import Path
 from uuid import uuid4
-from PIL import Image
-from fastapi import UploadFile, HTTPException
+from fastapi import UploadFile
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
-from ..core.logger import logger, log_error
-from ..core.errors import PDFProcessingError, NoImagesFoundError, InvalidPDFError
+from ..core.logger import log_error
+from ..core.errors import BaseAppException
 from ..core.config import settings
+from ..core.metrics import (
+    EXTRACTION_SECONDS, EXTRACTION_STAGE_SECONDS, IMAGES_PER_PDF, INPUT_BYTES, OUTPUT_BYTES,
+    observe_iteration
+)
+from .admission import admission_controller
+from .extraction_engine import extraction_engine
+from .image_delivery import media_type_for
+from .pdf_worker import (
+    MANIFEST_FILENAME, ExtractionOptions, ExtractionResult,
+    content_hash, extract_document, inspect_document
+)
+from .result_cache import result_cache
+from .retention import retention_sweeper
+from .storage import image_key, manifest_key, storage
+from .upload_spool import SpooledUpload, spool_upload
+from .zip_stream import ZipStream
+
+# Manifest record fields published with every image
+IMAGE_METADATA_KEYS = (
+    "page", "index", "xref", "width", "height", "format", "size", "hash", "bpc", "colorspace", "filter"
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_manifest(path: str, mtime_ns: int, size: int) -> Tuple[str, Dict[str, Any]]:
+    # mtime and size are part of the key so a rewritten manifest is read again
+    data = Path(path).read_bytes()
+    return f'"{content_hash(data)}"', json.loads(data)
+
+class DuplicateIndex:
+    """Content-hash index shared by all PDFs of one request."""
+    
+    def __init__(self, remove_files: bool = False):
+        self.remove_files = remove_files
+        self._first_by_hash: Dict[str, str] = {}
+    
+    def merge(self, result: ExtractionResult) -> Set[str]:
+        """
+        Collapse images of ``result`` already seen in an earlier result.
+        
+        The first copy of each content hash wins; later copies are turned
+        into ``duplicate_of`` references. Their files are only deleted with
+        ``remove_files``: each PDF directory is otherwise left self-contained
+        so it can be cached and expired independently of the others.
+        
+        Returns:
+            set: IDs of the images that were collapsed
+        """
+        removed: Dict[str, str] = {}
+        
+        for record in result.stored_images:
+            first_id = self.claim(record)
+            if first_id is None:
+                continue
+            removed[record["id"]] = first_id
+            if self.remove_files:
+                pdf_dir = Path(settings.temp_dir).joinpath("images", result.pdf_id)
+                pdf_dir.joinpath(record["filename"]).unlink(missing_ok=True)
+                if "thumbnail" in record:
+                    pdf_dir.joinpath(record["thumbnail"]).unlink(missing_ok=True)
+            for key in ("id", "filename", "format", "size", "hash", "stored_hash", "thumbnail", "thumbnail_hash"):
+                record.pop(key, None)
+            record["duplicate_of"] = first_id
+        
+        # Re-point in-document references that targeted a removed copy
+        for record in result.images:
+            if record.get("duplicate_of") in removed:
+                record["duplicate_of"] = removed[record["duplicate_of"]]
+        
+        return set(removed)
+    
+    def claim(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Register a stored image without modifying it.
+        
+        Returns:
+            str: ID of the earlier copy of the same content, None if ``record`` is the first
+        """
+        first_id = self._first_by_hash.setdefault(record["hash"], record["id"])
+        return None if first_id == record["id"] else first_id
+
+
+class ExtractionProgress:
+    """Running totals of an extraction, updated as page shards are merged."""
+    
+    def __init__(self):
+        self.pages_total = 0
+        self.pages_done = 0
+        self.images_found = 0
+        self.bytes_written = 0
+    
+    def add_document(self, page_count: int) -> None:
+        self.pages_total += page_count
+    
+    def add_shard(self, shard: ExtractionResult, pages: int) -> None:
+        self.pages_done += pages
+        self.images_found += len(shard.stored_images)
+        self.bytes_written += sum(record["size"] for record in shard.stored_images)
+    
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "images_found": self.images_found,
+            "bytes_written": self.bytes_written,
+        }
+
 
 class PdfService:
     @staticmethod
@@ -20,176 +130,660 @@ class PdfService:
         Path(settings.temp_dir).joinpath("images").mkdir(parents=True, exist_ok=True)
     
     @staticmethod
-    async def cleanup_old_images():
-        """Clean up images older than the configured retention period"""
-        # TODO: Implement cleanup of old images
-        pass
-
-    @staticmethod
-    async def extract_images(file: UploadFile) -> Tuple[bytes, int, List[str]]:
+    async def inspect_images(file: UploadFile) -> Dict[str, Any]:
         """
-        Extract images from a PDF file, save them to disk, and return their IDs
+        List the images of an uploaded PDF from their metadata only.
+        
+        No image stream is decoded or written, so this answers in
+        milliseconds where extraction would take seconds.
+        
+        Args:
+            file: Uploaded PDF file
+            
         Returns:
-            tuple: (ZIP file bytes, number of images, list of image IDs)
+            dict: filename, page_count, image_count, unique_images and one
+            record per image occurrence
+            
+        Raises:
+            FileSizeError: If the upload exceeds the configured size limit
+            InvalidPDFError: If the PDF could not be opened
         """
+        upload = await spool_upload(file)
         try:
-            PdfService.ensure_temp_dirs()
-            content = await file.read()
-            pdf_document = fitz.open(stream=content, filetype="pdf")
-            
-            # Create a unique ID for this PDF
-            pdf_id = str(uuid4())
-            pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
-            pdf_dir.mkdir(exist_ok=True)
-            
-            # Create a ZIP file in memory
-            zip_buffer = io.BytesIO()
-            image_ids = []
+            inventory = await extraction_engine.run(inspect_document, upload.source, filename=upload.filename)
+        finally:
+            upload.cleanup()
+        return {
+            "filename": upload.filename,
+            "page_count": inventory["page_count"],
+            "image_count": len(inventory["images"]),
+            "unique_images": len({record["xref"] for record in inventory["images"]}),
+            "images": inventory["images"],
+        }
+    
+    @staticmethod
+    async def cleanup_old_images() -> Dict[str, int]:
+        """
+        Clean up images older than the configured retention period.
+        
+        Runs one retention pass in a worker thread; the background sweeper
+        started with the application calls the same routine periodically.
+        
+        Returns:
+            dict: Directories removed and bytes reclaimed
+        """
+        return await run_in_threadpool(retention_sweeper.sweep)
+
+    @staticmethod
+    async def extract_images(
+        file: UploadFile,
+        options: Optional[ExtractionOptions] = None
+    ) -> ExtractionResult:
+        """
+        Extract images from an uploaded PDF, save them to disk, and return their records.
+        
+        Args:
+            file: Uploaded PDF file
+            options: Extraction options, defaults to passthrough extraction
             
-            with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                image_count = 0
-                
-                for page_num in range(pdf_document.page_count):
-                    page = pdf_document[page_num]
-                    image_list = page.get_images()
-                    
-                    for img_index, img in enumerate(image_list):
-                        xref = img[0]
-                        base_image = pdf_document.extract_image(xref)
-                        image_bytes = base_image["image"]
-                        
-                        # Convert to PIL Image for potential processing
-                        image = Image.open(io.BytesIO(image_bytes))
-                        
-                        # Generate unique filename
-                        image_filename = f"page_{page_num + 1}_image_{img_index + 1}.{image.format.lower() if image.format else 'png'}"
-                        image_path = pdf_dir.joinpath(image_filename)
-                        
-                        # Save image to disk
-                        image.save(image_path, format=image.format or 'PNG')
-                        image_ids.append(f"{pdf_id}/{image_filename}")
-                        
-                        # Also add to ZIP
-                        img_buffer = io.BytesIO()
-                        image.save(img_buffer, format=image.format or 'PNG')
-                        img_buffer.seek(0)
-                        zip_file.writestr(image_filename, img_buffer.getvalue())
-                        image_count += 1
-                        
-            zip_buffer.seek(0)
-            return zip_buffer.getvalue(), image_count, image_ids
+        Returns:
+            ExtractionResult: Per-image records
             
-        except Exception as e:
-            # Clean up on error
-            if 'pdf_dir' in locals() and pdf_dir.exists():
-                import shutil
-                shutil.rmtree(pdf_dir)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error processing PDF: {str(e)}"
-            )
-        finally:
-            if 'pdf_document' in locals():
-                pdf_document.close()
-            await file.seek(0)  # Reset file pointer for potential reuse
+        Raises:
+            FileSizeError: If the upload exceeds the configured size limit
+            InvalidPDFError: If the PDF could not be opened
+            PDFProcessingError: If the PDF could not be processed
+        """
+        upload = await spool_upload(file)
+        return await PdfService.extract_upload(upload, options)
 
     @staticmethod
-    async def extract_images_from_pdfs(files: list[BinaryIO]) -> tuple[bytes, int]:
+    async def extract_upload(
+        upload: SpooledUpload,
+        options: Optional[ExtractionOptions] = None,
+        progress: Optional["ExtractionProgress"] = None,
+        bounded: bool = True,
+        on_records: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        admitted: bool = False
+    ) -> ExtractionResult:
         """
-        Extract images from multiple PDF files and return them as a ZIP file.
+        Extract images from a spooled upload, save them to disk, and return their records.
+        
+        The extraction itself runs in the worker process pool so the event
+        loop stays responsive while large documents are processed. The spool
+        file is removed once extraction finishes.
+        
+        Results are cached by PDF content hash and options: a repeated upload
+        is answered from the stored manifest without opening the PDF. Other
+        uploads first pass admission control, which bounds the number of
+        concurrent extractions and their estimated memory use.
+        
+        The duration, per-stage timings and image count of each extraction
+        are recorded in the metrics registry. With a shared storage backend
+        configured, the result is published to it before returning.
         
         Args:
-            files: List of file-like objects containing PDF data
+            upload: Spooled PDF upload
+            options: Extraction options, defaults to passthrough extraction
+            progress: Optional tracker updated as page shards complete
+            bounded: Fail fast when the admission queue is full, instead of
+                waiting for a slot however long it takes
+            on_records: Optional callback receiving the final records of each
+                page shard as soon as it is merged, in page order
+            admitted: The caller already holds an admission covering this
+                upload, e.g. one taken for a whole streaming request
             
         Returns:
-            tuple: (ZIP file as bytes, number of images extracted)
+            ExtractionResult: Per-image records
             
         Raises:
-            PDFProcessingError: If there's an error processing the PDF
-            NoImagesFoundError: If no images are found in any PDF
-            InvalidPDFError: If a PDF file is invalid or corrupted
+            InvalidPDFError: If the PDF could not be opened
+            PDFProcessingError: If the PDF could not be processed
+            ServiceBusyError: If the extraction was not admitted
         """
-        zip_buffer = io.BytesIO()
-        total_images = 0
+        PdfService.ensure_temp_dirs()
+        options = options or ExtractionOptions.from_settings(settings)
+        INPUT_BYTES.inc(amount=upload.size)
+        
+        cache_key = None
+        if settings.result_cache_enabled and upload.digest:
+            cache_key = result_cache.key(upload.digest, options)
+            cached_id = await run_in_threadpool(result_cache.get, cache_key)
+            cached = PdfService.load_result(cached_id) if cached_id else None
+            if cached is not None:
+                upload.cleanup()
+                cached.filename = upload.filename
+                if progress is not None:
+                    progress.add_document(cached.page_count)
+                    progress.add_shard(cached, cached.page_count)
+                if on_records is not None:
+                    on_records(cached.images)
+                return cached
+        
+        # Create a unique ID for this PDF
+        pdf_id = str(uuid4())
+        pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
+        
+        tasks: List["asyncio.Future[ExtractionResult]"] = []
+        shard_pages: List[int] = []
+        
+        def remove_output() -> None:
+            shutil.rmtree(pdf_dir, ignore_errors=True)
         
         try:
-            with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                for pdf_file in files:
+            admission = nullcontext() if admitted else admission_controller.admit(upload.size, bounded)
+            async with admission:
+                started = time.perf_counter()
+                # Extracts the whole document, unless it is long enough to be
+                # split; then only its page count is read
+                first = await extraction_engine.run(
+                    extract_document, upload.source, str(pdf_dir), pdf_id, options, None,
+                    settings.extraction_shard_min_pages - 1, filename=upload.filename, on_abandon=remove_output
+                )
+                page_count = first.page_count
+                if progress is not None:
+                    progress.add_document(page_count)
+                
+                result = ExtractionResult(pdf_id=pdf_id, filename=upload.filename, page_count=page_count)
+                shards = PdfService.plan_shards(page_count)
+                if shards == [None]:
+                    # Already extracted by the first call
+                    whole: "asyncio.Future[ExtractionResult]" = asyncio.get_running_loop().create_future()
+                    whole.set_result(first)
+                    tasks.append(whole)
+                    shard_pages.append(page_count)
+                else:
+                    result.timings["count_pages"] = time.perf_counter() - started
+                    for start, stop in shards:
+                        if not options.selects_pages(start, stop):
+                            # No page of this shard passes the page filter
+                            if progress is not None:
+                                progress.add_shard(ExtractionResult(pdf_id=pdf_id), stop - start)
+                            continue
+                        tasks.append(asyncio.ensure_future(extraction_engine.run(
+                            extract_document, upload.source, str(pdf_dir), pdf_id, options, (start, stop),
+                            filename=upload.filename, on_abandon=remove_output
+                        )))
+                        shard_pages.append(stop - start)
+                
+                # Collapses duplicates that span several shards
+                index = DuplicateIndex(remove_files=True) if options.dedupe and len(tasks) > 1 else None
+                failure: Optional[BaseException] = None
+                for task, pages in zip(tasks, shard_pages):
+                    # Wait for every shard before failing so none is still writing to pdf_dir
                     try:
-                        pdf_content = await pdf_file.read()
-                        pdf_stream = io.BytesIO(pdf_content)
-                        
-                        try:
-                            doc = fitz.open(stream=pdf_stream, filetype="pdf")
-                        except Exception as e:
-                            logger.error(f"Error opening PDF {pdf_file.filename}: {str(e)}")
-                            raise InvalidPDFError(f"Could not open file: {str(e)}") from e
-                        
-                        file_images = 0
-                        seen_xrefs = set()
-                        
-                        for page_num, page in enumerate(doc, 1):
-                            for img in page.get_images():
-                                xref = img[0]
-                                if xref not in seen_xrefs:
-                                    seen_xrefs.add(xref)
-                                    try:
-                                        base_image = doc.extract_image(xref)
-                                        image_data = base_image["image"]
-                                        ext = base_image["ext"]
-                                        
-                                        filename = f"{pdf_file.filename}_page{page_num}_img{file_images + 1}.{ext}"
-                                        zip_file.writestr(filename, image_data)
-                                        file_images += 1
-                                        total_images += 1
-                                    except Exception as e:
-                                        log_error(e, {
-                                            "pdf_file": pdf_file.filename,
-                                            "page": page_num,
-                                            "xref": xref
-                                        })
-                                        continue
-                        
-                        doc.close()
-                        logger.info(f"Processed {pdf_file.filename}: found {file_images} images")
-                        
-                    except InvalidPDFError:
-                        raise
+                        shard = await task
                     except Exception as e:
-                        raise PDFProcessingError(str(e), pdf_file.filename) from e
-            
-            if total_images == 0:
-                raise NoImagesFoundError("No images found in any of the provided PDFs")
+                        failure = failure or e
+                        continue
+                    if failure is not None:
+                        continue
+                    # Merging shard by shard, in page order, keeps the first copy
+                    # of each image, so records can be handed out right away
+                    if index is not None:
+                        index.merge(shard)
+                    if progress is not None:
+                        progress.add_shard(shard, pages)
+                    result.images.extend(shard.images)
+                    for stage, seconds in shard.timings.items():
+                        result.timings[stage] = result.timings.get(stage, 0.0) + seconds
+                    if on_records is not None:
+                        on_records(shard.images)
+                if failure is not None:
+                    raise failure
+                EXTRACTION_SECONDS.observe(time.perf_counter() - started)
+        except BaseException:
+            # Clean up on error or cancellation, the worker may have died
+            # before doing so; shards still running clean up when they end
+            remove_output()
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            upload.cleanup()
+        
+        PdfService.write_manifest(result)
+        if storage is not None:
+            started = time.perf_counter()
+            try:
+                await run_in_threadpool(PdfService.publish_result, result)
+            except Exception as e:
+                # Still served by this node, other nodes answer 404 for it
+                log_error(e, {"context": "storage_publish", "pdf_id": pdf_id, "backend": storage.name})
+            result.timings["publish"] = time.perf_counter() - started
+        PdfService.record_metrics(result)
+        if cache_key is not None:
+            await run_in_threadpool(result_cache.put, cache_key, pdf_id)
+        return result
+
+    @staticmethod
+    def record_metrics(result: ExtractionResult) -> None:
+        """Record the stage timings, image count and bytes written of an extraction."""
+        for stage, seconds in result.timings.items():
+            EXTRACTION_STAGE_SECONDS.observe(seconds, stage)
+        stored = result.stored_images
+        IMAGES_PER_PDF.observe(len(stored))
+        OUTPUT_BYTES.inc("images", amount=sum(record["size"] for record in stored))
+
+    @staticmethod
+    def plan_shards(page_count: int) -> List[Optional[Tuple[int, int]]]:
+        """
+        Split a document into page ranges extracted by separate workers.
+        
+        Documents shorter than ``extraction_shard_min_pages`` are processed
+        as a single unit; longer ones are cut into ranges of
+        ``extraction_shard_pages`` pages, in page order.
+        
+        Returns:
+            list: Zero-based ``(start, stop)`` ranges, or ``[None]`` for the whole document
+        """
+        if page_count < settings.extraction_shard_min_pages:
+            return [None]
+        size = max(1, settings.extraction_shard_pages)
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    @staticmethod
+    def build_manifest(result: ExtractionResult) -> Dict[str, Any]:
+        """Build the JSON manifest describing one extracted PDF."""
+        return result.to_manifest()
+
+    @staticmethod
+    def write_manifest(result: ExtractionResult) -> None:
+        """Persist the manifest next to the extracted images."""
+        manifest_path = Path(settings.temp_dir).joinpath("images", result.pdf_id, MANIFEST_FILENAME)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(PdfService.build_manifest(result)))
+
+    @staticmethod
+    def read_manifest(pdf_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the stored manifest of a PDF and its ETag.
+        
+        Manifests are parsed once per version and shared between callers,
+        so the returned dict must not be modified. Costs one stat call when
+        the manifest is already cached.
+        
+        Returns:
+            tuple: (ETag, manifest), or None if the PDF has no manifest
+        """
+        manifest_path = Path(settings.temp_dir).joinpath("images", pdf_id, MANIFEST_FILENAME)
+        try:
+            stat = manifest_path.stat()
+            return _parse_manifest(str(manifest_path), stat.st_mtime_ns, stat.st_size)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def local_pdf_dir(pdf_id: str) -> Optional[Path]:
+        """Local image directory of a PDF, None if ``pdf_id`` does not name a direct child of it."""
+        images_dir = Path(settings.temp_dir).joinpath("images").resolve()
+        pdf_dir = images_dir.joinpath(pdf_id).resolve()
+        return pdf_dir if pdf_dir.parent == images_dir else None
+
+    @staticmethod
+    def publish_result(result: ExtractionResult) -> None:
+        """
+        Copy the images, thumbnails and manifest of an extraction to the shared storage.
+        
+        Images are stored under content-addressed keys and skipped when the
+        key already exists, so an image seen before (in any PDF, on any
+        node) is not uploaded again. The manifest is published last: a node
+        that finds it can rely on every image being there.
+        """
+        pdf_dir = Path(settings.temp_dir).joinpath("images", result.pdf_id)
+        files: Dict[str, Path] = {}
+        for record in result.stored_images:
+            files[image_key(record)] = pdf_dir / record["filename"]
+            if "thumbnail" in record:
+                files[image_key(record, thumbnail=True)] = pdf_dir / record["thumbnail"]
+        
+        def upload(item: Tuple[str, Path]) -> None:
+            key, path = item
+            if not storage.exists(key):
+                storage.put_file(key, path, media_type_for(path))
+        
+        with ThreadPoolExecutor(max_workers=max(1, settings.storage_upload_workers)) as pool:
+            # list() re-raises the first failed upload
+            list(pool.map(upload, files.items()))
+        storage.put_file(manifest_key(result.pdf_id), pdf_dir / MANIFEST_FILENAME, "application/json")
+
+    @staticmethod
+    async def fetch_manifest(pdf_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Like ``read_manifest``, restoring the manifest from the shared storage
+        when this node does not hold the PDF.
+        
+        Returns:
+            tuple: (ETag, manifest), or None if the PDF is unknown
+        """
+        stored = PdfService.read_manifest(pdf_id)
+        if stored is not None or storage is None:
+            return stored
+        pdf_dir = PdfService.local_pdf_dir(pdf_id)
+        if pdf_dir is None:
+            return None
+        if not await run_in_threadpool(storage.get_file, manifest_key(pdf_id), pdf_dir / MANIFEST_FILENAME):
+            return None
+        return PdfService.read_manifest(pdf_id)
+
+    @staticmethod
+    async def stored_image_key(pdf_id: str, filename: str) -> Optional[str]:
+        """
+        Storage key of an image or thumbnail of a PDF, from its manifest.
+        
+        Returns:
+            str: The key, or None if no storage is configured or the manifest
+            lists no such file
+        """
+        if storage is None:
+            return None
+        stored = await PdfService.fetch_manifest(pdf_id)
+        if stored is None:
+            return None
+        for record in stored[1]["images"]:
+            if record.get("filename") == filename:
+                return image_key(record)
+            if record.get("thumbnail") == filename:
+                return image_key(record, thumbnail=True)
+        return None
+
+    @staticmethod
+    async def restore_image(pdf_id: str, filename: str, key: str) -> Optional[Path]:
+        """
+        Download an image from the shared storage into the local PDF directory.
+        
+        Args:
+            pdf_id: ID of the PDF the image belongs to
+            filename: Name listed in the PDF's manifest
+            key: Storage key, see ``stored_image_key``
             
-            zip_buffer.seek(0)
-            return zip_buffer.getvalue(), total_images
+        Returns:
+            Path: The local copy, or None if the object is missing
+        """
+        pdf_dir = PdfService.local_pdf_dir(pdf_id)
+        if pdf_dir is None:
+            return None
+        path = pdf_dir / filename
+        if not await run_in_threadpool(storage.get_file, key, path):
+            return None
+        return path
+
+    @staticmethod
+    def load_result(pdf_id: str) -> Optional[ExtractionResult]:
+        """Rebuild an extraction result from its stored manifest, None if unavailable."""
+        manifest_path = Path(settings.temp_dir).joinpath("images", pdf_id, MANIFEST_FILENAME)
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        return ExtractionResult(
+            pdf_id=pdf_id,
+            images=manifest["images"],
+            filename=manifest.get("filename"),
+            page_count=manifest.get("page_count", 0)
+        )
+
+    @staticmethod
+    def archive_compression(
+        image_format: Optional[str],
+        mode: str = "auto",
+        level: Optional[int] = None
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Choose how an archive member is compressed.
+        
+        Args:
+            image_format: Format/extension of the member, None for metadata
+            mode: "auto" (by format), "store" or "deflate"
+            level: Deflate level override, defaults to the configured level
             
-        except (NoImagesFoundError, InvalidPDFError, PDFProcessingError):
+        Returns:
+            tuple: (zipfile compression constant, compression level)
+        """
+        if mode == "store":
+            return zipfile.ZIP_STORED, None
+        if mode == "auto" and image_format and image_format.lower() in settings.zip_stored_formats:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, settings.zip_compression_level if level is None else level
+
+    @staticmethod
+    def image_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Public description of a stored image: its URL plus manifest metadata."""
+        pdf_id, filename = record["id"].split("/", 1)
+        base_url = f"{settings.api_str}/images/{pdf_id}"
+        return {
+            "pdf_id": pdf_id,
+            "id": filename,
+            "url": f"{base_url}/{filename}",
+            "thumbnail_url": f"{base_url}/{record['thumbnail']}" if "thumbnail" in record else None,
+            **{key: record.get(key) for key in IMAGE_METADATA_KEYS},
+        }
+
+    @staticmethod
+    async def extract_all(extractions: Iterable[Awaitable[ExtractionResult]]) -> List[ExtractionResult]:
+        """
+        Run extractions concurrently and return their results in order.
+        
+        If one fails, the others are cancelled and awaited before the error
+        is raised, so a failed request does not keep admission slots,
+        memory reservations or image directories busy.
+        
+        Raises:
+            BaseAppException: The first failure
+        """
+        tasks = [asyncio.ensure_future(extraction) for extraction in extractions]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             raise
-        except Exception as e:
-            log_error(e, {"context": "zip_creation"})
-            raise PDFProcessingError("Failed to create ZIP file") from e
+    
+    @staticmethod
+    def start_extractions(
+        uploads: List[SpooledUpload],
+        options: ExtractionOptions,
+        admitted: bool = False
+    ) -> Tuple[List["asyncio.Future[ExtractionResult]"], "asyncio.Queue[Tuple[str, int, Any]]"]:
+        """
+        Extract several uploads concurrently, reporting their progress on a queue.
+        
+        The queue receives ``("records", number, records)`` for every merged
+        page shard and ``("done", number, task)`` when an upload finishes,
+        with ``number`` the 1-based position of the upload.
+        
+        Returns:
+            tuple: (extraction tasks in upload order, event queue)
+        """
+        queue: "asyncio.Queue[Tuple[str, int, Any]]" = asyncio.Queue()
+        
+        def start(number: int, upload: SpooledUpload) -> "asyncio.Future[ExtractionResult]":
+            task = asyncio.ensure_future(PdfService.extract_upload(
+                upload, options, on_records=lambda records: queue.put_nowait(("records", number, records)),
+                admitted=admitted
+            ))
+            task.add_done_callback(lambda done: queue.put_nowait(("done", number, done)))
+            return task
+        
+        return [start(number, upload) for number, upload in enumerate(uploads, 1)], queue
+    
+    @staticmethod
+    def cancel_extractions(tasks: List["asyncio.Future[ExtractionResult]"]) -> None:
+        """Cancel the unfinished tasks and mark the failures of the others as retrieved."""
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+    
+    @staticmethod
+    async def stream_records(
+        uploads: List[SpooledUpload],
+        options: ExtractionOptions,
+        admitted: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream extraction results as newline-delimited JSON while the PDFs are processed.
+        
+        Emits one ``{"type": "image", ...}`` line per stored image as soon as
+        its page shard is merged, then a ``{"type": "summary", ...}`` line.
+        Images already emitted for another PDF of the request are skipped
+        when deduplicating. A failure is reported as a ``{"type": "error"}``
+        line, since the response status has already been sent.
+        
+        Args:
+            uploads: Spooled uploads, in upload order
+            options: Extraction options
+            admitted: The caller already holds an admission for all uploads
+            
+        Yields:
+            bytes: NDJSON lines
+        """
+        tasks, queue = PdfService.start_extractions(uploads, options, admitted)
+        index = DuplicateIndex()
+        image_count = 0
+        duplicates_skipped = 0
+        
+        try:
+            finished = 0
+            while finished < len(tasks):
+                kind, number, payload = await queue.get()
+                if kind == "done":
+                    finished += 1
+                    if not payload.cancelled() and payload.exception() is not None:
+                        error = payload.exception()
+                        if not isinstance(error, BaseAppException):
+                            log_error(error, {"context": "ndjson_stream"})
+                        message = error.message if isinstance(error, BaseAppException) else str(error)
+                        yield (json.dumps({"type": "error", "pdf": number, "message": message}) + "\n").encode()
+                        return
+                    continue
+                
+                lines = []
+                for record in payload:
+                    if "duplicate_of" in record:
+                        duplicates_skipped += 1
+                        continue
+                    if options.dedupe and index.claim(record) is not None:
+                        duplicates_skipped += 1
+                        continue
+                    image_count += 1
+                    lines.append(json.dumps({"type": "image", "pdf": number, **PdfService.image_record(record)}))
+                if lines:
+                    yield ("\n".join(lines) + "\n").encode()
+            
+            pdfs = [
+                {
+                    "pdf": number,
+                    "pdf_id": task.result().pdf_id,
+                    "filename": task.result().filename,
+                    "images_url": f"{settings.api_str}/pdf/{task.result().pdf_id}/images",
+                }
+                for number, task in enumerate(tasks, 1)
+            ]
+            yield (json.dumps({
+                "type": "summary",
+                "message": f"Successfully extracted images from {len(tasks)} files",
+                "image_count": image_count,
+                "duplicates_skipped": duplicates_skipped,
+                "pdfs": pdfs,
+            }) + "\n").encode()
+        finally:
+            PdfService.cancel_extractions(tasks)
 
     @staticmethod
-    async def combine_zip_files(zip_data_list: list[bytes]) -> bytes:
+    async def stream_archive(
+        uploads: List[SpooledUpload],
+        options: ExtractionOptions,
+        admitted: bool = False,
+        compression: str = "auto",
+        compression_level: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
         """
-        Combine multiple ZIP files into a single ZIP file.
+        Stream a ZIP of the extracted images while the PDFs are still being processed.
+        
+        The images of each page shard are written to the ``pdf_N/`` folder of
+        their PDF as soon as the shard is merged, reading them back from disk
+        in chunks so memory stays bounded. Images already written for another
+        PDF of the request are skipped when deduplicating. A combined
+        ``manifest.json`` closes the archive once every PDF is done.
         
         Args:
-            zip_data_list: List of ZIP files as bytes
+            uploads: Spooled uploads, in upload order
+            options: Extraction options
+            admitted: The caller already holds an admission for all uploads
+            compression: "auto" (store compressed formats, deflate the rest),
+                "store" or "deflate"
+            compression_level: Deflate level override
             
-        Returns:
-            bytes: Combined ZIP file
+        Yields:
+            bytes: Consecutive chunks of the ZIP archive
+            
+        Raises:
+            BaseAppException: If an extraction fails; past the first chunk
+                the client sees a truncated archive
         """
-        output_buffer = io.BytesIO()
+        tasks, queue = PdfService.start_extractions(uploads, options, admitted)
+        archive = ZipStream(settings.zip_stream_chunk_size)
+        index = DuplicateIndex()
         
-        with zipfile.ZipFile(output_buffer, 'w') as output_zip:
-            for index, zip_data in enumerate(zip_data_list):
-                with zipfile.ZipFile(io.BytesIO(zip_data)) as input_zip:
-                    for filename in input_zip.namelist():
-                        # Add prefix to avoid filename conflicts
-                        new_filename = f"pdf_{index + 1}/{filename}"
-                        output_zip.writestr(new_filename, input_zip.read(filename))
+        def write_entries(records: List[Dict[str, Any]], folder: str) -> Iterator[bytes]:
+            for record in records:
+                pdf_id, filename = record["id"].split("/", 1)
+                pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
+                compress_type, level = PdfService.archive_compression(
+                    record["format"], compression, compression_level
+                )
+                yield from archive.write_file(f"{folder}/{filename}", pdf_dir / filename, compress_type, level)
+                if "thumbnail" in record:
+                    compress_type, level = PdfService.archive_compression(
+                        settings.thumbnail_format, compression, compression_level
+                    )
+                    yield from archive.write_file(
+                        f"{folder}/{record['thumbnail']}", pdf_dir / record["thumbnail"], compress_type, level
+                    )
         
-        output_buffer.seek(0)
-        return output_buffer.getvalue() 
\ No newline at end of file
+        def finish() -> Iterator[bytes]:
+            manifests = []
+            for number, task in enumerate(tasks, 1):
+                result = task.result()
+                if options.dedupe:
+                    # Points the copies skipped above at the ones written
+                    index.merge(result)
+                manifests.append({"folder": f"pdf_{number}", **PdfService.build_manifest(result)})
+            manifest = json.dumps({"pdfs": manifests}, indent=2).encode()
+            compress_type, level = PdfService.archive_compression(None, compression, compression_level)
+            yield from archive.write_bytes(MANIFEST_FILENAME, manifest, compress_type, level)
+            yield from archive.close()
+        
+        try:
+            finished = 0
+            while finished < len(tasks):
+                kind, number, payload = await queue.get()
+                if kind == "done":
+                    finished += 1
+                    if not payload.cancelled() and payload.exception() is not None:
+                        raise payload.exception()
+                    continue
+                
+                records = [
+                    record for record in payload
+                    if "duplicate_of" not in record and not (options.dedupe and index.claim(record) is not None)
+                ]
+                entries = observe_iteration(
+                    write_entries(records, f"pdf_{number}"), EXTRACTION_STAGE_SECONDS, "zip_write"
+                )
+                async for chunk in iterate_in_threadpool(entries):
+                    OUTPUT_BYTES.inc("archive", amount=len(chunk))
+                    yield chunk
+            
+            async for chunk in iterate_in_threadpool(finish()):
+                OUTPUT_BYTES.inc("archive", amount=len(chunk))
+                yield chunk
+        except Exception as e:
+            if not isinstance(e, BaseAppException):
+                log_error(e, {"context": "zip_stream"})
+            raise
+        finally:
+            PdfService.cancel_extractions(tasks)
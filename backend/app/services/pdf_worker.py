@@ -0,0 +1,516 @@
+"""
+Synchronous extraction routines executed inside the worker process pool.
+
+This module must stay importable without the FastAPI stack so that spawned
+workers start quickly and hold no server state.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+import fitz
+from PIL import Image
+
+if TYPE_CHECKING:  # pragma: no cover - the settings module is not imported by workers
+    from ..core.config import Settings
+
+
+# Per-PDF manifest stored alongside the extracted images
+MANIFEST_FILENAME = "manifest.json"
+
+# Subdirectory of a PDF's image directory holding eagerly generated previews
+THUMBNAILS_DIRNAME = "thumbs"
+
+# Format PyMuPDF extracts an image stream as, by its PDF filter. Streams with
+# any other compression are extracted as PNG.
+SOURCE_FORMATS = {
+    "DCTDecode": "jpeg",
+    "JPXDecode": "jpx",
+    "JBIG2Decode": "jb2",
+}
+
+# Target formats accepted for explicit conversion, mapped to PIL format names
+CONVERSION_FORMATS = {
+    "png": "PNG",
+    "jpeg": "JPEG",
+    "jpg": "JPEG",
+    "webp": "WEBP",
+    "tiff": "TIFF",
+}
+
+# File extensions of PIL formats whose lowercased name is not one
+PIL_EXTENSIONS = {
+    "JPEG2000": "jp2",
+    "MPO": "jpg",
+}
+
+
+@dataclass(frozen=True)
+class ExtractionOptions:
+    """Per-request extraction options, shipped to the worker processes."""
+    # Write the native image stream bytes untouched instead of re-encoding
+    passthrough: bool = True
+    # Convert every image to this format (a CONVERSION_FORMATS key)
+    image_format: Optional[str] = None
+    # Store repeated images (same xref or identical stream) only once
+    dedupe: bool = True
+    # Also write a preview at most this wide to thumbs/, none when None
+    thumbnail_width: Optional[int] = None
+    thumbnail_format: str = "webp"
+    # Filters, checked against the image metadata before anything is decoded.
+    # Page ranges are 1-based and inclusive, an open end is None.
+    pages: Optional[Tuple[Tuple[int, Optional[int]], ...]] = None
+    min_width: Optional[int] = None
+    max_width: Optional[int] = None
+    min_height: Optional[int] = None
+    max_height: Optional[int] = None
+    # Minimum compressed stream size in bytes, from the stream's /Length
+    min_bytes: Optional[int] = None
+    # Allowed source formats (SOURCE_FORMATS values)
+    source_formats: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: "Settings",
+        image_format: Optional[str] = None,
+        dedupe: bool = True,
+        thumbnails: Optional[bool] = None,
+        **filters: Any
+    ) -> "ExtractionOptions":
+        """
+        Build extraction options from the configured defaults.
+
+        Args:
+            settings: Application settings
+            image_format: Target format, None to keep native streams
+            dedupe: Store repeated images once
+            thumbnails: Write previews, defaults to the server setting
+            **filters: Image filters (pages, min_width, ..., source_formats)
+        """
+        if thumbnails is None:
+            thumbnails = settings.eager_thumbnails
+        return cls(
+            passthrough=settings.extraction_passthrough,
+            image_format=image_format,
+            dedupe=dedupe,
+            thumbnail_width=settings.thumbnail_width if thumbnails else None,
+            thumbnail_format=settings.thumbnail_format,
+            **filters
+        )
+
+    def selects_page(self, page_number: int) -> bool:
+        """Whether the 1-based ``page_number`` passes the page filter."""
+        if self.pages is None:
+            return True
+        return any(first <= page_number and (last is None or page_number <= last) for first, last in self.pages)
+
+    def selects_pages(self, start: int, stop: int) -> bool:
+        """Whether any page of the zero-based ``[start, stop)`` range passes the page filter."""
+        if self.pages is None:
+            return True
+        return any(first <= stop and (last is None or start + 1 <= last) for first, last in self.pages)
+
+    def selects_image(self, pdf_document: fitz.Document, img: tuple) -> bool:
+        """Whether an image passes the size and format filters, from its ``get_images`` entry."""
+        xref, _, width, height = img[:4]
+        if self.min_width is not None and width < self.min_width:
+            return False
+        if self.max_width is not None and width > self.max_width:
+            return False
+        if self.min_height is not None and height < self.min_height:
+            return False
+        if self.max_height is not None and height > self.max_height:
+            return False
+        if self.source_formats is not None and source_format(img[8]) not in self.source_formats:
+            return False
+        if self.min_bytes is not None and (stream_length(pdf_document, xref) or 0) < self.min_bytes:
+            return False
+        return True
+
+
+def parse_page_ranges(spec: str) -> Tuple[Tuple[int, Optional[int]], ...]:
+    """
+    Parse a page selection such as "1-3,7,10-" into 1-based inclusive ranges.
+
+    Raises:
+        ValueError: If the selection is malformed
+    """
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        start = int(first) if first.strip() else 1
+        end = (int(last) if last.strip() else None) if dash else start
+        if start < 1 or (end is not None and end < start):
+            raise ValueError(f"Invalid page range '{part}'")
+        ranges.append((start, end))
+    if not ranges:
+        raise ValueError("Empty page selection")
+    return tuple(ranges)
+
+
+def create_process_pool(max_workers: int, max_tasks_per_child: Optional[int] = None) -> ProcessPoolExecutor:
+    """Create a process pool suitable for running PyMuPDF."""
+    kwargs = {
+        "max_workers": max(1, max_workers),
+        # MuPDF is not fork-safe once the server has started threads
+        "mp_context": multiprocessing.get_context("spawn"),
+    }
+    # max_tasks_per_child is only available from Python 3.11
+    if max_tasks_per_child and sys.version_info >= (3, 11):
+        kwargs["max_tasks_per_child"] = max_tasks_per_child
+    return ProcessPoolExecutor(**kwargs)
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of extracting one PDF."""
+    pdf_id: str
+    # One record per image occurrence; duplicates carry ``duplicate_of``
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    filename: Optional[str] = None
+    page_count: int = 0
+    # Seconds spent in each extraction stage, see StageTimer
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def stored_images(self) -> List[Dict[str, Any]]:
+        """Records of the images actually written to disk."""
+        return [record for record in self.images if "duplicate_of" not in record]
+
+    @property
+    def duplicate_count(self) -> int:
+        return len(self.images) - len(self.stored_images)
+
+    def to_manifest(self) -> Dict[str, Any]:
+        """JSON manifest describing the extracted PDF."""
+        return {
+            "pdf_id": self.pdf_id,
+            "filename": self.filename,
+            "page_count": self.page_count,
+            "image_count": len(self.stored_images),
+            "duplicates_skipped": self.duplicate_count,
+            "images": self.images,
+        }
+
+
+class StageTimer:
+    """
+    Accumulates the time spent in consecutive extraction stages.
+
+    ``mark()`` starts a measurement and each ``lap(stage)`` adds the time
+    since the previous mark or lap to ``stage``, so a sequence of stages
+    costs one clock read per stage.
+    """
+
+    def __init__(self, totals: Dict[str, float]):
+        self.totals = totals
+        self._last = time.perf_counter()
+
+    def mark(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.totals[stage] = self.totals.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+def encode_image(
+    base_image: Dict[str, Any], options: ExtractionOptions
+) -> Tuple[bytes, str, Optional[Image.Image]]:
+    """
+    Produce the bytes stored for an extracted image.
+
+    Native stream bytes are returned as-is unless a conversion is requested
+    (or passthrough is disabled), in which case PIL encodes the image once.
+
+    Returns:
+        tuple: (encoded bytes, file extension, decoded image or None if
+        the image was not decoded)
+    """
+    image_bytes = base_image["image"]
+    if options.image_format is None and options.passthrough:
+        return image_bytes, base_image["ext"], None
+
+    image = Image.open(io.BytesIO(image_bytes))
+    if options.image_format is not None:
+        pil_format = CONVERSION_FORMATS[options.image_format]
+    else:
+        pil_format = image.format or "PNG"
+
+    buffer = io.BytesIO()
+    convert_for_format(image, pil_format).save(buffer, format=pil_format)
+    return buffer.getvalue(), PIL_EXTENSIONS.get(pil_format, pil_format.lower()), image
+
+
+def convert_for_format(image: Image.Image, pil_format: str) -> Image.Image:
+    """Convert ``image`` to a mode the target PIL format can encode."""
+    if pil_format == "JPEG" and image.mode not in ("RGB", "L", "CMYK"):
+        return image.convert("RGB")
+    if pil_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    return image
+
+
+def render_preview(image: Image.Image, width: Optional[int]) -> Image.Image:
+    """
+    Downscale ``image`` to at most ``width`` pixels wide, keeping its aspect ratio.
+
+    JPEG sources are decoded at a reduced DCT scale through ``draft()``, and
+    large reductions go through ``reduce()`` before the final resampling, so
+    the full-size bitmap is never decoded or filtered at full cost.
+    """
+    if width is None or image.width <= width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    if image.format == "JPEG":
+        image.draft(image.mode, (width, height))
+    elif image.mode in ("1", "P"):
+        # Resampling these modes would fall back to nearest neighbour
+        image = image.convert("RGBA" if image.mode == "P" else "L")
+    image.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image
+
+
+def write_thumbnail(
+    image: Union[Image.Image, bytes], output_dir: Path, image_filename: str, options: ExtractionOptions
+) -> Optional[Tuple[str, str]]:
+    """
+    Write the preview of an extracted image to ``thumbs/``.
+
+    Takes the already decoded image when conversion produced one, otherwise
+    decodes the stream bytes (at reduced scale for JPEG).
+
+    Returns:
+        tuple: (path of the preview relative to ``output_dir``, content hash
+        of the preview), or None if the image cannot be decoded by PIL
+        (e.g. JBIG2)
+    """
+    pil_format = CONVERSION_FORMATS[options.thumbnail_format]
+    thumbnail_name = f"{THUMBNAILS_DIRNAME}/{Path(image_filename).stem}.{options.thumbnail_format}"
+    try:
+        if isinstance(image, bytes):
+            image = Image.open(io.BytesIO(image))
+        preview = convert_for_format(render_preview(image, options.thumbnail_width), pil_format)
+        buffer = io.BytesIO()
+        preview.save(buffer, format=pil_format)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    data = buffer.getvalue()
+    output_dir.joinpath(THUMBNAILS_DIRNAME).mkdir(exist_ok=True)
+    output_dir.joinpath(thumbnail_name).write_bytes(data)
+    return thumbnail_name, content_hash(data)
+
+
+def content_hash(data: bytes) -> str:
+    """Return the content hash used to identify identical image streams."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class InvalidDocumentError(ValueError):
+    """The source is not a PDF MuPDF can open. Plain exception, so it pickles across the pool."""
+
+
+def open_document(source: Union[bytes, str]) -> fitz.Document:
+    """
+    Open a PDF from a file path or from raw bytes.
+
+    Raises:
+        InvalidDocumentError: If the source is not a readable PDF
+    """
+    try:
+        if isinstance(source, str):
+            return fitz.open(source, filetype="pdf")
+        return fitz.open(stream=source, filetype="pdf")
+    except fitz.FileDataError as e:
+        raise InvalidDocumentError(f"Invalid or corrupted PDF file: {e}") from None
+
+
+def inspect_document(source: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    List the images of a PDF from its object metadata, without decoding any stream.
+
+    Returns:
+        dict: ``page_count`` and one record per image occurrence with its page,
+        position, xref, pixel size, bits per component, colorspace, filter,
+        soft-mask xref and compressed stream length
+    """
+    images = []
+    with open_document(source) as pdf_document:
+        lengths: Dict[int, Optional[int]] = {}
+        for page in pdf_document:
+            for img_index, img in enumerate(page.get_images(full=True)):
+                xref, smask, width, height, bpc, colorspace, _, _, image_filter, _ = img
+                if xref not in lengths:
+                    lengths[xref] = stream_length(pdf_document, xref)
+                images.append({
+                    "page": page.number + 1, "index": img_index + 1, "xref": xref,
+                    "width": width, "height": height, "bpc": bpc,
+                    "colorspace": colorspace or None, "filter": image_filter or None,
+                    "smask": smask or None, "length": lengths[xref],
+                })
+        return {"page_count": pdf_document.page_count, "images": images}
+
+
+def source_format(image_filter: str) -> str:
+    """Format an image stream with the given PDF filter is extracted as."""
+    return SOURCE_FORMATS.get(image_filter, "png")
+
+
+def stream_length(pdf_document: fitz.Document, xref: int) -> Optional[int]:
+    """Compressed size of an image stream, read from its /Length entry."""
+    kind, value = pdf_document.xref_get_key(xref, "Length")
+    if kind == "int":
+        return int(value)
+    if kind == "xref":
+        # Indirect length object, e.g. "12 0 R"
+        value = pdf_document.xref_object(int(value.split()[0])).strip()
+        return int(value) if value.isdigit() else None
+    return None
+
+
+def extract_document(
+    source: Union[bytes, str],
+    pdf_dir: str,
+    pdf_id: str,
+    options: ExtractionOptions = ExtractionOptions(),
+    page_range: Optional[Tuple[int, int]] = None,
+    max_pages: Optional[int] = None
+) -> ExtractionResult:
+    """
+    Extract the images of a PDF, or of a range of its pages, into ``pdf_dir``.
+
+    Images rejected by the filters of ``options`` are skipped using the
+    page's image metadata, before their streams are read, and get no record.
+
+    With ``options.dedupe`` an image referenced again on a later page (same
+    xref or identical stream bytes) is stored once; later occurrences are
+    recorded with a ``duplicate_of`` pointer to the stored image ID. Each
+    call only sees its own page range, so duplicates spanning several
+    ranges are resolved by the caller when the shards are merged.
+
+    The time spent opening the document, listing page images, reading
+    image streams, hashing, encoding and writing files is accumulated in
+    ``result.timings``.
+
+    Args:
+        source: Path of the PDF file, or its raw bytes
+        pdf_dir: Directory the extracted images are written to
+        pdf_id: Identifier used to build the image IDs
+        options: Extraction options
+        page_range: Zero-based ``(start, stop)`` pages to process, all when None
+        max_pages: Extract nothing from documents with more pages and only
+            set ``result.page_count``, so the caller can split them into page
+            ranges without opening shorter documents twice
+
+    Returns:
+        ExtractionResult: One record per image occurrence
+    """
+    output_dir = Path(pdf_dir)
+    result = ExtractionResult(pdf_id=pdf_id)
+    seen_xrefs: Dict[int, str] = {}
+    seen_hashes: Dict[str, str] = {}
+    timer = StageTimer(result.timings)
+
+    with open_document(source) as pdf_document:
+        timer.lap("open")
+        result.page_count = pdf_document.page_count
+        if max_pages is not None and result.page_count > max_pages:
+            return result
+        # Only once the document opened, so a broken PDF leaves no directory
+        output_dir.mkdir(parents=True, exist_ok=True)
+        start, stop = page_range or (0, pdf_document.page_count)
+
+        for page_num in range(start, min(stop, pdf_document.page_count)):
+            if not options.selects_page(page_num + 1):
+                continue
+            timer.mark()
+            page = pdf_document[page_num]
+            image_list = page.get_images(full=True)
+            timer.lap("get_images")
+
+            for img_index, img in enumerate(image_list):
+                xref = img[0]
+                if not options.selects_image(pdf_document, img):
+                    # Filtered out from metadata alone, never decoded
+                    continue
+                record: Dict[str, Any] = {"page": page_num + 1, "index": img_index + 1, "xref": xref}
+                result.images.append(record)
+
+                if options.dedupe and xref in seen_xrefs:
+                    record["duplicate_of"] = seen_xrefs[xref]
+                    continue
+
+                timer.mark()
+                base_image = pdf_document.extract_image(xref)
+                timer.lap("extract_image")
+                digest = content_hash(base_image["image"])
+                timer.lap("hash")
+                if options.dedupe and digest in seen_hashes:
+                    record["duplicate_of"] = seen_xrefs[xref] = seen_hashes[digest]
+                    continue
+
+                image_bytes, ext, decoded = encode_image(base_image, options)
+                timer.lap("encode")
+                image_filename = f"page_{page_num + 1}_image_{img_index + 1}.{ext}"
+                output_dir.joinpath(image_filename).write_bytes(image_bytes)
+                timer.lap("write")
+
+                image_id = f"{pdf_id}/{image_filename}"
+                seen_xrefs[xref] = seen_hashes[digest] = image_id
+                record.update(id=image_id, filename=image_filename, format=ext,
+                              width=base_image["width"], height=base_image["height"],
+                              bpc=img[4], colorspace=img[5] or None, filter=img[8] or None,
+                              size=len(image_bytes), hash=digest)
+                if image_bytes is not base_image["image"]:
+                    # Re-encoded: the stored bytes depend on the options, not only on the stream
+                    record["stored_hash"] = content_hash(image_bytes)
+
+                if options.thumbnail_width:
+                    thumbnail = write_thumbnail(
+                        decoded if decoded is not None else image_bytes, output_dir, image_filename, options
+                    )
+                    if thumbnail is not None:
+                        record["thumbnail"], record["thumbnail_hash"] = thumbnail
+                    timer.lap("thumbnail")
+
+    return result
+
+
+def extract_to_directory(path: str, out_dir: str, pdf_id: str, options: ExtractionOptions) -> Dict[str, Any]:
+    """
+    Extract a PDF file into ``out_dir`` and write its ``manifest.json`` there.
+
+    Used for offline bulk extraction: any previous content of ``out_dir``
+    (e.g. from an interrupted run) is replaced.
+
+    Returns:
+        dict: Page, image and byte counts of the extraction, its duration
+        and the time spent per stage
+    """
+    started = time.perf_counter()
+    shutil.rmtree(out_dir, ignore_errors=True)
+    result = extract_document(path, out_dir, pdf_id, options)
+    result.filename = Path(path).name
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    Path(out_dir, MANIFEST_FILENAME).write_text(json.dumps(result.to_manifest()))
+    return {
+        "page_count": result.page_count,
+        "image_count": len(result.stored_images),
+        "duplicates_skipped": result.duplicate_count,
+        "bytes_written": sum(record["size"] for record in result.stored_images),
+        "seconds": time.perf_counter() - started,
+        "timings": result.timings,
+    }
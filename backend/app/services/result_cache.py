@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from ..core.config import settings
+from ..core.logger import log_error
+from .pdf_worker import ExtractionOptions
+
+
+class ResultCache:
+    """
+    Content-addressed cache of extraction results.
+
+    Entries map a key derived from the PDF content hash and the extraction
+    options to the ``images/<pdf_id>`` directory holding the result. Each
+    entry is a small JSON file whose mtime records the last access, which
+    drives LRU eviction by total size and by age.
+
+    Evicting an entry only forgets it: the image directory may still be
+    listed or served to clients that received its URLs, and its lifetime is
+    left to the retention sweeper, which enforces the disk quota.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, max_age: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(pdf_digest: str, options: ExtractionOptions) -> str:
+        """Build the cache key for a PDF extracted with the given options."""
+        material = json.dumps({"pdf": pdf_digest, "options": asdict(options)}, sort_keys=True)
+        return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _pdf_dir(pdf_id: str) -> Path:
+        return Path(settings.temp_dir).joinpath("images", pdf_id)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result.
+
+        Returns:
+            str: ID of the PDF directory holding the result, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry_path.stat().st_mtime > self.max_age or not self._pdf_dir(entry["pdf_id"]).exists():
+            # Expired, or the images were removed behind the cache's back
+            self._drop(entry_path)
+            return None
+
+        # Record the access for LRU eviction here and in the retention sweeper
+        try:
+            os.utime(entry_path)
+            os.utime(self._pdf_dir(entry["pdf_id"]))
+        except OSError:
+            return None
+        return entry["pdf_id"]
+
+    def put(self, key: str, pdf_id: str) -> None:
+        """Register the result stored in ``images/<pdf_id>`` and evict if over budget."""
+        pdf_dir = self._pdf_dir(pdf_id)
+        size = sum(path.stat().st_size for path in pdf_dir.rglob("*") if path.is_file())
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entry_path(key).write_text(json.dumps({"pdf_id": pdf_id, "size": size}))
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop dangling and expired entries, then least recently used ones until under ``max_bytes``.
+
+        Returns:
+            int: Size of the results no longer indexed by the cache
+        """
+        with self._lock:
+            entries = []
+            for entry_path in self.cache_dir.glob("*.json"):
+                try:
+                    entry = json.loads(entry_path.read_text())
+                    entries.append((entry_path.stat().st_mtime, entry_path, entry))
+                except (OSError, ValueError):
+                    continue
+            entries.sort(key=lambda item: item[0])
+
+            now = time.time()
+            total = sum(entry["size"] for _, _, entry in entries)
+            reclaimed = 0
+            for accessed, entry_path, entry in entries:
+                if not self._pdf_dir(entry["pdf_id"]).exists():
+                    # Images already removed by the retention sweeper
+                    entry_path.unlink(missing_ok=True)
+                    total -= entry["size"]
+                    continue
+                if total <= self.max_bytes and now - accessed <= self.max_age:
+                    continue
+                self._drop(entry_path)
+                total -= entry["size"]
+                reclaimed += entry["size"]
+            return reclaimed
+
+    def _drop(self, entry_path: Path) -> None:
+        try:
+            entry_path.unlink(missing_ok=True)
+        except OSError as e:
+            log_error(e, {"context": "result_cache_evict", "entry": entry_path.name})
+
+
+result_cache = ResultCache(
+    cache_dir=Path(settings.temp_dir).joinpath("cache"),
+    max_bytes=settings.result_cache_max_bytes,
+    max_age=settings.result_cache_max_age,
+)
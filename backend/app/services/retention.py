@@ -0,0 +1,152 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logger import log_error, log_info
+from .result_cache import result_cache
+
+
+def _tree_size(path: Path) -> int:
+    """Total size in bytes of the files below ``path``."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class RetentionSweeper:
+    """
+    Background thread that bounds the disk used by extracted images.
+
+    Every ``interval`` seconds it removes ``images/<pdf_id>`` directories
+    not used for ``ttl`` seconds, then evicts the least recently used ones
+    until the total is under ``quota_bytes``. A directory's mtime is its
+    last use: it is set when extraction finishes and refreshed on cache hits.
+    """
+
+    def __init__(self, images_dir: Path, uploads_dir: Path, ttl: int, quota_bytes: int, interval: int):
+        self.images_dir = images_dir
+        self.uploads_dir = uploads_dir
+        self.ttl = ttl
+        self.quota_bytes = quota_bytes
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.sweeps = 0
+        self.dirs_removed = 0
+        self.bytes_reclaimed = 0
+        self.last_sweep_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the sweeper thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sweeper thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                log_error(e, {"context": "retention_sweep"})
+            self._stop.wait(self.interval)
+
+    def _remove(self, path: Path, size: int) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+        self.dirs_removed += 1
+        self.bytes_reclaimed += size
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Run one retention pass.
+
+        Returns:
+            dict: Directories removed and bytes reclaimed by this pass
+        """
+        with self._lock:
+            removed_before, reclaimed_before = self.dirs_removed, self.bytes_reclaimed
+            now = time.time()
+            cutoff = now - self.ttl
+
+            # Spool files left behind by interrupted uploads
+            if self.uploads_dir.exists():
+                for spool_file in self.uploads_dir.iterdir():
+                    try:
+                        stat = spool_file.stat()
+                        if stat.st_mtime < cutoff:
+                            spool_file.unlink()
+                            self.bytes_reclaimed += stat.st_size
+                    except OSError:
+                        continue
+
+            live: List[Tuple[float, int, Path]] = []
+            if self.images_dir.exists():
+                for pdf_dir in self.images_dir.iterdir():
+                    try:
+                        last_used = pdf_dir.stat().st_mtime
+                    except OSError:
+                        continue
+                    size = _tree_size(pdf_dir)
+                    if last_used < cutoff:
+                        self._remove(pdf_dir, size)
+                    else:
+                        live.append((last_used, size, pdf_dir))
+
+            # Enforce the quota, oldest first
+            total = sum(size for _, size, _ in live)
+            for _, size, pdf_dir in sorted(live, key=lambda item: item[0]):
+                if total <= self.quota_bytes:
+                    break
+                self._remove(pdf_dir, size)
+                total -= size
+
+            # Drop cache entries whose images are gone
+            result_cache.evict()
+
+            self.sweeps += 1
+            self.last_sweep_at = now
+            stats = {
+                "dirs_removed": self.dirs_removed - removed_before,
+                "bytes_reclaimed": self.bytes_reclaimed - reclaimed_before,
+            }
+            if stats["dirs_removed"]:
+                log_info("Retention sweep removed expired images", {**stats, "bytes_retained": total})
+            return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Lifetime counters of the sweeper."""
+        return {
+            "sweeps": self.sweeps,
+            "dirs_removed": self.dirs_removed,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "last_sweep_at": self.last_sweep_at,
+        }
+
+
+retention_sweeper = RetentionSweeper(
+    images_dir=Path(settings.temp_dir).joinpath("images"),
+    uploads_dir=Path(settings.temp_dir).joinpath("uploads"),
+    ttl=settings.image_retention_seconds,
+    quota_bytes=settings.image_quota_bytes,
+    interval=settings.cleanup_interval_seconds,
+)
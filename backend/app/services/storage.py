@@ -0,0 +1,252 @@
+"""
+Shared storage for extracted images, so any node can serve any PDF.
+
+Extraction always writes to the local ``images/<pdf_id>/`` directory first.
+When a storage backend is configured, the finished images, thumbnails and
+manifest are then published to it. A node asked for a PDF it does not hold
+restores the manifest from storage, and either redirects image requests to
+the backend (presigned URLs, so the bytes skip Python) or downloads the file
+into its local directory and serves it from there.
+
+Images and thumbnails are stored under content-addressed keys derived from
+the hash of their stored bytes, so an image shared by many PDFs, uploads or
+nodes is kept once, while outputs of different conversion or thumbnail
+settings never share a key.
+"""
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+
+def image_key(record: Dict[str, Any], thumbnail: bool = False) -> str:
+    """
+    Content-addressed key of a stored image, or of its thumbnail.
+
+    Native streams are keyed by their stream hash; re-encoded images and
+    thumbnails by the hash of the bytes written for them.
+    """
+    if thumbnail:
+        digest = record["thumbnail_hash"]
+        return f"thumbs/{digest[:2]}/{digest}{Path(record['thumbnail']).suffix}"
+    digest = record.get("stored_hash", record["hash"])
+    return f"images/{digest[:2]}/{digest}.{record['format']}"
+
+
+def manifest_key(pdf_id: str) -> str:
+    """Key of the manifest of an extracted PDF."""
+    return f"manifests/{pdf_id}.json"
+
+
+def _partial_path(path: Path) -> Path:
+    # Written under a temporary name so readers never see a partial file
+    return path.with_name(f".{path.name}.{threading.get_ident()}")
+
+
+class StorageBackend(ABC):
+    """Interface of a key/value blob store. Keys are relative POSIX paths."""
+    name = "none"
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether an object is stored under ``key``."""
+
+    @abstractmethod
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        """Store a local file under ``key``, streaming it from disk."""
+
+    @abstractmethod
+    def get_file(self, key: str, path: Path) -> bool:
+        """
+        Stream ``key`` into the local file ``path``.
+
+        The parent directory of ``path`` is only created once the key is
+        known to exist.
+
+        Returns:
+            bool: False if the key does not exist
+        """
+
+    def url(self, key: str, content_type: str) -> Optional[str]:
+        """URL clients can fetch ``key`` from directly, None if the backend has none."""
+        return None
+
+
+class LocalStorage(StorageBackend):
+    """
+    Storage in a local directory, e.g. a filesystem mounted on every node.
+
+    Files are hard-linked into the store when it is on the same filesystem
+    as the images directory, so publishing costs no copy.
+    """
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: str) -> Path:
+        path = self.root.joinpath(key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid storage key '{key}'")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = _partial_path(target)
+        try:
+            try:
+                os.link(path, partial)
+            except OSError:
+                shutil.copyfile(path, partial)
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def get_file(self, key: str, path: Path) -> bool:
+        source = self._path(key)
+        if not source.is_file():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = _partial_path(path)
+        try:
+            try:
+                os.link(source, partial)
+            except OSError:
+                shutil.copyfile(source, partial)
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+        return True
+
+
+class S3Storage(StorageBackend):
+    """
+    Storage in an S3-compatible object store (AWS S3, MinIO, Ceph, R2, ...).
+
+    Requires the optional ``boto3`` package. Uploads and downloads go
+    through boto3's managed transfers, which stream from and to disk in
+    multipart chunks. Clients are redirected to presigned GET URLs.
+    """
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        presign_expires: int = 3600
+    ):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 requires boto3, install it with: pip install \"pdf-image-extractor[s3]\""
+            ) from e
+        self._client_error = ClientError
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.presign_expires = presign_expires
+        # boto3 clients are thread-safe, one is shared by all uploads
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except self._client_error as e:
+            if self._is_missing(e):
+                return False
+            raise
+        return True
+
+    def _extra_args(self, content_type: str) -> Dict[str, str]:
+        return {
+            "ContentType": content_type,
+            # Content-addressed objects never change
+            "CacheControl": f"public, max-age={settings.image_cache_max_age}, immutable",
+        }
+
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        self.client.upload_file(str(path), self.bucket, self._key(key), ExtraArgs=self._extra_args(content_type))
+
+    def get_file(self, key: str, path: Path) -> bool:
+        # A lookup of an unknown PDF or image must not leave its directory behind
+        if not self.exists(key):
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = _partial_path(path)
+        try:
+            self.client.download_file(self.bucket, self._key(key), str(partial))
+            os.replace(partial, path)
+        except self._client_error as e:
+            if self._is_missing(e):
+                return False
+            raise
+        finally:
+            partial.unlink(missing_ok=True)
+        return True
+
+    def url(self, key: str, content_type: str) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(key), "ResponseContentType": content_type},
+            ExpiresIn=self.presign_expires,
+        )
+
+
+def create_storage() -> Optional[StorageBackend]:
+    """
+    Build the storage backend selected by ``settings.storage_backend``.
+
+    Returns:
+        StorageBackend: The backend, or None when images are only kept locally
+
+    Raises:
+        ValueError: If the backend name is unknown or S3 has no bucket
+    """
+    backend = settings.storage_backend.lower()
+    if not backend:
+        return None
+    if backend == "local":
+        root = Path(settings.storage_local_dir or Path(settings.temp_dir).joinpath("storage"))
+        return LocalStorage(root)
+    if backend == "s3":
+        if not settings.storage_s3_bucket:
+            raise ValueError("STORAGE_BACKEND=s3 requires STORAGE_S3_BUCKET")
+        return S3Storage(
+            bucket=settings.storage_s3_bucket,
+            prefix=settings.storage_s3_prefix,
+            endpoint_url=settings.storage_s3_endpoint_url,
+            region=settings.storage_s3_region,
+            access_key=settings.storage_s3_access_key,
+            secret_key=settings.storage_s3_secret_key,
+            presign_expires=settings.storage_presign_expires,
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND '{settings.storage_backend}', expected local or s3")
+
+
+storage = create_storage()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.errors import FileSizeError
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded PDF held in memory when small, or in a temp file when large."""
+    filename: Optional[str]
+    size: int
+    content: Optional[bytes] = None
+    path: Optional[Path] = None
+    # Content hash of the whole upload, computed while reading it
+    digest: Optional[str] = None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What the extraction workers open: a file path, or the raw bytes."""
+        return str(self.path) if self.path is not None else self.content
+
+    def cleanup(self) -> None:
+        """Remove the spool file, if any."""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+        self.content = None
+
+
+async def spool_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Read an upload in chunks, enforcing ``settings.max_upload_size`` as it goes.
+
+    Uploads up to ``settings.upload_spool_threshold`` stay in memory; larger
+    ones are written to a temp file under ``temp_dir/uploads`` so PyMuPDF
+    can open them by path instead of from a bytes copy.
+
+    Raises:
+        FileSizeError: As soon as the upload exceeds the size limit
+    """
+    max_size = settings.max_upload_size
+    if file.size is not None and file.size > max_size:
+        raise FileSizeError(max_size)
+
+    chunks: List[bytes] = []
+    size = 0
+    hasher = hashlib.blake2b(digest_size=16)
+    spool_file = None
+    spool_path: Optional[Path] = None
+    try:
+        while True:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise FileSizeError(max_size)
+            hasher.update(chunk)
+
+            if spool_file is None and size > settings.upload_spool_threshold:
+                spool_dir = Path(settings.temp_dir).joinpath("uploads")
+                spool_dir.mkdir(parents=True, exist_ok=True)
+                fd, name = tempfile.mkstemp(suffix=".pdf", dir=spool_dir)
+                spool_path = Path(name)
+                spool_file = os.fdopen(fd, "wb")
+                await run_in_threadpool(spool_file.writelines, chunks)
+                chunks.clear()
+
+            if spool_file is not None:
+                await run_in_threadpool(spool_file.write, chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spool_file is not None:
+            spool_file.close()
+            spool_path.unlink(missing_ok=True)
+        raise
+    finally:
+        await file.seek(0)  # Reset file pointer for potential reuse
+
+    if spool_file is not None:
+        spool_file.close()
+        return SpooledUpload(filename=file.filename, size=size, path=spool_path, digest=hasher.hexdigest())
+    return SpooledUpload(filename=file.filename, size=size, content=b"".join(chunks), digest=hasher.hexdigest())
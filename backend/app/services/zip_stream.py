@@ -0,0 +1,96 @@
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting ZIP output until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """
+    Incremental ZIP writer for streaming responses.
+
+    Entries are written with data descriptors (the sink is not seekable), so
+    each chunk can be sent as soon as it is produced and memory use stays at
+    roughly one chunk regardless of archive size. ZIP64 records are emitted
+    automatically for large entries and archives.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        self.chunk_size = chunk_size
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", allowZip64=True)
+
+    def _pending(self) -> Iterator[bytes]:
+        data = self._sink.drain()
+        if data:
+            yield data
+
+    @staticmethod
+    def _entry(
+        arcname: str,
+        compress_type: int,
+        compresslevel: Optional[int],
+        path: Optional[Path] = None
+    ) -> zipfile.ZipInfo:
+        if path is not None:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        else:
+            zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+            zinfo.external_attr = 0o600 << 16
+        zinfo.compress_type = compress_type
+        # Same attribute ZipFile.open() sets for entries created from a name
+        zinfo._compresslevel = compresslevel
+        return zinfo
+
+    def write_file(
+        self,
+        arcname: str,
+        path: Path,
+        compress_type: int = zipfile.ZIP_STORED,
+        compresslevel: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Add a file from disk, yielding archive bytes as they are produced."""
+        zinfo = self._entry(arcname, compress_type, compresslevel, path)
+        force_zip64 = zinfo.file_size >= zipfile.ZIP64_LIMIT
+        with path.open("rb") as source, self._zip.open(zinfo, "w", force_zip64=force_zip64) as entry:
+            while True:
+                data = source.read(self.chunk_size)
+                if not data:
+                    break
+                entry.write(data)
+                yield from self._pending()
+        yield from self._pending()
+
+    def write_bytes(
+        self,
+        arcname: str,
+        data: bytes,
+        compress_type: int = zipfile.ZIP_STORED,
+        compresslevel: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Add an in-memory member, yielding the resulting archive bytes."""
+        self._zip.writestr(self._entry(arcname, compress_type, compresslevel), data)
+        yield from self._pending()
+
+    def close(self) -> Iterator[bytes]:
+        """Finish the archive, yielding the central directory."""
+        self._zip.close()
+        yield from self._pending()
@@ -0,0 +1 @@
+"""Extraction benchmarks, see benchmarks/run.py."""
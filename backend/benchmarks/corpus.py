@@ -0,0 +1,134 @@
+"""
+Deterministic synthetic PDFs for the extraction benchmarks.
+
+Every document is generated from a fixed seed, so the same scenario yields
+the same bytes on every run and machine (for a given PyMuPDF and Pillow).
+"""
+import io
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import fitz
+from PIL import Image
+
+
+def noise_image(rng: random.Random, width: int, height: int, mode: str = "RGB", blocks: int = 16) -> Image.Image:
+    """
+    Blocky pseudo-random image.
+
+    Pure noise would not compress at all, flat colour would compress to
+    nothing; coloured blocks with some noise behave more like real photos.
+    """
+    small = Image.frombytes(mode, (blocks, blocks), rng.randbytes(blocks * blocks * len(mode)))
+    image = small.resize((width, height), Image.Resampling.BILINEAR)
+    grain = Image.frombytes("L", (width, height), rng.randbytes(width * height))
+    if mode == "RGB":
+        return Image.blend(image, Image.merge("RGB", (grain, grain, grain)), 0.1)
+    return image
+
+
+def encode(image: Image.Image, fmt: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+def new_document() -> fitz.Document:
+    doc = fitz.open()
+    doc.set_metadata({})  # No creation date, keep the output reproducible
+    return doc
+
+
+def place(page: fitz.Page, stream: bytes, slot: int, columns: int = 4) -> None:
+    """Insert an image into the ``slot``-th cell of a grid on the page."""
+    cell = page.rect.width / columns
+    x, y = (slot % columns) * cell, (slot // columns) * cell
+    page.insert_image(fitz.Rect(x, y, x + cell, y + cell), stream=stream)
+
+
+def many_pages(rng: random.Random) -> fitz.Document:
+    """500 pages, one distinct medium JPEG each."""
+    doc = new_document()
+    for _ in range(500):
+        place(doc.new_page(), encode(noise_image(rng, 320, 240), "JPEG", quality=85), 0)
+    return doc
+
+
+def many_small_images(rng: random.Random) -> fitz.Document:
+    """20 pages of 24 distinct small PNG icons each."""
+    doc = new_document()
+    for _ in range(20):
+        page = doc.new_page()
+        for slot in range(24):
+            place(page, encode(noise_image(rng, 32, 32, blocks=4), "PNG"), slot, columns=6)
+    return doc
+
+
+def huge_images(rng: random.Random) -> fitz.Document:
+    """Three pages, each with one large photo-sized JPEG or PNG."""
+    doc = new_document()
+    for fmt in ("JPEG", "PNG", "JPEG"):
+        stream = encode(noise_image(rng, 3000, 2000, blocks=64), fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+        place(doc.new_page(), stream, 0, columns=1)
+    return doc
+
+
+def repeated_xrefs(rng: random.Random) -> fitz.Document:
+    """300 pages reusing the same logo object, plus one distinct photo per page."""
+    doc = new_document()
+    logo = encode(noise_image(rng, 64, 64, blocks=4), "PNG")
+    xref = 0
+    for _ in range(300):
+        page = doc.new_page()
+        cell = page.rect.width / 4
+        # Reusing the xref stores the logo once and references it from every page
+        xref = page.insert_image(fitz.Rect(0, 0, cell, cell), stream=logo if not xref else None, xref=xref)
+        place(page, encode(noise_image(rng, 200, 150), "JPEG", quality=80), 1)
+    return doc
+
+
+def mixed_formats(rng: random.Random) -> fitz.Document:
+    """40 pages mixing RGB JPEG, CMYK JPEG, PNG with alpha and JPEG 2000."""
+    doc = new_document()
+    for _ in range(40):
+        page = doc.new_page()
+        place(page, encode(noise_image(rng, 400, 300), "JPEG", quality=85), 0)
+        place(page, encode(noise_image(rng, 400, 300, mode="CMYK"), "JPEG", quality=85), 1)
+        place(page, encode(noise_image(rng, 200, 200, mode="RGBA", blocks=8), "PNG"), 2)
+        place(page, encode(noise_image(rng, 300, 300), "JPEG2000", quality_mode="rates", quality_layers=[20]), 3)
+    return doc
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[random.Random], fitz.Document]
+    seed: int
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("many_pages", many_pages, 1),
+        Scenario("many_small_images", many_small_images, 2),
+        Scenario("huge_images", huge_images, 3),
+        Scenario("repeated_xrefs", repeated_xrefs, 4),
+        Scenario("mixed_formats", mixed_formats, 5),
+    )
+}
+
+
+def build_corpus(directory: Path, names: List[str]) -> Dict[str, Path]:
+    """Write the PDFs of the named scenarios to ``directory``, reusing existing files."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in names:
+        scenario = SCENARIOS[name]
+        path = directory / f"{name}.pdf"
+        if not path.exists():
+            with scenario.build(random.Random(scenario.seed)) as doc:
+                doc.save(path, garbage=3, deflate=True, no_new_id=True)
+        paths[name] = path
+    return paths
@@ -0,0 +1,237 @@
+"""
+Extraction benchmarks.
+
+Usage (from the backend directory):
+    python -m benchmarks.run [--scenario NAME ...] [--repeat N]
+                             [--output results.json]
+                             [--baseline baseline.json] [--save-baseline baseline.json]
+
+Each scenario PDF from ``benchmarks.corpus`` is extracted in two modes:
+
+- service: ``PdfService.extract_images`` called directly
+- http: a multipart POST to /extract-images through an in-process ASGI client,
+  exercising validation, spooling and the JSON response of ``upload_pdf``
+
+For every scenario and mode the median wall time over the repeats, the
+images/s and input MB/s derived from it, and the peak RSS of the server
+process plus its extraction workers are recorded as JSON. With --baseline,
+results are compared with a previous run and the exit status is 1 if any
+wall time or peak RSS regressed by more than --tolerance.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Isolated, cache-free settings; they must be in place before the app is imported.
+# Spawned workers inherit TEMP_DIR, so only the parent creates the directory,
+# and it is removed when the parent exits.
+if "TEMP_DIR" not in os.environ:
+    _temp_dir = tempfile.TemporaryDirectory(prefix="pdf-extractor-bench-")
+    os.environ["TEMP_DIR"] = _temp_dir.name
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+os.environ["MAX_UPLOAD_SIZE"] = str(1024 * 1024 * 1024)
+
+import httpx  # noqa: E402
+from starlette.datastructures import Headers, UploadFile  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.extraction_engine import extraction_engine  # noqa: E402
+from app.services.pdf_service import PdfService  # noqa: E402
+from app.services.pdf_worker import ExtractionOptions  # noqa: E402
+
+from .corpus import SCENARIOS, build_corpus  # noqa: E402
+
+# Bump when the corpus generators change so stale PDFs are not reused
+CORPUS_VERSION = 1
+MODES = ("service", "http")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of a process, 0 if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class RssSampler:
+    """Samples the RSS of this process plus the extraction workers in a background thread."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> int:
+        pids = [os.getpid()]
+        executor = extraction_engine._executor
+        if executor is not None and executor._processes:
+            pids.extend(executor._processes)
+        return sum(rss_bytes(pid) for pid in pids)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._sample())
+
+
+async def run_service(path: Path) -> int:
+    data = path.read_bytes()
+    upload = UploadFile(
+        file=io.BytesIO(data), size=len(data), filename=path.name,
+        headers=Headers({"content-type": "application/pdf"})
+    )
+    result = await PdfService.extract_images(upload, ExtractionOptions.from_settings(settings))
+    return len(result.stored_images)
+
+
+async def run_http(client: httpx.AsyncClient, path: Path) -> int:
+    files = {"files": (path.name, path.read_bytes(), "application/pdf")}
+    response = await client.post(f"{settings.api_str}/extract-images", files=files)
+    response.raise_for_status()
+    return response.json()["image_count"]
+
+
+def extracted_dirs() -> Set[str]:
+    """Names of the PDF directories currently in TEMP_DIR/images."""
+    images_dir = Path(settings.temp_dir, "images")
+    return set(os.listdir(images_dir)) if images_dir.is_dir() else set()
+
+
+def remove_extracted(keep: Set[str]) -> None:
+    """Delete the PDF directories written since ``keep`` was listed."""
+    for name in extracted_dirs() - keep:
+        shutil.rmtree(Path(settings.temp_dir, "images", name), ignore_errors=True)
+
+
+async def measure(run: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    existing = extracted_dirs()
+    await run()  # Warm-up: starts the worker pool and fills OS caches
+    remove_extracted(existing)
+    timings = []
+    images = 0
+    with RssSampler() as sampler:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            images = await run()
+            timings.append(time.perf_counter() - started)
+            # Outside the timing, so large scenarios do not pile up on disk
+            remove_extracted(existing)
+    return {"wall_seconds": statistics.median(timings), "images": images, "peak_rss": sampler.peak}
+
+
+async def run_benchmarks(paths: Dict[str, Path], modes: List[str], repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, path in paths.items():
+            size_mb = path.stat().st_size / 1024 / 1024
+            results[name] = {"pdf_mb": round(size_mb, 3)}
+            for mode in modes:
+                run = (lambda: run_service(path)) if mode == "service" else (lambda: run_http(client, path))
+                stats = await measure(run, repeat)
+                wall = stats["wall_seconds"]
+                results[name][mode] = {
+                    "wall_seconds": round(wall, 4),
+                    "images": stats["images"],
+                    "images_per_second": round(stats["images"] / wall, 1),
+                    "mb_per_second": round(size_mb / wall, 2),
+                    "peak_rss_mb": round(stats["peak_rss"] / 1024 / 1024, 1),
+                }
+                print(f"{name:>18} {mode:>8}: {wall:8.3f}s  {results[name][mode]['images_per_second']:>9} img/s  "
+                      f"{results[name][mode]['mb_per_second']:>7} MB/s  {results[name][mode]['peak_rss_mb']:>7} MB RSS",
+                      file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List the metrics that regressed by more than ``tolerance`` against ``baseline``."""
+    regressions = []
+    for name, modes in results["scenarios"].items():
+        for mode, current in modes.items():
+            previous = baseline.get("scenarios", {}).get(name, {}).get(mode)
+            if not isinstance(current, dict) or not previous:
+                continue
+            for metric in ("wall_seconds", "peak_rss_mb"):
+                if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                    change = (current[metric] / previous[metric] - 1) * 100
+                    regressions.append(
+                        f"{name}/{mode} {metric}: {previous[metric]} -> {current[metric]} (+{change:.0f}%)"
+                    )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Extraction benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run, may be repeated (default: all)")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to run, may be repeated (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs per scenario and mode")
+    parser.add_argument("--corpus-dir", type=Path,
+                        default=Path(tempfile.gettempdir()) / f"pdf-extractor-bench-corpus-v{CORPUS_VERSION}",
+                        help="Where the synthetic PDFs are generated and reused")
+    parser.add_argument("--output", type=Path, help="Write the results JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with the results JSON of an earlier run")
+    parser.add_argument("--save-baseline", type=Path, help="Also write the results JSON as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    paths = build_corpus(args.corpus_dir, args.scenario or sorted(SCENARIOS))
+    try:
+        scenarios = asyncio.run(run_benchmarks(paths, args.mode or list(MODES), args.repeat))
+    finally:
+        extraction_engine.shutdown()
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "extraction_workers": settings.extraction_workers,
+        },
+        "repeat": args.repeat,
+        "scenarios": scenarios,
+    }
+    output = json.dumps(results, indent=2)
+    print(output)
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.write_text(output + "\n")
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regression beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
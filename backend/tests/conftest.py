@@ -0,0 +1,62 @@
+"""
+Shared fixtures.
+
+Settings are read when ``app`` is first imported, so the environment is
+prepared here, before any test module imports it.
+"""
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+_temp_dir = tempfile.TemporaryDirectory(prefix="pdf-extractor-tests-")
+os.environ["TEMP_DIR"] = _temp_dir.name
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+os.environ["EXTRACTION_WORKERS"] = "2"
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    _temp_dir.cleanup()
+
+
+def image_bytes(color: Sequence[int], size: int = 32, image_format: str = "PNG") -> bytes:
+    """Encode a solid-color image."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), tuple(color)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def make_pdf(tmp_path: Path) -> Callable[..., Path]:
+    """
+    Build a PDF from a list of pages, each a list of encoded images.
+
+    Returns the path of the written file.
+    """
+    def build(pages: Sequence[Sequence[bytes]], name: str = "test.pdf") -> Path:
+        document = fitz.open()
+        for images in pages:
+            page = document.new_page()
+            for number, data in enumerate(images):
+                offset = number * 110
+                page.insert_image(fitz.Rect(offset, 0, offset + 100, 100), stream=data)
+        path = tmp_path / name
+        document.save(path)
+        document.close()
+        return path
+    return build
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """HTTP client running the application, lifespan included."""
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
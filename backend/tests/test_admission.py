@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.core.errors import PDFProcessingError, ServiceBusyError
+from app.core.metrics import ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS, registry
+from app.services.admission import AdmissionController, admission_controller
+from app.services.extraction_engine import ExtractionEngine
+from app.services.pdf_service import PdfService
+
+
+def controller(**overrides) -> AdmissionController:
+    options = dict(
+        max_concurrent=2, memory_budget=1000, memory_factor=1.0,
+        max_queue=2, queue_timeout=5.0, retry_after=7
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_admits_up_to_the_limit_then_queues_in_order() -> None:
+    async def scenario() -> None:
+        admission = controller()
+        await admission.acquire(10)
+        await admission.acquire(10)
+        assert admission.in_flight == 2
+
+        order = []
+
+        async def wait(name: str) -> None:
+            await admission.acquire(10)
+            order.append(name)
+
+        waiters = [asyncio.create_task(wait("first")), asyncio.create_task(wait("second"))]
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 2 and not order
+
+        admission.release(10)
+        await asyncio.sleep(0.01)
+        assert order == ["first"]
+        admission.release(10)
+        await asyncio.gather(*waiters)
+        assert order == ["first", "second"]
+        assert admission.in_flight == 2 and admission.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_memory_budget_holds_back_large_extractions() -> None:
+    async def scenario() -> None:
+        admission = controller(max_concurrent=10)
+        await admission.acquire(800)
+        waiter = asyncio.create_task(admission.acquire(300))
+        await asyncio.sleep(0)
+        assert not waiter.done() and admission.reserved_bytes == 800
+
+        admission.release(800)
+        await waiter
+        assert admission.reserved_bytes == 300
+
+    asyncio.run(scenario())
+
+
+def test_extraction_larger_than_the_budget_runs_alone() -> None:
+    async def scenario() -> None:
+        admission = controller()
+        await admission.acquire(5000)
+        assert admission.in_flight == 1
+        admission.release(5000)
+        assert admission.reserved_bytes == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_refused_immediately() -> None:
+    async def scenario() -> None:
+        admission = controller(max_concurrent=1, max_queue=1)
+        await admission.acquire(10)
+        waiter = asyncio.create_task(admission.acquire(10))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceBusyError) as refused:
+            await admission.acquire(10)
+        assert refused.value.headers == {"Retry-After": "7"}
+        assert admission.rejected == 1
+
+        admission.release(10)
+        await waiter
+
+    asyncio.run(scenario())
+
+
+def test_wait_times_out_without_leaking_a_slot() -> None:
+    async def scenario() -> None:
+        admission = controller(max_concurrent=1, queue_timeout=0.05)
+        await admission.acquire(10)
+        with pytest.raises(ServiceBusyError):
+            await admission.acquire(10)
+        assert admission.queue_depth == 0
+
+        admission.release(10)
+        assert admission.in_flight == 0 and admission.reserved_bytes == 0
+        await admission.acquire(10)
+
+    asyncio.run(scenario())
+
+
+def test_unbounded_wait_ignores_queue_limits() -> None:
+    async def scenario() -> None:
+        admission = controller(max_concurrent=1, max_queue=0, queue_timeout=0.01)
+        await admission.acquire(10)
+        waiter = asyncio.create_task(admission.acquire(10, bounded=False))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        admission.release(10)
+        await waiter
+        assert admission.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_gives_its_place_back() -> None:
+    async def scenario() -> None:
+        admission = controller(max_concurrent=1)
+        await admission.acquire(10)
+        cancelled = asyncio.create_task(admission.acquire(10))
+        waiting = asyncio.create_task(admission.acquire(10))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        admission.release(10)
+        await waiting
+        assert admission.in_flight == 1 and admission.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_admit_releases_on_error() -> None:
+    async def scenario() -> None:
+        admission = controller()
+        with pytest.raises(RuntimeError):
+            async with admission.admit(100):
+                assert admission.reserved_bytes == 100
+                raise RuntimeError("extraction failed")
+        assert admission.in_flight == 0 and admission.reserved_bytes == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("mode", ["download", "ndjson"])
+def test_busy_streaming_request_gets_503_before_streaming(client, make_pdf, monkeypatch, mode: str) -> None:
+    pdf = make_pdf([[]])
+    # No slot ever frees up, so the request times out waiting for one
+    monkeypatch.setattr(admission_controller, "max_concurrent", 0)
+    monkeypatch.setattr(admission_controller, "queue_timeout", 0.05)
+    uploads_dir = Path(settings.temp_dir, "uploads")
+
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params={"download": "true"} if mode == "download" else None,
+        headers={"Accept": "application/x-ndjson"} if mode == "ndjson" else None,
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(admission_controller.retry_after)
+    assert admission_controller.in_flight == 0
+    assert not uploads_dir.exists() or not any(uploads_dir.iterdir())
+
+
+def sample(metric, *labels: str) -> float:
+    """Current value of a counter, or the observation count of a histogram."""
+    for name, _, values, value in metric.samples():
+        if tuple(values[:len(labels)]) == labels and (name.endswith("_total") or name.endswith("_count")):
+            return value
+    return 0.0
+
+
+def test_waits_and_rejections_are_exported_as_metrics() -> None:
+    waits = sample(ADMISSION_WAIT_SECONDS)
+    timeouts = sample(ADMISSION_REJECTED, "timeout")
+    full = sample(ADMISSION_REJECTED, "queue_full")
+
+    async def scenario() -> None:
+        admission = controller(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        await admission.acquire(10)
+        waiter = asyncio.ensure_future(admission.acquire(10))
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceBusyError):
+            admission.check()
+        with pytest.raises(ServiceBusyError):
+            await waiter
+
+    asyncio.run(scenario())
+
+    assert sample(ADMISSION_WAIT_SECONDS) == waits + 2
+    assert sample(ADMISSION_REJECTED, "timeout") == timeouts + 1
+    assert sample(ADMISSION_REJECTED, "queue_full") == full + 1
+    assert "pdf_extractor_admission_wait_seconds_bucket" in registry.render()
+
+
+def test_a_failed_extraction_cancels_its_siblings() -> None:
+    async def scenario() -> None:
+        admission = controller()
+        started = asyncio.Event()
+        cancelled = []
+
+        async def slow() -> None:
+            async with admission.admit(10):
+                started.set()
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+        async def failing() -> None:
+            await started.wait()
+            raise PDFProcessingError("Error processing PDF", "bad.pdf")
+
+        with pytest.raises(PDFProcessingError):
+            await asyncio.wait_for(PdfService.extract_all([slow(), failing()]), timeout=5)
+        # The sibling released its slot before the error reached the caller
+        assert cancelled == [True]
+        assert admission.in_flight == 0 and admission.reserved_bytes == 0
+
+    asyncio.run(scenario())
+
+
+def test_abandoned_worker_calls_clean_up_when_they_end() -> None:
+    engine = ExtractionEngine(max_workers=1)
+    finished = threading.Event()
+
+    async def scenario() -> None:
+        await engine.run(time.sleep, 0)  # Starts the worker
+        call = asyncio.ensure_future(engine.run(time.sleep, 0.5, on_abandon=finished.set))
+        await asyncio.sleep(0.1)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        # Still running in its worker, so not cleaned up yet
+        assert not finished.is_set()
+
+    try:
+        asyncio.run(scenario())
+        assert finished.wait(timeout=10)
+    finally:
+        engine.shutdown()
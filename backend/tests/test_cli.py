@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app import cli
+
+from .conftest import image_bytes
+from .crash_worker import extract_or_crash
+
+
+@pytest.fixture
+def source(tmp_path: Path, make_pdf) -> Path:
+    """Three PDFs, one of them in a subdirectory, and a text file to ignore."""
+    source = tmp_path / "source"
+    (source / "nested").mkdir(parents=True)
+    for number, relative in enumerate(["a.pdf", "b.pdf", "nested/c.pdf"]):
+        pdf = make_pdf([[image_bytes((number * 80 + 40, 0, 0))], [image_bytes((0, number * 80 + 40, 0))]], f"{number}.pdf")
+        pdf.rename(source / relative)
+    (source / "notes.txt").write_text("not a pdf")
+    return source
+
+
+def run(capsys, *args: str) -> Dict[str, Any]:
+    """Run the CLI with --json and return its exit status and summary."""
+    status = cli.main(["extract", *args, "--json", "--workers", "2"])
+    summary = json.loads(capsys.readouterr().out)
+    return {"status": status, **summary}
+
+
+def journal(out: Path) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in (out / cli.JOURNAL_FILENAME).read_text().splitlines()]
+
+
+def test_extracts_a_directory_tree(capsys, source: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+
+    summary = run(capsys, str(source), "--out", str(out))
+
+    assert summary["status"] == 0
+    assert (summary["pdfs"], summary["failed"], summary["skipped"]) == (3, 0, 0)
+    assert (summary["pages"], summary["images"]) == (6, 6)
+    assert summary["bytes_in"] == sum(path.stat().st_size for path in source.rglob("*.pdf"))
+    for relative in ("a", "b", "nested/c"):
+        manifest = json.loads((out / relative / "manifest.json").read_text())
+        assert manifest["pdf_id"] == relative
+        assert [image["filename"] for image in manifest["images"]] == ["page_1_image_1.png", "page_2_image_1.png"]
+    assert sorted(entry["status"] for entry in journal(out)) == ["done"] * 3
+
+
+def test_resumes_from_the_journal(capsys, source: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    run(capsys, str(source), "--out", str(out))
+    (source / "d.pdf").write_bytes((source / "a.pdf").read_bytes())
+
+    resumed = run(capsys, str(source), "--out", str(out))
+
+    assert (resumed["pdfs"], resumed["skipped"]) == (1, 3)
+    assert (out / "d" / "manifest.json").is_file()
+
+    restarted = run(capsys, str(source), "--out", str(out), "--restart")
+    assert (restarted["pdfs"], restarted["skipped"]) == (4, 0)
+
+
+def test_human_readable_summary(capsys, source: Path, tmp_path: Path) -> None:
+    assert cli.main(["extract", str(source / "*.pdf"), "--out", str(tmp_path / "out")]) == 0
+
+    captured = capsys.readouterr()
+    assert captured.out.startswith("Extracted 4 images from 2 PDFs (0 failed, 0 skipped)")
+    assert "2 PDFs found, 0 already extracted, 2 to go" in captured.err
+
+
+def test_a_broken_pdf_fails_alone(capsys, source: Path, tmp_path: Path) -> None:
+    (source / "bad.pdf").write_bytes(b"not a pdf at all")
+    out = tmp_path / "out"
+
+    summary = run(capsys, str(source), "--out", str(out))
+
+    assert summary["status"] == 1
+    assert (summary["pdfs"], summary["failed"]) == (3, 1)
+    assert not (out / "bad").exists()
+    failed = [entry for entry in journal(out) if entry["status"] == "failed"]
+    assert [Path(entry["path"]).name for entry in failed] == ["bad.pdf"]
+
+    # Failed PDFs are retried by the next run
+    assert run(capsys, str(source), "--out", str(out))["skipped"] == 3
+
+
+def test_a_crashing_pdf_does_not_fail_the_others(capsys, monkeypatch, source: Path, tmp_path: Path) -> None:
+    monkeypatch.setattr(cli, "extract_to_directory", extract_or_crash)
+    (source / "crash.pdf").write_bytes((source / "a.pdf").read_bytes())
+    out = tmp_path / "out"
+
+    summary = run(capsys, str(source), "--out", str(out))
+
+    assert (summary["pdfs"], summary["failed"]) == (3, 1)
+    failed = [entry for entry in journal(out) if entry["status"] == "failed"]
+    assert [Path(entry["path"]).name for entry in failed] == ["crash.pdf"]
+    assert "crashed" in failed[0]["error"]
+    assert not (out / "crash").exists()
@@ -0,0 +1,107 @@
+import asyncio
+import io
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services.derivatives import DerivativeCache, derivative_cache
+
+from .conftest import image_bytes
+
+
+@pytest.fixture
+def image_url(client, make_pdf) -> str:
+    pdf = make_pdf([[image_bytes((30, 60, 90), size=64)]])
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+    assert response.status_code == 200
+    return response.json()["image_urls"][0]
+
+
+def test_preview_is_resized_and_converted(client, image_url: str) -> None:
+    response = client.get(image_url, params={"w": 16})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["content-disposition"].endswith('.webp"')
+    with Image.open(io.BytesIO(response.content)) as preview:
+        assert preview.format == "WEBP"
+        assert preview.size == (16, 16)
+
+
+def test_conversion_without_resizing(client, image_url: str) -> None:
+    response = client.get(image_url, params={"format": "JPEG"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    with Image.open(io.BytesIO(response.content)) as converted:
+        assert converted.size == (64, 64)
+
+
+@pytest.mark.parametrize("params, status_code", [
+    ({"w": 8}, 422),
+    ({"w": settings.preview_max_width + 1}, 422),
+    ({"w": "wide"}, 422),
+    ({"format": "bmp"}, 400),
+])
+def test_invalid_variants_are_rejected(client, image_url: str, params: dict, status_code: int) -> None:
+    assert client.get(image_url, params=params).status_code == status_code
+
+
+def test_variants_are_rendered_once(client, image_url: str) -> None:
+    renders, hits = derivative_cache.renders, derivative_cache.hits
+
+    first = client.get(image_url, params={"w": 32})
+    second = client.get(image_url, params={"w": 32})
+    revalidated = client.get(image_url, params={"w": 32}, headers={"If-None-Match": first.headers["etag"]})
+
+    assert derivative_cache.renders == renders + 1
+    assert derivative_cache.hits == hits + 2
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert revalidated.status_code == 304
+
+
+def test_variant_of_a_missing_image_is_404(client) -> None:
+    assert client.get(f"{settings.api_str}/images/unknown/page_1_image_1.png", params={"w": 32}).status_code == 404
+
+
+def render_all(cache: DerivativeCache, source: Path, widths: range) -> None:
+    async def scenario() -> None:
+        for width in widths:
+            await cache.get(source, width, "png")
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def noisy_source(tmp_path: Path) -> Path:
+    source = tmp_path.joinpath("images", "pdf", "thumbs", "page_1_image_1.png")
+    source.parent.mkdir(parents=True)
+    # Noise does not compress, so every variant takes roughly width² * 3 bytes
+    Image.frombytes("RGB", (128, 128), os.urandom(128 * 128 * 3)).save(source)
+    return source.resolve()
+
+
+def test_eviction_trims_to_the_low_water_mark(tmp_path: Path, noisy_source: Path) -> None:
+    cache = DerivativeCache(tmp_path / "images", max_bytes=60_000, workers=1, low_water=0.5)
+    try:
+        render_all(cache, noisy_source, range(40, 120, 4))
+    finally:
+        cache.shutdown()
+
+    derived = [path for path in (tmp_path / "images" / "pdf" / "derived").rglob("*") if path.is_file()]
+    # Variants of nested files are mirrored below derived/ and count against the budget
+    assert all(path.parent.name == "thumbs" for path in derived)
+    total = sum(path.stat().st_size for path in derived)
+    assert total <= cache.max_bytes
+    assert cache.stats()["bytes"] == total
+    assert cache.evicted > 0
+    # The newest variant is kept
+    assert cache.path_for(noisy_source, 116, "png").is_file()
+    # The directory is scanned once per batch of evictions, not after every render
+    assert cache.scans < cache.renders / 2
@@ -0,0 +1,59 @@
+import time
+from collections import deque
+
+import pytest
+
+from app.core.config import settings
+from app.services.extraction_engine import extraction_engine
+from app.services.health_monitor import health_monitor
+
+
+def test_ready_when_no_threshold_is_crossed(client) -> None:
+    response = client.get(f"{settings.api_str}/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["failing"] == []
+
+
+@pytest.fixture
+def saturated(request, monkeypatch) -> str:
+    """Cross one readiness threshold, named by the test parameter."""
+    if request.param == "loop_lag":
+        # A 2s stall recorded a moment ago, against the default 0.5s limit
+        monkeypatch.setattr(health_monitor, "_lags", deque([(time.monotonic(), 2.0)]))
+        return "Event loop lag of 2000ms exceeds 500ms"
+    if request.param == "queue_depth":
+        monkeypatch.setattr(extraction_engine, "pending", extraction_engine.max_workers + 40)
+        return f"40 extraction calls waiting for a worker, limit is {health_monitor.max_queue_depth}"
+    if request.param == "free_space":
+        monkeypatch.setattr(health_monitor, "min_free_bytes", 2 ** 62)
+        return "bytes free in the temporary directory"
+    monkeypatch.setattr(health_monitor, "max_rss_bytes", 1)
+    return "Resident memory of"
+
+
+@pytest.mark.parametrize("saturated", ["loop_lag", "queue_depth", "free_space", "rss"], indirect=True)
+def test_not_ready_over_a_threshold(client, saturated: str) -> None:
+    # Resources are sampled by the monitor task, so read them now rather than on its next tick
+    health_monitor.sample_resources()
+
+    ready = client.get(f"{settings.api_str}/ready")
+    health = client.get(f"{settings.api_str}/health")
+
+    assert ready.status_code == 503
+    assert ready.json()["status"] == "not_ready"
+    assert len(ready.json()["failing"]) == 1
+    assert saturated in ready.json()["failing"][0]
+    # Liveness is unaffected, it only reports the degradation
+    assert health.status_code == 200
+    assert health.json()["status"] == "degraded"
+    assert health.json()["failing"] == ready.json()["failing"]
+
+
+def test_zero_disables_a_check(monkeypatch) -> None:
+    monkeypatch.setattr(health_monitor, "max_queue_depth", 0)
+    monkeypatch.setattr(health_monitor, "min_free_bytes", 0)
+    readings = {"loop_lag_max_ms": 0.0, "pool_queue_depth": 10_000, "temp_dir_free_bytes": 0, "rss_bytes": 2 ** 40}
+
+    assert health_monitor.failing(readings) == []
@@ -0,0 +1,87 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+
+from .conftest import image_bytes
+
+
+@pytest.fixture
+def image_url(client, make_pdf) -> str:
+    pdf = make_pdf([[image_bytes((90, 60, 30), size=64)]])
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+    assert response.status_code == 200
+    return response.json()["image_urls"][0]
+
+
+def image_path(image_url: str) -> Path:
+    pdf_id, filename = image_url.split("/")[-2:]
+    return Path(settings.temp_dir).joinpath("images", pdf_id, filename)
+
+
+def test_image_has_a_content_etag_and_immutable_caching(client, image_url: str) -> None:
+    response = client.get(image_url)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    digest = hashlib.blake2b(image_path(image_url).read_bytes(), digest_size=16).hexdigest()
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["cache-control"] == f"public, max-age={settings.image_cache_max_age}, immutable"
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "W/{etag}",
+    '"other", {etag}',
+    "*",
+])
+def test_matching_if_none_match_is_304(client, image_url: str, if_none_match: str) -> None:
+    etag = client.get(image_url).headers["etag"]
+
+    response = client.get(image_url, headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_other_etag_gets_the_image(client, image_url: str) -> None:
+    response = client.get(image_url, headers={"If-None-Match": '"other"'})
+
+    assert response.status_code == 200
+    assert response.content == image_path(image_url).read_bytes()
+
+
+def test_range_request_is_206(client, image_url: str) -> None:
+    content = image_path(image_url).read_bytes()
+
+    response = client.get(image_url, headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == content[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(content)}"
+    assert "etag" in response.headers
+
+
+def test_accel_redirect_leaves_the_bytes_to_nginx(client, image_url: str, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "image_accel_redirect", "/protected-images/")
+    pdf_id, filename = image_url.split("/")[-2:]
+
+    response = client.get(image_url)
+
+    assert response.status_code == 200
+    assert response.headers["x-accel-redirect"] == f"/protected-images/{pdf_id}/{filename}"
+    assert response.content == b""
+
+
+def test_paths_outside_the_pdf_directory_are_404(client, image_url: str) -> None:
+    pdf_id = image_url.split("/")[-2]
+
+    response = client.get(f"{settings.api_str}/images/{pdf_id}/..%2F..%2Fcache")
+
+    assert response.status_code == 404
@@ -0,0 +1,82 @@
+from typing import List
+
+import pytest
+
+from app.core.config import settings
+
+from .conftest import image_bytes
+
+
+@pytest.fixture
+def images_url(client, make_pdf) -> str:
+    # Pages 1-4 with 1, 2, 1 and 2 images, the last one repeating page 1
+    first = image_bytes((10, 0, 0))
+    pdf = make_pdf([
+        [first],
+        [image_bytes((20, 0, 0)), image_bytes((30, 0, 0))],
+        [image_bytes((40, 0, 0))],
+        [image_bytes((50, 0, 0)), first],
+    ])
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+    assert response.status_code == 200
+    pdf_id = response.json()["image_urls"][0].split("/")[-2]
+    return f"{settings.api_str}/pdf/{pdf_id}/images"
+
+
+def ids(response) -> List[str]:
+    return [image["id"].rsplit(".", 1)[0] for image in response.json()]
+
+
+def test_lists_stored_images_in_page_order(client, images_url: str) -> None:
+    response = client.get(images_url)
+
+    assert response.status_code == 200
+    # The duplicate on page 4 has no file of its own and is not listed
+    assert ids(response) == [
+        "page_1_image_1", "page_2_image_1", "page_2_image_2", "page_3_image_1", "page_4_image_1",
+    ]
+    assert response.headers["x-total-count"] == "5"
+    image = response.json()[0]
+    assert image["url"].endswith(f"/{image['pdf_id']}/{image['id']}")
+    assert (image["page"], image["index"], image["width"]) == (1, 1, 32)
+
+
+@pytest.mark.parametrize("params, expected, total", [
+    ({"page_from": 2, "page_to": 3}, ["page_2_image_1", "page_2_image_2", "page_3_image_1"], 3),
+    ({"page_from": 4}, ["page_4_image_1"], 1),
+    ({"offset": 1, "limit": 2}, ["page_2_image_1", "page_2_image_2"], 5),
+    ({"page_from": 2, "offset": 2}, ["page_3_image_1", "page_4_image_1"], 4),
+    ({"offset": 10}, [], 5),
+])
+def test_page_filter_and_window(client, images_url: str, params: dict, expected: List[str], total: int) -> None:
+    response = client.get(images_url, params=params)
+
+    assert response.status_code == 200
+    assert ids(response) == expected
+    # The count covers the page filter, not the offset/limit window
+    assert response.headers["x-total-count"] == str(total)
+
+
+@pytest.mark.parametrize("params", [{"page_from": 0}, {"offset": -1}, {"limit": 0}, {"limit": 1001}])
+def test_invalid_window_is_rejected(client, images_url: str, params: dict) -> None:
+    assert client.get(images_url, params=params).status_code == 422
+
+
+def test_listing_is_revalidated_with_its_etag(client, images_url: str) -> None:
+    first = client.get(images_url)
+    etag = first.headers["etag"]
+
+    revalidated = client.get(images_url, headers={"If-None-Match": etag})
+    windowed = client.get(images_url, params={"limit": 1})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    # One ETag per PDF, whatever the window
+    assert windowed.headers["etag"] == etag
+
+
+def test_unknown_pdf_is_404(client) -> None:
+    assert client.get(f"{settings.api_str}/pdf/unknown/images").status_code == 404
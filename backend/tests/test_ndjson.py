@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+from .conftest import image_bytes
+
+
+def stream(client, files: List[tuple], **params: Any) -> List[Dict[str, Any]]:
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params=params,
+        files=[("files", file) for file in files],
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def pdf_file(pdf: Path) -> tuple:
+    return (pdf.name, pdf.read_bytes(), "application/pdf")
+
+
+def test_one_line_per_image_then_a_summary(client, make_pdf) -> None:
+    shared = image_bytes((200, 0, 0), image_format="JPEG")
+    first = make_pdf([[shared, image_bytes((0, 200, 0))], [shared]], "first.pdf")
+    second = make_pdf([[image_bytes((0, 0, 200)), shared]], "second.pdf")
+
+    lines = stream(client, [pdf_file(first), pdf_file(second)])
+
+    images, summary = lines[:-1], lines[-1]
+    assert all(line["type"] == "image" for line in images)
+    assert sorted((line["pdf"], line["page"], line["index"]) for line in images if line["format"] == "png") == [
+        (1, 1, 2), (2, 1, 1),
+    ]
+    # The shared JPEG is emitted once, by whichever PDF reached it first
+    assert sum(line["format"] == "jpeg" for line in images) == 1
+    assert all(line["url"].endswith(f"/{line['pdf_id']}/{line['id']}") for line in images)
+
+    assert summary["type"] == "summary"
+    assert summary["image_count"] == 3
+    assert summary["duplicates_skipped"] == 2
+    assert [(pdf["pdf"], pdf["filename"]) for pdf in summary["pdfs"]] == [(1, "first.pdf"), (2, "second.pdf")]
+    assert {line["pdf_id"] for line in images} <= {pdf["pdf_id"] for pdf in summary["pdfs"]}
+
+
+def test_without_dedupe_every_image_is_emitted(client, make_pdf) -> None:
+    shared = image_bytes((200, 0, 0), image_format="JPEG")
+    pdf = make_pdf([[shared], [shared]])
+
+    lines = stream(client, [pdf_file(pdf)], dedupe="false")
+
+    assert [(line["type"], line.get("page")) for line in lines] == [("image", 1), ("image", 2), ("summary", None)]
+    assert lines[-1]["duplicates_skipped"] == 0
+
+
+def test_failure_is_reported_as_the_last_line(client) -> None:
+    lines = stream(client, [("bad.pdf", b"not a pdf at all", "application/pdf")])
+
+    # The status is sent with the first line, so errors arrive in the body
+    assert lines == [{"type": "error", "pdf": 1, "message": lines[0]["message"]}]
+    assert "Invalid or corrupted PDF file" in lines[0]["message"]
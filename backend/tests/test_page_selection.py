@@ -0,0 +1,67 @@
+import pytest
+
+from app.core.config import settings
+from app.services.pdf_worker import ExtractionOptions, parse_page_ranges
+
+from .conftest import image_bytes
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("3", ((3, 3),)),
+    ("1-3,7,10-", ((1, 3), (7, 7), (10, None))),
+    ("-4", ((1, 4),)),
+    (" 2 - 5 , 8 ", ((2, 5), (8, 8))),
+    ("1,,2,", ((1, 1), (2, 2))),
+])
+def test_parse_page_ranges(spec: str, expected) -> None:
+    assert parse_page_ranges(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["", " , ", "0", "5-2", "a", "1-b", "-0"])
+def test_parse_page_ranges_rejects_malformed_selections(spec: str) -> None:
+    with pytest.raises(ValueError):
+        parse_page_ranges(spec)
+
+
+def test_selects_page() -> None:
+    options = ExtractionOptions(pages=((2, 3), (7, None)))
+    assert [page for page in range(1, 10) if options.selects_page(page)] == [2, 3, 7, 8, 9]
+    assert ExtractionOptions().selects_page(1000)
+
+
+@pytest.mark.parametrize("start, stop, selected", [
+    (0, 1, False),   # page 1
+    (0, 2, True),    # pages 1-2, 2 is selected
+    (3, 5, False),   # pages 4-5
+    (4, 6, True),    # pages 5-6, 6 is selected
+    (6, 50, True),   # open end
+])
+def test_selects_pages_matches_any_page_of_the_range(start: int, stop: int, selected: bool) -> None:
+    options = ExtractionOptions(pages=((2, 3), (6, 6), (20, None)))
+    assert options.selects_pages(start, stop) is selected
+    assert selected == any(options.selects_page(page + 1) for page in range(start, stop))
+
+
+def test_extraction_only_decodes_selected_pages(client, make_pdf) -> None:
+    pdf = make_pdf([[image_bytes((number * 40, 0, 0))] for number in range(5)])
+
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params={"pages": "2,4-"},
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+
+    assert response.status_code == 200
+    assert [url.rsplit("/", 1)[1].split("_")[1] for url in response.json()["image_urls"]] == ["2", "4", "5"]
+
+
+def test_invalid_page_selection_is_a_400(client, make_pdf) -> None:
+    pdf = make_pdf([[image_bytes((0, 0, 0))]])
+
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params={"pages": "3-1"},
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+
+    assert response.status_code == 400
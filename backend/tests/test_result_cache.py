@@ -0,0 +1,107 @@
+import os
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services.pdf_worker import ExtractionOptions
+from app.services.result_cache import ResultCache
+
+
+def make_result(size: int = 100) -> str:
+    """Create an ``images/<pdf_id>`` directory holding ``size`` bytes."""
+    pdf_id = str(uuid.uuid4())
+    pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
+    pdf_dir.mkdir(parents=True)
+    pdf_dir.joinpath("page_1_image_1.png").write_bytes(b"x" * size)
+    return pdf_id
+
+
+def age(cache: ResultCache, key: str, seconds: float) -> None:
+    """Pretend the entry was last accessed ``seconds`` ago."""
+    accessed = time.time() - seconds
+    os.utime(cache.cache_dir / f"{key}.json", (accessed, accessed))
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResultCache:
+    return ResultCache(tmp_path / "cache", max_bytes=250, max_age=3600)
+
+
+def test_hit_and_miss(cache: ResultCache) -> None:
+    pdf_id = make_result()
+    key = cache.key("digest", ExtractionOptions())
+
+    assert cache.get(key) is None
+    cache.put(key, pdf_id)
+    assert cache.get(key) == pdf_id
+    assert cache.get(cache.key("other digest", ExtractionOptions())) is None
+
+
+def test_options_are_part_of_the_key(cache: ResultCache) -> None:
+    cache.put(cache.key("digest", ExtractionOptions()), make_result())
+
+    assert cache.key("digest", ExtractionOptions()) == cache.key("digest", ExtractionOptions())
+    assert cache.get(cache.key("digest", ExtractionOptions(image_format="png"))) is None
+    assert cache.get(cache.key("digest", ExtractionOptions(dedupe=False))) is None
+
+
+def test_hit_refreshes_the_directory_for_retention(cache: ResultCache) -> None:
+    pdf_id = make_result()
+    pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
+    os.utime(pdf_dir, (0, 0))
+    cache.put("key", pdf_id)
+
+    cache.get("key")
+
+    assert pdf_dir.stat().st_mtime > time.time() - 60
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(cache: ResultCache) -> None:
+    ids = {name: make_result() for name in ("old", "used", "new")}
+    cache.put("old", ids["old"])
+    cache.put("used", ids["used"])
+    age(cache, "old", 20)
+    age(cache, "used", 10)
+    cache.get("used")  # Now the most recently used
+
+    cache.put("new", ids["new"])
+
+    assert cache.get("old") is None
+    assert cache.get("used") == ids["used"]
+    assert cache.get("new") == ids["new"]
+
+
+def test_expired_entries_are_evicted(cache: ResultCache) -> None:
+    pdf_id = make_result()
+    cache.put("key", pdf_id)
+    age(cache, "key", 7200)
+
+    assert cache.get("key") is None
+    assert not (cache.cache_dir / "key.json").exists()
+
+
+def test_eviction_keeps_the_images(cache: ResultCache) -> None:
+    cache.max_bytes = 1000
+    pdf_ids = [make_result() for _ in range(3)]
+    for number, pdf_id in enumerate(pdf_ids):
+        cache.put(f"key{number}", pdf_id)
+        age(cache, f"key{number}", 10 - number)
+
+    cache.max_bytes = 250
+    assert cache.evict() == 100
+    assert cache.get("key0") is None
+    # URLs of evicted results stay valid until the retention sweeper expires them
+    assert all(Path(settings.temp_dir).joinpath("images", pdf_id).is_dir() for pdf_id in pdf_ids)
+
+
+def test_entries_of_removed_images_are_dropped(cache: ResultCache) -> None:
+    pdf_id = make_result()
+    cache.put("key", pdf_id)
+    Path(settings.temp_dir).joinpath("images", pdf_id, "page_1_image_1.png").unlink()
+    Path(settings.temp_dir).joinpath("images", pdf_id).rmdir()
+
+    assert cache.get("key") is None
+    assert list(cache.cache_dir.iterdir()) == []
@@ -0,0 +1,95 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services import retention
+from app.services.result_cache import ResultCache
+from app.services.retention import RetentionSweeper
+
+
+def make_dir(images_dir: Path, pdf_id: str, size: int, age: float) -> Path:
+    """Create ``images/<pdf_id>`` holding ``size`` bytes, last used ``age`` seconds ago."""
+    pdf_dir = images_dir / pdf_id
+    pdf_dir.mkdir(parents=True)
+    pdf_dir.joinpath("page_1_image_1.png").write_bytes(b"x" * size)
+    last_used = time.time() - age
+    os.utime(pdf_dir, (last_used, last_used))
+    return pdf_dir
+
+
+@pytest.fixture
+def temp_dir(tmp_path: Path, monkeypatch) -> Path:
+    # The result cache resolves images/<pdf_id> against settings.temp_dir
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    cache = ResultCache(tmp_path / "cache", max_bytes=10_000, max_age=3600)
+    monkeypatch.setattr(retention, "result_cache", cache)
+    return tmp_path
+
+
+def make_sweeper(temp_dir: Path, ttl: int = 3600, quota_bytes: int = 10_000) -> RetentionSweeper:
+    return RetentionSweeper(temp_dir / "images", temp_dir / "uploads", ttl, quota_bytes, interval=60)
+
+
+def test_expired_directories_and_spool_files_are_removed(temp_dir: Path) -> None:
+    images_dir = temp_dir / "images"
+    expired = make_dir(images_dir, "expired", 100, age=7200)
+    fresh = make_dir(images_dir, "fresh", 100, age=60)
+    uploads_dir = temp_dir / "uploads"
+    uploads_dir.mkdir()
+    stale_spool = uploads_dir / "stale.pdf"
+    stale_spool.write_bytes(b"x" * 50)
+    os.utime(stale_spool, (0, 0))
+    sweeper = make_sweeper(temp_dir)
+
+    stats = sweeper.sweep()
+
+    assert not expired.exists()
+    assert not stale_spool.exists()
+    assert fresh.is_dir()
+    assert stats == {"dirs_removed": 1, "bytes_reclaimed": 150}
+    assert sweeper.stats()["sweeps"] == 1
+
+
+def test_quota_removes_least_recently_used_first(temp_dir: Path) -> None:
+    images_dir = temp_dir / "images"
+    oldest = make_dir(images_dir, "oldest", 100, age=300)
+    older = make_dir(images_dir, "older", 100, age=200)
+    newest = make_dir(images_dir, "newest", 100, age=100)
+    sweeper = make_sweeper(temp_dir, quota_bytes=150)
+
+    stats = sweeper.sweep()
+
+    assert not oldest.exists()
+    assert not older.exists()
+    assert newest.is_dir()
+    assert stats == {"dirs_removed": 2, "bytes_reclaimed": 200}
+
+
+def test_cache_hits_keep_results_from_expiring(temp_dir: Path) -> None:
+    images_dir = temp_dir / "images"
+    cached = make_dir(images_dir, "cached", 100, age=7200)
+    retention.result_cache.put("key", "cached")
+
+    # The hit refreshes the directory's mtime, which the sweeper reads as its last use
+    assert retention.result_cache.get("key") == "cached"
+    make_sweeper(temp_dir).sweep()
+
+    assert cached.is_dir()
+    assert retention.result_cache.get("key") == "cached"
+
+
+def test_cache_entries_of_swept_results_are_dropped(temp_dir: Path) -> None:
+    images_dir = temp_dir / "images"
+    make_dir(images_dir, "expired", 100, age=7200)
+    make_dir(images_dir, "kept", 100, age=60)
+    cache = retention.result_cache
+    cache.put("expired", "expired")
+    cache.put("kept", "kept")
+
+    make_sweeper(temp_dir).sweep()
+
+    assert sorted(path.name for path in cache.cache_dir.iterdir()) == ["kept.json"]
+    assert cache.get("kept") == "kept"
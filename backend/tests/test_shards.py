@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from app.core.config import settings
+from app.services.pdf_service import PdfService
+
+from .conftest import image_bytes
+
+
+@pytest.mark.parametrize("page_count, expected", [
+    (1, [None]),
+    (3, [None]),
+    (4, [(0, 2), (2, 4)]),
+    (5, [(0, 2), (2, 4), (4, 5)]),
+])
+def test_plan_shards(monkeypatch, page_count: int, expected) -> None:
+    monkeypatch.setattr(settings, "extraction_shard_min_pages", 4)
+    monkeypatch.setattr(settings, "extraction_shard_pages", 2)
+    assert PdfService.plan_shards(page_count) == expected
+
+
+def extract(client, pdf: Path) -> Dict[str, Any]:
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        files={"files": (pdf.name, pdf.read_bytes(), "application/pdf")},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    pdf_id = body["image_urls"][0].split("/")[-2]
+    pdf_dir = Path(settings.temp_dir).joinpath("images", pdf_id)
+    return {
+        "body": body,
+        "files": sorted(path.name for path in pdf_dir.glob("page_*")),
+        "manifest": json.loads(pdf_dir.joinpath("manifest.json").read_text()),
+    }
+
+
+def test_sharded_extraction_matches_a_single_worker(client, make_pdf, monkeypatch) -> None:
+    logo = image_bytes((250, 120, 0), image_format="JPEG")
+    pdf = make_pdf([
+        [logo, image_bytes((10, 0, 0))],
+        [image_bytes((20, 0, 0))],
+        [image_bytes((30, 0, 0))],
+        [logo],
+        [image_bytes((50, 0, 0)), logo],
+    ])
+    whole = extract(client, pdf)
+
+    monkeypatch.setattr(settings, "extraction_shard_min_pages", 2)
+    monkeypatch.setattr(settings, "extraction_shard_pages", 2)
+    sharded = extract(client, pdf)
+
+    # The logo repeated in later shards is stored once, on page 1
+    assert sharded["body"]["image_count"] == whole["body"]["image_count"] == 5
+    assert sharded["body"]["duplicates_skipped"] == whole["body"]["duplicates_skipped"] == 2
+    assert sharded["files"] == whole["files"]
+    assert not any(name.startswith(("page_4_", "page_5_image_2")) for name in sharded["files"])
+
+    records = sharded["manifest"]["images"]
+    assert [(record["page"], record["index"]) for record in records] == [
+        (record["page"], record["index"]) for record in whole["manifest"]["images"]
+    ]
+    first_logo = next(record["id"] for record in records if record["page"] == 1 and record["format"] == "jpeg")
+    assert [record["duplicate_of"] for record in records if "duplicate_of" in record] == [first_logo, first_logo]
@@ -0,0 +1,134 @@
+"""
+Storage backends and their content-addressed keys.
+
+The S3 backend runs against moto's in-process S3 server, or against a real
+S3-compatible store (e.g. MinIO) when STORAGE_TEST_S3_ENDPOINT_URL is set.
+"""
+import os
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.services.pdf_worker import ExtractionOptions, extract_document
+from app.services.storage import LocalStorage, S3Storage, StorageBackend, image_key
+
+from .conftest import image_bytes
+
+TEST_BUCKET = "pdf-images"
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint() -> Iterator[str]:
+    endpoint = os.environ.get("STORAGE_TEST_S3_ENDPOINT_URL")
+    if endpoint:
+        yield endpoint
+        return
+    pytest.importorskip("boto3")
+    server_module = pytest.importorskip("moto.server")
+    server = server_module.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+def make_s3_storage(endpoint: str) -> S3Storage:
+    pytest.importorskip("boto3")
+    backend = S3Storage(
+        bucket=TEST_BUCKET,
+        # A fresh prefix per test, so tests sharing a real bucket do not see each other's objects
+        prefix=f"tests/{uuid.uuid4().hex}",
+        endpoint_url=endpoint,
+        region="us-east-1",
+        access_key=os.environ.get("STORAGE_TEST_S3_ACCESS_KEY", "testing"),
+        secret_key=os.environ.get("STORAGE_TEST_S3_SECRET_KEY", "testing"),
+    )
+    try:
+        backend.client.create_bucket(Bucket=TEST_BUCKET)
+    except backend.client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    return backend
+
+
+@pytest.fixture(params=["local", "s3"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> StorageBackend:
+    if request.param == "local":
+        return LocalStorage(tmp_path / "store")
+    return make_s3_storage(request.getfixturevalue("s3_endpoint"))
+
+
+def test_storage_backend_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_round_trip(backend: StorageBackend, tmp_path: Path) -> None:
+    source = tmp_path / "source.png"
+    source.write_bytes(image_bytes((10, 20, 30)))
+
+    assert not backend.exists("images/ab/abcdef.png")
+    backend.put_file("images/ab/abcdef.png", source, "image/png")
+    assert backend.exists("images/ab/abcdef.png")
+
+    target = tmp_path / "restored" / "pdf" / "image.png"
+    assert backend.get_file("images/ab/abcdef.png", target)
+    assert target.read_bytes() == source.read_bytes()
+    # No partial download is left next to the file
+    assert [path.name for path in target.parent.iterdir()] == ["image.png"]
+
+
+def test_missing_key_creates_no_directory(backend: StorageBackend, tmp_path: Path) -> None:
+    target = tmp_path / "images" / "unknown-pdf" / "manifest.json"
+
+    assert not backend.get_file("manifests/unknown-pdf.json", target)
+    assert not target.parent.exists()
+
+
+def test_presigned_url(tmp_path: Path, s3_endpoint: str) -> None:
+    backend = make_s3_storage(s3_endpoint)
+    source = tmp_path / "source.png"
+    source.write_bytes(image_bytes((10, 20, 30)))
+    backend.put_file("images/ab/abcdef.png", source, "image/png")
+
+    url = backend.url("images/ab/abcdef.png", "image/png")
+
+    assert url.startswith(s3_endpoint)
+    assert f"{backend.prefix}/images/ab/abcdef.png" in url
+    assert LocalStorage(tmp_path).url("images/ab/abcdef.png", "image/png") is None
+
+
+def test_local_storage_rejects_keys_outside_its_root(tmp_path: Path) -> None:
+    backend = LocalStorage(tmp_path / "store")
+
+    with pytest.raises(ValueError):
+        backend.exists("../outside.png")
+    with pytest.raises(ValueError):
+        backend.put_file("images/../../outside.png", tmp_path / "source.png", "image/png")
+
+
+def test_keys_follow_the_stored_bytes(make_pdf, tmp_path: Path) -> None:
+    pdf = make_pdf([[image_bytes((200, 40, 40), size=64, image_format="JPEG")]])
+
+    def stored_record(name: str, **options) -> dict:
+        result = extract_document(str(pdf), str(tmp_path / name), name, ExtractionOptions(**options))
+        return result.stored_images[0]
+
+    native = stored_record("native", thumbnail_width=16)
+    converted = stored_record("converted", image_format="png", thumbnail_width=32)
+    webp = stored_record("webp", image_format="webp", thumbnail_width=16)
+    again = stored_record("again", thumbnail_width=16)
+
+    # Same source stream, so the same hash for duplicate detection
+    assert native["hash"] == converted["hash"] == webp["hash"]
+    # Native streams keep their stream hash as key
+    assert "stored_hash" not in native
+    assert image_key(native) == f"images/{native['hash'][:2]}/{native['hash']}.jpeg"
+
+    image_keys = {image_key(record) for record in (native, converted, webp)}
+    assert len(image_keys) == 3
+    # Thumbnails of different widths get different keys, identical ones share theirs
+    assert image_key(native, thumbnail=True) != image_key(converted, thumbnail=True)
+    assert image_key(native) == image_key(again)
+    assert image_key(native, thumbnail=True) == image_key(again, thumbnail=True)
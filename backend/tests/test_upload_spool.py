@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.core.config import settings
+from app.core.errors import FileSizeError
+from app.services.upload_spool import SpooledUpload, spool_upload
+
+
+def spool(data: bytes, size: Optional[int] = None) -> SpooledUpload:
+    upload = UploadFile(
+        file=io.BytesIO(data), size=size, filename="upload.pdf",
+        headers=Headers({"content-type": "application/pdf"})
+    )
+    return asyncio.run(spool_upload(upload))
+
+
+def spool_files() -> set:
+    spool_dir = Path(settings.temp_dir).joinpath("uploads")
+    return set(spool_dir.iterdir()) if spool_dir.exists() else set()
+
+
+@pytest.fixture
+def small_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "upload_chunk_size", 1024)
+    monkeypatch.setattr(settings, "upload_spool_threshold", 4096)
+    monkeypatch.setattr(settings, "max_upload_size", 16 * 1024)
+
+
+def test_small_upload_stays_in_memory(small_chunks) -> None:
+    data = os.urandom(3000)
+
+    upload = spool(data)
+
+    assert upload.path is None
+    assert upload.source == data
+    assert upload.size == len(data)
+    assert upload.digest == hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def test_large_upload_is_spooled_to_a_file(small_chunks) -> None:
+    data = os.urandom(10_000)
+
+    upload = spool(data)
+    try:
+        assert upload.content is None
+        assert upload.path.parent == Path(settings.temp_dir).joinpath("uploads")
+        assert upload.path.read_bytes() == data
+        assert upload.source == str(upload.path)
+        # The digest covers the chunks read before and after switching to the file
+        assert upload.digest == hashlib.blake2b(data, digest_size=16).hexdigest()
+    finally:
+        upload.cleanup()
+    assert upload.path is None
+
+
+def test_oversized_upload_is_rejected_while_reading(small_chunks) -> None:
+    before = spool_files()
+
+    # The declared size is unknown, so the limit is enforced on the bytes read
+    with pytest.raises(FileSizeError):
+        spool(os.urandom(20_000))
+
+    assert spool_files() == before
+
+
+def test_declared_size_is_checked_before_reading(small_chunks) -> None:
+    with pytest.raises(FileSizeError):
+        spool(b"", size=20_000)
+
+
+def test_oversized_upload_is_413(client, make_pdf, monkeypatch) -> None:
+    pdf = make_pdf([[]])
+    monkeypatch.setattr(settings, "max_upload_size", pdf.stat().st_size - 1)
+
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        files={"files": ("test.pdf", pdf.read_bytes(), "application/pdf")},
+    )
+
+    assert response.status_code == 413
@@ -0,0 +1,169 @@
+import asyncio
+import io
+import json
+import os
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, List
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.core.config import settings
+from app.services.extraction_engine import extraction_engine
+from app.services.pdf_service import PdfService
+from app.services.pdf_worker import ExtractionOptions
+from app.services.upload_spool import spool_upload
+from app.services.zip_stream import ZipStream
+
+from .conftest import image_bytes
+
+
+def read_archive(chunks: List[bytes]) -> zipfile.ZipFile:
+    return zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+
+def test_stored_and_deflated_entries_round_trip(tmp_path: Path) -> None:
+    stored = tmp_path / "photo.jpeg"
+    stored.write_bytes(os.urandom(200_000))
+    raw = tmp_path / "scan.pnm"
+    raw.write_bytes(b"P6 " * 50_000)
+
+    archive = ZipStream(chunk_size=16 * 1024)
+    chunks = [
+        *archive.write_file("pdf_1/photo.jpeg", stored, zipfile.ZIP_STORED),
+        *archive.write_file("pdf_1/scan.pnm", raw, zipfile.ZIP_DEFLATED, 9),
+        *archive.write_bytes("manifest.json", b'{"pdfs": []}', zipfile.ZIP_DEFLATED),
+        *archive.close(),
+    ]
+
+    with read_archive(chunks) as result:
+        assert result.testzip() is None
+        assert result.namelist() == ["pdf_1/photo.jpeg", "pdf_1/scan.pnm", "manifest.json"]
+        assert result.read("pdf_1/photo.jpeg") == stored.read_bytes()
+        assert result.read("pdf_1/scan.pnm") == raw.read_bytes()
+        assert result.read("manifest.json") == b'{"pdfs": []}'
+        infos = {info.filename: info for info in result.infolist()}
+        assert infos["pdf_1/photo.jpeg"].compress_type == zipfile.ZIP_STORED
+        assert infos["pdf_1/scan.pnm"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["pdf_1/scan.pnm"].compress_size < infos["pdf_1/scan.pnm"].file_size
+        # The sink cannot seek, so sizes follow each entry in a data descriptor
+        assert all(info.flag_bits & 0x08 for info in result.infolist())
+
+
+def test_chunks_stay_near_the_chunk_size(tmp_path: Path) -> None:
+    source = tmp_path / "large.jpeg"
+    source.write_bytes(os.urandom(1024 * 1024))
+
+    archive = ZipStream(chunk_size=64 * 1024)
+    chunks = [*archive.write_file("large.jpeg", source), *archive.close()]
+
+    assert len(chunks) > 10
+    assert max(len(chunk) for chunk in chunks) < 2 * 64 * 1024
+    with read_archive(chunks) as result:
+        assert result.read("large.jpeg") == source.read_bytes()
+
+
+def test_entries_keep_real_timestamps(tmp_path: Path) -> None:
+    source = tmp_path / "image.png"
+    source.write_bytes(image_bytes((10, 20, 30)))
+    mtime = time.mktime((2021, 3, 4, 5, 6, 8, 0, 0, -1))
+    os.utime(source, (mtime, mtime))
+
+    archive = ZipStream()
+    chunks = [
+        *archive.write_file("image.png", source),
+        *archive.write_bytes("manifest.json", b"{}"),
+        *archive.close(),
+    ]
+
+    with read_archive(chunks) as result:
+        assert result.getinfo("image.png").date_time == (2021, 3, 4, 5, 6, 8)
+        # In-memory members are dated now, not 1980-01-01
+        assert result.getinfo("manifest.json").date_time[0] >= 2024
+
+
+def test_download_streams_one_folder_per_pdf(client, make_pdf) -> None:
+    shared = image_bytes((200, 0, 0), image_format="JPEG")
+    first = make_pdf([[shared, image_bytes((0, 200, 0))], [shared]], "first.pdf")
+    second = make_pdf([[shared, image_bytes((0, 0, 200))]], "second.pdf")
+
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params={"download": "true"},
+        files=[
+            ("files", ("first.pdf", first.read_bytes(), "application/pdf")),
+            ("files", ("second.pdf", second.read_bytes(), "application/pdf")),
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as result:
+        assert result.testzip() is None
+        names = result.namelist()
+        manifest = json.loads(result.read("manifest.json"))
+        # The JPEG repeated on page 2 and in the second PDF is stored once,
+        # in the folder of whichever PDF reached it first
+        images = [name for name in names if name != "manifest.json"]
+        assert len(images) == 3
+        assert sum(name.endswith(".jpeg") for name in images) == 1
+        assert names[-1] == "manifest.json"
+        assert [pdf["folder"] for pdf in manifest["pdfs"]] == ["pdf_1", "pdf_2"]
+        # Every manifest record either was written or points at the copy that was
+        written = {f"{pdf['pdf_id']}/{record['filename']}" for pdf in manifest["pdfs"]
+                   for record in pdf["images"] if "filename" in record}
+        assert len(written) == 3
+        assert all(record["duplicate_of"] in written for pdf in manifest["pdfs"]
+                   for record in pdf["images"] if "duplicate_of" in record)
+        for name in names:
+            if name.endswith(".jpeg"):
+                # Already compressed, stored as-is by compression=auto
+                assert result.getinfo(name).compress_type == zipfile.ZIP_STORED
+
+
+def test_download_of_a_broken_pdf_fails_before_streaming(client) -> None:
+    response = client.post(
+        f"{settings.api_str}/extract-images",
+        params={"download": "true"},
+        files={"files": ("bad.pdf", b"not a pdf at all", "application/pdf")},
+    )
+
+    assert response.status_code == 400
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["detail"]["extra"]["filename"] == "bad.pdf"
+
+
+def test_archive_streams_shards_before_the_pdf_is_extracted(make_pdf, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "extraction_shard_min_pages", 2)
+    monkeypatch.setattr(settings, "extraction_shard_pages", 1)
+    pdf = make_pdf([[image_bytes((number * 60, 0, 0))] for number in range(4)])
+    original_run = extraction_engine.run
+
+    async def scenario() -> List[bytes]:
+        released = asyncio.Event()
+
+        async def gated_run(fn: Any, *args: Any, **kwargs: Any) -> Any:
+            page_range = args[4] if len(args) > 4 else None
+            if page_range is not None and page_range[0] > 0:
+                # Shards after the first wait until the archive has started
+                await released.wait()
+            return await original_run(fn, *args, **kwargs)
+
+        monkeypatch.setattr(extraction_engine, "run", gated_run)
+        data = pdf.read_bytes()
+        upload = await spool_upload(UploadFile(
+            file=io.BytesIO(data), size=len(data), filename="long.pdf",
+            headers=Headers({"content-type": "application/pdf"})
+        ))
+        stream = PdfService.stream_archive([upload], ExtractionOptions())
+        first = await asyncio.wait_for(stream.__anext__(), timeout=30)
+        assert b"pdf_1/page_1_image_1.png" in first
+        released.set()
+        return [first] + [chunk async for chunk in stream]
+
+    with read_archive(asyncio.run(scenario())) as result:
+        assert result.testzip() is None
+        assert result.namelist() == [f"pdf_1/page_{page}_image_1.png" for page in range(1, 5)] + ["manifest.json"]
+        manifest = json.loads(result.read("manifest.json"))
+        assert manifest["pdfs"][0]["page_count"] == 4
@@ -1,6 +1,7 @@
 import { ImageIcon, Download, Maximize2 } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { toast } from 'sonner'
+import { api } from '@/lib/api'
 
 interface ImageGridProps {
   images: string[]
@@ -31,7 +32,7 @@ export function ImageGrid({ images, onViewImage }: ImageGridProps) {
           <div className="relative w-full">
             <div className="relative pb-[100%] bg-[#fafafa] dark:bg-black/20">
               <img
-                src={imageUrl}
+                src={api.getPreviewUrl(imageUrl, 512)}
                 alt={`Extracted image ${index + 1}`}
                 className="absolute inset-0 w-full h-full object-contain"
                 loading="lazy"
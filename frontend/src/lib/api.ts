@@ -59,5 +59,10 @@ export const api = {
   getImageUrl(imageId: string): string {
     // imageId is in format "{pdf_id}/{image_filename}"
     return `${env.apiUrl}/images/${imageId}`;
+  },
+
+  getPreviewUrl(imageUrl: string, width: number): string {
+    // Resized WebP variant rendered and cached by the backend
+    return `${imageUrl}?w=${width}&format=webp`;
   }
 }; 
\ No newline at end of file